@@ -0,0 +1,122 @@
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from playwright.async_api import Page
+from locators.loginPageLocators import LoginPageLocators
+from POM.login import config
+from utils.waits import AsyncPageWaiter
+from utils.dom_snapshot import async_blog_cards
+from utils.step_timer import timed_steps
+from utils.locator_healing import AsyncLocatorResolver
+from utils.visual import SCREENSHOT_OPTIONS, decode_png, theme_of, visual_baselines
+
+
+@timed_steps
+class AsyncLoginPage:
+    """`LoginPage` on `playwright.async_api`, for the public flows and admin login.
+
+    Method names match `LoginPage`, so a flow reads the same with `await`
+    in front. Admin flows that change data stay on the sync `LoginPage`.
+    """
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.locate = AsyncLocatorResolver(page, "AsyncLoginPage")
+        self.wait = AsyncPageWaiter(page)
+        self.admin_button = self.locate("admin_button", LoginPageLocators.ADMIN_BUTTON_CANDIDATES)
+        self.username_field = self.locate("username_field", LoginPageLocators.USERNAME_FIELD_CANDIDATES)
+        self.password_field = self.locate("password_field", LoginPageLocators.PASSWORD_FIELD_CANDIDATES)
+        self.submit_button = self.locate("submit_button", LoginPageLocators.SUBMIT_BUTTON_CANDIDATES)
+        self.logout_button = page.locator(LoginPageLocators.LOGOUT)
+        self.home_button = page.locator(LoginPageLocators.HOME_BUTTON)
+        self.search_input = self.locate("search_input", LoginPageLocators.SEARCH_INPUT_CANDIDATES)
+        self.no_blogs_found = page.locator(LoginPageLocators.NO_BLOGS_FOUND)
+        self.blog_card = page.locator(LoginPageLocators.BLOG_CARD)
+        self.blog_card_title = page.locator(LoginPageLocators.BLOG_CARD_TITLE)
+        self.switch_to_dark_mode_button = self.locate("theme_toggle", LoginPageLocators.THEME_TOGGLE_CANDIDATES)
+        # the same toggle button, resolved once
+        self.dark_mode_active_button = self.switch_to_dark_mode_button
+        self.readmore_button = page.locator(LoginPageLocators.READMORE_BUTTON)
+
+    async def open(self, url):
+        await self.page.goto(url)
+        await self.wait.for_element(self.home_button, "open")
+
+    async def home_screen(self):
+        await self.home_button.click()
+        await self.wait.for_dom_settled("home_screen", legacy=1.5)
+
+    async def reload_page(self):
+        await self.page.reload()
+        await self.wait.for_dom_settled("reload_page", legacy=0.5)
+
+    async def current_theme(self):
+        return theme_of(decode_png(await self.page.screenshot(**SCREENSHOT_OPTIONS)))
+
+    async def switch_to_dark_mode(self):
+        if await self.current_theme() != "dark":
+            await self.switch_to_dark_mode_button.click()
+            await self.wait.for_dom_settled("switch_to_dark_mode", legacy=0.5)
+
+    async def verify_dark_mode_active(self):
+        await self.wait.for_element(self.dark_mode_active_button, "verify_dark_mode_active", legacy=1)
+        assert await self.current_theme() == "dark", "Dark mode should be active"
+        await visual_baselines.async_assert_matches(self.dark_mode_active_button, "theme-toggle-dark")
+
+    async def switch_to_light_mode(self):
+        try:
+            if await self.current_theme() != "light":
+                await self.switch_to_dark_mode_button.click()
+                await self.wait.for_dom_settled("switch_to_light_mode", legacy=1.5)
+        except Exception:
+            pass
+
+    async def verify_light_mode_active(self):
+        await self.wait.for_dom_settled("verify_light_mode_active", legacy=1)
+        assert await self.current_theme() == "light", "Light mode should be active"
+        await visual_baselines.async_assert_matches(self.dark_mode_active_button, "theme-toggle-light")
+
+    async def search_screen(self, search_term="Saikiran Shet"):
+        await self.search_input.click()
+        await self.search_input.fill(search_term)
+        await self.wait.for_action(lambda: self.search_input.press("Enter"), "search_screen", legacy=2.5)
+
+    async def verify_no_blogs_found(self):
+        no_blogs_locator = self.no_blogs_found.first
+        await self.wait.for_element(no_blogs_locator, "verify_no_blogs_found", legacy=2.5)
+        no_blogs_text = await no_blogs_locator.inner_text(timeout=5000)
+        assert "No" in no_blogs_text and ("blog" in no_blogs_text.lower() or "result" in no_blogs_text.lower()), \
+            f"Expected 'No blogs found' message but found: {no_blogs_text}"
+
+    async def verify_blogs_found_when_search_term_is_present(self, search_term="Getting Started with TypeScript"):
+        cards = await self.wait.for_snapshot(lambda: async_blog_cards(self.page),
+                                             lambda cards: any(card.mentions(search_term) for card in cards),
+                                             "verify_blogs_found_when_search_term_is_present", legacy=2.5)
+        assert any(card.mentions(search_term) for card in cards), \
+            f"Expected a blog matching '{search_term}' but found: {[card.title for card in cards]}"
+
+    async def click_readmore_button(self):
+        await self.readmore_button.click()
+
+    async def login_user(self):
+        await self.admin_button.click()
+        await self.username_field.click()
+        await self.username_field.fill(config["credentials"]["adminusername"])
+        await self.password_field.click()
+        await self.password_field.fill(config["credentials"]["password"])
+        await self.submit_button.click()
+
+    async def logout_user(self):
+        try:
+            if await self.logout_button.is_visible(timeout=5000):
+                await self.logout_button.click()
+                await self.wait.for_dom_settled("logout_user", legacy=1)
+        except Exception:
+            # Logout button not found or already logged out, ignore
+            pass
+
+    async def search_and_verify_blog(self, search_term):
+        """Search for a blog and verify it's found"""
+        await self.search_screen(search_term)
+        await self.verify_blogs_found_when_search_term_is_present(search_term)
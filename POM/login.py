@@ -4,9 +4,16 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import json
 import random
-import time
-from playwright.sync_api import Page
+from urllib.parse import urlparse
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from locators.blogPageLocators import BlogPageLocators
 from locators.loginPageLocators import LoginPageLocators
+from utils.waits import PageWaiter
+from utils.dom_snapshot import admin_rows, blog_cards
+from utils.perf_metrics import recorder_for
+from utils.step_timer import timed_steps
+from utils.locator_healing import LocatorResolver
+from utils.visual import SCREENSHOT_OPTIONS, decode_png, theme_of, visual_baselines
 import yaml
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Get the directory of login.py
@@ -16,18 +23,22 @@ CONFIG_PATH = os.path.join(BASE_DIR, "..", "data", "config.yaml")  # Navigate to
 with open(CONFIG_PATH, "r") as file:
     config = yaml.safe_load(file) 
 
+@timed_steps
 class LoginPage:
     def __init__(self, page: Page):
         self.page = page
-        self.admin_button = page.locator(LoginPageLocators.ADMIN_BUTTON)
-        self.username_field = page.locator(LoginPageLocators.USERNAME_FIELD)
-        self.password_field = page.locator(LoginPageLocators.PASSWORD_FIELD)
-        self.submit_button = page.locator(LoginPageLocators.SUBMIT_BUTTON)
+        self.locate = LocatorResolver(page, "LoginPage")
+        self.wait = PageWaiter(page)
+        self.perf = recorder_for(page)
+        self.admin_button = self.locate("admin_button", LoginPageLocators.ADMIN_BUTTON_CANDIDATES)
+        self.username_field = self.locate("username_field", LoginPageLocators.USERNAME_FIELD_CANDIDATES)
+        self.password_field = self.locate("password_field", LoginPageLocators.PASSWORD_FIELD_CANDIDATES)
+        self.submit_button = self.locate("submit_button", LoginPageLocators.SUBMIT_BUTTON_CANDIDATES)
         self.logout_button = page.locator(LoginPageLocators.LOGOUT)
         self.blog_post_button = page.locator(LoginPageLocators.BLOG_POST_BUTTON)
         self.title_check = page.locator(LoginPageLocators.TITLE_CHECK).first
         self.excerpt_check = page.locator(LoginPageLocators.EXCERPT_CHECK)
-        self.content_check = page.locator(LoginPageLocators.CONTENT_CHECK)
+        self.content_check = self.locate("content_check", LoginPageLocators.CONTENT_CHECK_CANDIDATES)
         self.category_check = page.locator(LoginPageLocators.CATEGORY_CHECK)
         self.category_option = page.locator(LoginPageLocators.CATEGORY_OPTION)
         self.tags_check = page.locator(LoginPageLocators.TAGS_CHECK)
@@ -40,70 +51,85 @@ class LoginPage:
         self.cancel_button = page.locator(LoginPageLocators.CANCEL_BUTTON)
         self.content_click = page.locator(LoginPageLocators.CONTENT_CLICK)
         self.test_title_created_check = page.locator(LoginPageLocators.TEST_TITLE_CREATED)
-        self.delete_1st_icon = page.locator(LoginPageLocators.DELETE_ICON)
+        self.delete_1st_icon = self.locate("delete_1st_icon", LoginPageLocators.DELETE_ICON_CANDIDATES)
         self.delete_button = page.locator(LoginPageLocators.DELETE_BUTTON)
         self.confirm_delete_button = page.locator(LoginPageLocators.CONFIRM_DELETE_BUTTON)
         self.cancel_delete_button = page.locator(LoginPageLocators.CANCEL_DELETE_BUTTON)
         self.home_button = page.locator(LoginPageLocators.HOME_BUTTON)
-        self.search_input = page.locator(LoginPageLocators.SEARCH_INPUT)
+        self.search_input = self.locate("search_input", LoginPageLocators.SEARCH_INPUT_CANDIDATES)
         self.search_button = page.locator(LoginPageLocators.SEARCH_BUTTON)
         self.no_blogs_found = page.locator(LoginPageLocators.NO_BLOGS_FOUND)
         self.blog_card = page.locator(LoginPageLocators.BLOG_CARD)
         self.blog_card_title = page.locator(LoginPageLocators.BLOG_CARD_TITLE)
-        self.switch_to_dark_mode_button = page.locator(LoginPageLocators.SWITCH_TO_DARK_MODE_BUTTON)
-        self.dark_mode_active_button = page.locator(LoginPageLocators.DARK_MODE_ACTIVE_BUTTON)
+        self.switch_to_dark_mode_button = self.locate("theme_toggle", LoginPageLocators.THEME_TOGGLE_CANDIDATES)
+        # the same toggle button, resolved once
+        self.dark_mode_active_button = self.switch_to_dark_mode_button
         
     def home_screen(self):
-        self.home_button.click()
-        self.page.wait_for_load_state("networkidle", timeout=10000)
-        time.sleep(1)
+        with self.perf.measure("home_screen"):
+            self.home_button.click()
+            self.wait.for_dom_settled("home_screen", legacy=1.5)
     
     def reload_page(self):
-        self.page.reload()
-        self.page.wait_for_load_state("networkidle", timeout=10000)
+        with self.perf.measure("reload_page"):
+            self.page.reload()
+            self.wait.for_dom_settled("reload_page", legacy=0.5)
     
+    def current_theme(self):
+        """The theme the page shows ("dark" or "light"), from its pixels rather than its markup"""
+        return theme_of(decode_png(self.page.screenshot(**SCREENSHOT_OPTIONS)))
+
     def switch_to_dark_mode(self):
-        self.switch_to_dark_mode_button.click()
-        self.page.wait_for_load_state("networkidle", timeout=10000)
+        # the button toggles, so only click it when the page is light
+        if self.current_theme() != "dark":
+            self.switch_to_dark_mode_button.click()
+            self.wait.for_dom_settled("switch_to_dark_mode", legacy=0.5)
     
     def verify_dark_mode_active(self):
-        time.sleep(1)
-        self.dark_mode_active_button.is_visible(timeout=10000)
-        assert self.dark_mode_active_button.is_visible(timeout=10000), "Switch to light mode"
+        self.wait.for_element(self.dark_mode_active_button, "verify_dark_mode_active", legacy=1)
+        assert self.current_theme() == "dark", "Dark mode should be active"
+        visual_baselines.assert_matches(self.dark_mode_active_button, "theme-toggle-dark")
 
     def switch_to_light_mode(self):
         try:
             # Toggle dark mode button to switch back to light mode
-            self.switch_to_dark_mode_button.click()
-            self.page.wait_for_load_state("networkidle", timeout=10000)
-            time.sleep(1)
+            if self.current_theme() != "light":
+                self.switch_to_dark_mode_button.click()
+                self.wait.for_dom_settled("switch_to_light_mode", legacy=1.5)
         except Exception:
             pass
         
     def search_screen(self, search_term="Saikiran Shet"):
         self.search_input.click()
         self.search_input.fill(search_term)
-        self.search_input.press("Enter")
-        self.page.wait_for_load_state("networkidle", timeout=10000)
-        time.sleep(2)  
+        with self.perf.measure("search_screen"):
+            self.wait.for_action(lambda: self.search_input.press("Enter"), "search_screen", legacy=2.5)
     
     def verify_no_blogs_found(self):
-        self.page.wait_for_load_state("networkidle", timeout=10000)
-        time.sleep(2)
         no_blogs_locator = self.no_blogs_found.first
-        no_blogs_locator.wait_for(state="visible", timeout=10000)
+        self.wait.for_element(no_blogs_locator, "verify_no_blogs_found", legacy=2.5)
         no_blogs_text = no_blogs_locator.inner_text(timeout=5000)
         assert "No" in no_blogs_text and ("blog" in no_blogs_text.lower() or "result" in no_blogs_text.lower()), \
             f"Expected 'No blogs found' message but found: {no_blogs_text}"
 
+    def blog_list(self):
+        """Every blog card on the page, read in one round-trip (see utils/dom_snapshot.py)."""
+        return blog_cards(self.page)
+
+    def admin_blog_rows(self):
+        return admin_rows(self.page)
+
     def verify_blogs_found_when_search_term_is_present(self, search_term="Getting Started with TypeScript"):
-        self.page.wait_for_load_state("networkidle", timeout=10000)
-        time.sleep(2)
-        assert self.blog_card_title.is_visible(timeout=10000), f"Expected blog title to be visible for search term '{search_term}' but no blog title is visible"
+        cards = self.wait.for_snapshot(self.blog_list, lambda cards: any(card.mentions(search_term) for card in cards),
+                                       "verify_blogs_found_when_search_term_is_present", legacy=2.5)
+        assert any(card.mentions(search_term) for card in cards), \
+            f"Expected a blog matching '{search_term}' but found: {[card.title for card in cards]}"
 
     def click_readmore_button(self):
         self.readmore_button = self.page.locator(LoginPageLocators.READMORE_BUTTON)
-        self.readmore_button.click()
+        with self.perf.measure("click_readmore_button"):
+            self.readmore_button.click()
+            self.wait.for_dom_settled("click_readmore_button")
 
     def login_user(self):
         self.admin_button.click()
@@ -111,7 +137,17 @@ class LoginPage:
         self.username_field.fill(config["credentials"]["adminusername"])
         self.password_field.click()
         self.password_field.fill(config["credentials"]["password"])
-        self.submit_button.click()
+        with self.perf.measure("login_user"):
+            self.submit_button.click()
+            self.wait.for_dom_settled("login_user")
+
+    def is_logged_in(self, timeout=2000):
+        """Check for the logout control, e.g. after restoring a saved session"""
+        try:
+            self.wait.for_element(self.logout_button.first, "is_logged_in", timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
         
     def login_user_for_blog(self): 
         self.blog_post_button.click()
@@ -124,9 +160,8 @@ class LoginPage:
         self.tags_check.click()
         self.tags_check_option_1.click()
         self.page.locator("body").click(position={"x": 0, "y": 0})
-        self.publish_now_button.click()
-        self.page.wait_for_load_state("networkidle", timeout=10000)
-        time.sleep(2)  
+        with self.perf.measure("login_user_for_blog"):
+            self.wait.for_action(self.publish_now_button.click, "login_user_for_blog", legacy=2.5)
 
     def login_user_for_blog_with_no_info(self):
         self.blog_post_button.click()
@@ -142,10 +177,8 @@ class LoginPage:
         assert self.publish_now_button.is_disabled(), "Publish button should be disabled when title is empty"
 
     def verify_title_to_be_available_in_dashboard(self):
-        self.page.wait_for_load_state("networkidle", timeout=15000)
-        time.sleep(2) 
         title_locator = self.page.locator(LoginPageLocators.TEST_TITLE_CREATED).first
-        title_locator.wait_for(state="visible", timeout=10000)
+        self.wait.for_element(title_locator, "verify_title_to_be_available_in_dashboard", legacy=2.5, timeout=15000)
         title_text = title_locator.inner_text(timeout=5000)
         assert "Test Title" in title_text, f"Expected 'Test Title' but found: {title_text}"
 
@@ -153,16 +186,15 @@ class LoginPage:
         try:
             if self.logout_button.is_visible(timeout=5000):
                 self.logout_button.click()
-                time.sleep(1)
+                self.wait.for_dom_settled("logout_user", legacy=1)
         except Exception:
             # Logout button not found or already logged out, ignore
             pass
     
     def click_delete_icon_for_blog(self, blog_title="Test Title"):
-        self.delete_1st_icon.click()
-        self.confirm_delete_button.click()
-        self.page.wait_for_load_state("networkidle", timeout=10000)
-        time.sleep(2)
+        self.locate("delete_icon_for_title", LoginPageLocators.DELETE_ICON_FOR_TITLE_CANDIDATES, title=blog_title).first.click()
+        with self.perf.measure("click_delete_icon_for_blog"):
+            self.wait.for_action(self.confirm_delete_button.click, "click_delete_icon_for_blog", legacy=2.5)
     
   
     def login_user_with_invalid_creds(self):
@@ -173,7 +205,9 @@ class LoginPage:
         self.username_field.fill(config["credentials"]["invalid_username"])
         self.password_field.fill(config["credentials"]["invalid_password"])
         self.submit_button.click()
-        assert self.page.locator(LoginPageLocators.INVALID_CREDENTIALS_MESSAGE).is_visible()
+        invalid_message = self.page.locator(LoginPageLocators.INVALID_CREDENTIALS_MESSAGE)
+        self.wait.for_element(invalid_message, "login_user_with_invalid_creds")
+        assert invalid_message.is_visible()
     
     def create_blog_with_custom_title(self, title="Custom Blog Title"):
         """Create a blog with a custom title"""
@@ -187,9 +221,8 @@ class LoginPage:
         self.tags_check.click()
         self.tags_check_option_1.click()
         self.page.locator("body").click(position={"x": 0, "y": 0})
-        self.publish_now_button.click()
-        self.page.wait_for_load_state("networkidle", timeout=10000)
-        time.sleep(2)
+        with self.perf.measure("create_blog_with_custom_title"):
+            self.wait.for_action(self.publish_now_button.click, "create_blog_with_custom_title", legacy=2.5)
     
     def save_blog_as_draft(self, title="Draft Blog Title"):
         """Save a blog as draft instead of publishing"""
@@ -203,34 +236,34 @@ class LoginPage:
         self.tags_check.click()
         self.tags_check_option_1.click()
         self.page.locator("body").click(position={"x": 0, "y": 0})
-        self.save_button.click()
-        self.page.wait_for_load_state("networkidle", timeout=10000)
-        time.sleep(2)
+        self.wait.for_action(self.save_button.click, "save_blog_as_draft", legacy=2.5)
     
     def verify_blog_in_dashboard(self, blog_title):
         """Verify a blog with given title exists in dashboard"""
-        self.page.wait_for_load_state("networkidle", timeout=15000)
-        time.sleep(2)
-        title_locator = self.page.locator(f"//td[contains(text(),'{blog_title}')]").first
-        title_locator.wait_for(state="visible", timeout=10000)
-        title_text = title_locator.inner_text(timeout=5000)
-        assert blog_title in title_text, f"Expected '{blog_title}' but found: {title_text}"
+        rows = self.wait.for_snapshot(self.admin_blog_rows, lambda rows: any(blog_title in row.title for row in rows),
+                                      "verify_blog_in_dashboard", legacy=2.5, timeout=15000)
+        assert any(blog_title in row.title for row in rows), \
+            f"Expected '{blog_title}' in dashboard but found: {[row.title for row in rows]}"
     
     def search_and_verify_blog(self, search_term):
         """Search for a blog and verify it's found"""
         self.search_screen(search_term)
         self.verify_blogs_found_when_search_term_is_present(search_term)
     
+    def is_on_dashboard(self):
+        """The admin dashboard is already shown: its route is open or its blog table is on the page"""
+        parsed = urlparse(self.page.url)
+        if "/admin" in (parsed.path.rstrip("/"), parsed.fragment.split("?")[0].rstrip("/")):
+            return True
+        return self.page.locator(BlogPageLocators.ADMIN_TABLE).first.is_visible()
+
     def navigate_to_dashboard(self):
         """Navigate to admin dashboard"""
-        try:
-            dashboard_link = self.page.locator(LoginPageLocators.DASHBOARD_TITLE)
-            if dashboard_link.is_visible(timeout=5000):
-                dashboard_link.click()
-                self.page.wait_for_load_state("networkidle", timeout=10000)
-                time.sleep(1)
-        except Exception:
-            pass
+        if self.is_on_dashboard():
+            return
+        dashboard_link = self.page.locator(LoginPageLocators.DASHBOARD_TITLE).first
+        with self.perf.measure("navigate_to_dashboard"):
+            self.wait.for_action(dashboard_link.click, "navigate_to_dashboard", legacy=1.5)
     
     def verify_excerpt_validation(self):
         """Verify that excerpt field validation works"""
@@ -241,7 +274,7 @@ class LoginPage:
         self.category_check.click()
         self.category_option.click()
         # Check if publish button is disabled when required fields are missing
-        time.sleep(1)
+        self.wait.for_dom_settled("verify_excerpt_validation", legacy=1)
     
     def create_blog_with_multiple_tags(self, title="Multi Tag Blog"):
         """Create a blog with multiple tags"""
@@ -257,15 +290,13 @@ class LoginPage:
         self.tags_check.click()
         self.tags_check_option_2.click()
         self.page.locator("body").click(position={"x": 0, "y": 0})
-        self.publish_now_button.click()
-        self.page.wait_for_load_state("networkidle", timeout=10000)
-        time.sleep(2)
+        self.wait.for_action(self.publish_now_button.click, "create_blog_with_multiple_tags", legacy=2.5)
     
     def verify_light_mode_active(self):
         """Verify light mode is active"""
-        time.sleep(1)
-        body_class = self.page.locator("body").get_attribute("class") or ""
-        assert "dark" not in body_class.lower(), "Light mode should be active"
+        self.wait.for_dom_settled("verify_light_mode_active", legacy=1)
+        assert self.current_theme() == "light", "Light mode should be active"
+        visual_baselines.assert_matches(self.dark_mode_active_button, "theme-toggle-light")
 
 
         
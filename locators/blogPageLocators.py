@@ -0,0 +1,17 @@
+class BlogPageLocators:
+    # CSS selectors applied with BeautifulSoup to page.content() by utils/dom_snapshot.py,
+    # so a whole list is read in one round-trip to the browser.
+
+    # Public blog list
+    BLOG_CARD = "article, [data-testid*='blog-card'], .MuiCard-root"
+    CARD_TITLE = "h1, h2, h3, h4, h5, h6"
+    CARD_EXCERPT = "p"
+    # first chip is the category, the rest are tags
+    CARD_CHIP = ".MuiChip-label"
+    READ_MORE_TEXT = "Read More"
+
+    # Admin dashboard table
+    ADMIN_TABLE = "table"
+    ADMIN_HEADER_CELL = "thead th"
+    ADMIN_ROW = "tbody tr"
+    ADMIN_CHIP = ".MuiChip-label"
@@ -23,6 +23,7 @@ class LoginPageLocators:
     CANCEL_BUTTON = "//*[contains(text(),'Cancel')]"
     TEST_TITLE_CREATED = "//td[contains(text(),'Test Title')]"
     DELETE_ICON = "//*[@id='root']/div/div[2]/table/tbody/tr[1]/td[8]/button[3]"
+    DELETE_ICON_FOR_TITLE = "//*[@id='root']/div/div[2]/table/tbody/tr[td[contains(text(),{title})]]/td[8]/button[3]"
     CONFIRM_DELETE_BUTTON = "//button[contains(text(),'Delete') and not(contains(text(),'Cancel'))] | //button[@type='button' and contains(text(),'Delete')]"
     CANCEL_DELETE_BUTTON = "//button[contains(text(),'Cancel')]"
     DASHBOARD_TITLE = "//a[contains(text(),'Dashboard')]"
@@ -36,3 +37,48 @@ class LoginPageLocators:
     SWITCH_TO_DARK_MODE_BUTTON = "//*[@id='root']/header/div/div/button"
     READMORE_BUTTON = "//button[contains(text(),'Read More')]"
     DARK_MODE_ACTIVE_BUTTON = "//*[@id='root']/header/div/div/button"
+
+    # Ordered candidates for the elements whose selectors above depend on React-generated ids or on
+    # position; utils/locator_healing.py tries the one that matched last time first. The original
+    # selector is always the last candidate.
+    ADMIN_BUTTON_CANDIDATES = (
+        ("role", "link", "Admin"),
+        ("css", "header a[href*='login'], header a[href*='admin']"),
+        ("xpath", ADMIN_BUTTON),
+    )
+    USERNAME_FIELD_CANDIDATES = (
+        ("label", "Username"),
+        ("css", "input[name='username'], input[autocomplete='username']"),
+        ("xpath", USERNAME_FIELD),
+    )
+    PASSWORD_FIELD_CANDIDATES = (
+        ("label", "Password"),
+        ("css", "input[type='password']"),
+        ("xpath", PASSWORD_FIELD),
+    )
+    SUBMIT_BUTTON_CANDIDATES = (
+        ("css", "[role='tabpanel'] form button[type='submit']"),
+        ("xpath", SUBMIT_BUTTON),
+    )
+    SEARCH_INPUT_CANDIDATES = (
+        ("role", "searchbox"),
+        ("css", "input[placeholder^='Search']"),
+        ("xpath", SEARCH_INPUT),
+    )
+    CONTENT_CHECK_CANDIDATES = (
+        ("css", "form [contenteditable='true']"),
+        ("xpath", CONTENT_CHECK),
+    )
+    DELETE_ICON_CANDIDATES = (
+        ("css", "table tbody tr:first-child button[aria-label='Delete'], table tbody tr:first-child button[aria-label='delete']"),
+        ("xpath", DELETE_ICON),
+    )
+    # {title} is filled in per call, as an XPath string literal (quotes included)
+    DELETE_ICON_FOR_TITLE_CANDIDATES = (
+        ("xpath", "//tr[td[contains(text(),{title})]]//button[@aria-label='Delete' or @aria-label='delete']"),
+        ("xpath", DELETE_ICON_FOR_TITLE),
+    )
+    THEME_TOGGLE_CANDIDATES = (
+        ("css", "header button[aria-label*='mode'], header button[aria-label*='theme']"),
+        ("xpath", SWITCH_TO_DARK_MODE_BUTTON),
+    )
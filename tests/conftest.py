@@ -2,12 +2,39 @@ import pytest
 from playwright.sync_api import sync_playwright
 import sys
 import os
+import subprocess
+import threading
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import pytest
 from dotenv import load_dotenv
 from POM.login import LoginPage
+from locators.loginPageLocators import LoginPageLocators
+from utils.waits import PageWaiter, wait_ledger
+from utils.browser_pool import CONTEXT_OPTIONS, ContextPool, RECYCLE_POLICIES, browser_for_worker, worker_id
+from utils.auth_state import AuthStateCache, DEFAULT_TTL, credentials_fingerprint
+from utils.data_factory import BlogFactory
+from utils.network_profiles import PROFILES, ResourceSizes, apply_profile, network_savings, profile_for
+from utils.async_runner import AsyncFlowRunner, DEFAULT_CONCURRENCY
+from utils.perf_metrics import PerfRecorder, load_budgets, recorder_for
+from utils.duration_store import DEFAULT_DB_PATH, DurationStore, RunCollector
+from utils import step_timer
+from utils.sharding import assign_shards, estimate_durations, parse_shard, plan_lines
+from utils.impact_index import select_since
+from utils.artifact_buffer import ArtifactCapture, ArtifactStore, DEFAULT_MAX_MB, after_step, report_extras
+from utils.readiness import DEFAULT_TIMEOUT, StartupTimer, prime, readiness_targets, wait_until_ready
+from utils import browser_server
+from utils.browser_matrix import BrowserTimings, parse_browsers
+from utils.results_stream import STREAM_PATH, ResultsStream
+from utils.har_cache import DEFAULT_MAX_AGE_DAYS, MODES as HAR_MODES, HarCache, har_path, har_stats
+from utils.standin_server import FaultRule, StandInServer
+from utils.data_isolation import DataIsolation, restore_timings
+from utils.visual import MODES as VISUAL_MODES, visual_baselines, visual_stats
+from utils.locator_healing import healing_stats
+from utils.duration_store import git_revision
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from playwright.sync_api import sync_playwright
-import time
+import pytest_html
 
 
 # Load .env file
@@ -27,38 +54,807 @@ def pytest_addoption(parser):
         "--browser",
         action="store",
         default="chromium",
-        choices=["chromium", "firefox", "webkit"],
-        help="Browser to use: chromium, firefox, or webkit (default: chromium)"
+        help="Browser to use: chromium, firefox, webkit, a comma separated list or 'all'; "
+             "a list runs every UI test on each engine, one engine per xdist worker (default: chromium)"
     )
+    parser.addoption(
+        "--worker-browsers",
+        action="store",
+        default=None,
+        help="Comma separated browsers assigned round-robin to xdist workers, e.g. chromium,firefox (default: --browser)"
+    )
+    parser.addoption(
+        "--context-pool-size",
+        action="store",
+        type=int,
+        default=2,
+        help="Number of pre-warmed browser contexts kept per worker (default: 2)"
+    )
+    parser.addoption(
+        "--context-recycle",
+        action="store",
+        default="close",
+        choices=RECYCLE_POLICIES,
+        help="close: new context for every test, reuse: wipe and reuse contexts (default: close)"
+    )
+    parser.addoption(
+        "--context-max-uses",
+        action="store",
+        type=int,
+        default=20,
+        help="Tests a reused context may serve before it is replaced (default: 20)"
+    )
+    parser.addoption(
+        "--network-profile",
+        action="store",
+        default="auto",
+        choices=["auto", "off"] + sorted(PROFILES),
+        help="Resource blocking profile for every test; auto picks one from the test's markers (default: auto)"
+    )
+    parser.addoption(
+        "--auth-scope",
+        action="store",
+        default="run",
+        choices=["run", "worker"],
+        help="Log in once per run (shared by all workers) or once per worker (default: run)"
+    )
+    parser.addoption(
+        "--auth-ttl",
+        action="store",
+        type=int,
+        default=DEFAULT_TTL,
+        help=f"Seconds a saved admin session is reused before logging in again (default: {DEFAULT_TTL})"
+    )
+    parser.addoption(
+        "--async-concurrency",
+        action="store",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Pages the async_runner fixture drives at once (default: {DEFAULT_CONCURRENCY})"
+    )
+    parser.addoption(
+        "--perf-budgets",
+        action="store",
+        default="enforce",
+        choices=["enforce", "warn", "off"],
+        help="enforce: fail tests over the perf_budgets in data/config.yaml, warn: only report, off: collect nothing (default: enforce)"
+    )
+    parser.addoption(
+        "--duration-store",
+        action="store",
+        default=DEFAULT_DB_PATH,
+        help="SQLite file that keeps test and step durations across runs, or 'off' (default: .perf/durations.db)"
+    )
+    parser.addoption(
+        "--shard",
+        action="store",
+        default=None,
+        help="Run shard i of n (e.g. 2/4), split by historical durations from --duration-store"
+    )
+    parser.addoption(
+        "--affected-since",
+        action="store",
+        default=None,
+        help="Run only the tests that the changes since this git ref can affect (POM/locator usage index)"
+    )
+    parser.addoption(
+        "--browser-server",
+        action="store",
+        default="auto",
+        choices=["auto", "off"],
+        help="auto: attach to the browser started by utils/browser_server.py when one matches, off: always launch (default: auto)"
+    )
+    parser.addoption(
+        "--startup-timeout",
+        action="store",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Seconds to wait for the frontend and backend to answer before the first UI test, 0 to skip the probe (default: {DEFAULT_TIMEOUT})"
+    )
+    parser.addoption(
+        "--results-stream",
+        action="store",
+        default=STREAM_PATH,
+        help="JSONL file that gets one record per test phase as soon as it finishes, 'off' to disable "
+             "(default: reports/results.jsonl, view it live with utils/results_viewer.py)"
+    )
+    parser.addoption(
+        "--standin",
+        action="store_true",
+        default=False,
+        help="Run against the in-memory Bloggy stand-in (utils/standin_server.py) instead of LOCAL_SETUP_URL/LOCAL_API_URL; "
+             "every worker starts its own"
+    )
+    parser.addoption(
+        "--standin-fault",
+        action="append",
+        default=[],
+        metavar="RULE",
+        help="Latency/error rule for the stand-in, e.g. '/api/* latency=200 jitter=50' or 'POST /api/blogs rate=0.3 status=503' (repeatable)"
+    )
+    parser.addoption(
+        "--har",
+        action="store",
+        default="off",
+        choices=HAR_MODES,
+        help="record: save the API responses of @pytest.mark.har_cache tests to data/har, "
+             "replay: serve them from there instead of the backend (default: off)"
+    )
+    parser.addoption(
+        "--har-max-age",
+        action="store",
+        type=float,
+        default=DEFAULT_MAX_AGE_DAYS,
+        help=f"Days after which a replayed response is reported as stale (default: {DEFAULT_MAX_AGE_DAYS})"
+    )
+    parser.addoption(
+        "--visual",
+        action="store",
+        default="check",
+        choices=VISUAL_MODES,
+        help="check: compare screenshots against data/visual (missing baselines are written), "
+             "update: rewrite the baselines, off: skip visual checks (default: check)"
+    )
+    parser.addoption(
+        "--artifacts",
+        action="store",
+        default="on-failure",
+        choices=["on-failure", "always", "off"],
+        help="Keep the Playwright trace and screenshots of failing or over-budget tests, of every test, or trace nothing (default: on-failure)"
+    )
+    parser.addoption(
+        "--artifact-time-budget",
+        action="store",
+        type=float,
+        default=60.0,
+        help="Seconds after which a passing test keeps its artifacts too; @pytest.mark.time_budget(s) overrides (default: 60)"
+    )
+    parser.addoption(
+        "--artifact-steps",
+        action="store",
+        type=int,
+        default=0,
+        help="Screenshots of the last N page-object steps kept in memory for failing tests (default: 0, trace only)"
+    )
+    parser.addoption(
+        "--artifact-max-mb",
+        action="store",
+        type=int,
+        default=DEFAULT_MAX_MB,
+        help=f"Disk budget for kept artifacts in reports/artifacts; the oldest are evicted (default: {DEFAULT_MAX_MB})"
+    )
+
+# Throughput lines from async_runner, printed in the terminal summary
+async_flow_summaries = []
+# Durations of this run, written to the duration store at the end (controller only)
+run_durations = RunCollector()
+# Expected time per shard, printed in the terminal summary
+shard_plan = []
+# Why --affected-since selected what it did
+impact_summary = []
+# Per-worker startup phases (probe, launch, prime)
+startup_breakdowns = []
+# Per-engine outcome and duration of every test (controller)
+browser_timings = BrowserTimings()
+# Streamed results of this run (controller), see pytest_sessionstart
+results_stream = None
+# In-process Bloggy stand-in of this worker (--standin)
+standin_server = None
+
+
+def _deselect(config, items, keep):
+    deselected = [item for item in items if not keep(item)]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if keep(item)]
+
+
+def _select_affected(config, items, ref):
+    try:
+        affected, all_tests, reasons = select_since(ref)
+    except subprocess.CalledProcessError as e:
+        raise pytest.UsageError(f"--affected-since {ref}: {e.stderr.strip()}")
+    affected, indexed = set(affected), set(all_tests)
+    # tests the index does not know (e.g. generated ones) always run
+    _deselect(config, items, lambda item: item.nodeid.split("[")[0] in affected or item.nodeid.split("[")[0] not in indexed)
+    impact_summary[:] = [f"{len(items)} tests selected by changes since {ref}"] + [
+        f"  changed: {symbol} ({where})" for symbol, where in sorted(reasons.items())
+    ]
+
+
+def _item_engine(config, item):
+    """The engine a collected test runs on: its --browser matrix entry, or the one browser of the run.
+
+    None for tests without a browser and when --worker-browsers decides per worker.
+    """
+    callspec = getattr(item, "callspec", None)
+    if callspec and "browser_name" in callspec.params:
+        return callspec.params["browser_name"]
+    if "browser_name" in item.fixturenames and not config.getoption("--worker-browsers"):
+        return config.browser_names[0]
+    return None
+
+
+def _select_shard(config, items, shard):
+    try:
+        current, count = parse_shard(shard)
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    path = config.getoption("--duration-store")
+    history = {}
+    if path != "off" and os.path.exists(path):
+        store = DurationStore(path)
+        history = store.recent_durations(per_engine=True)
+        store.close()
+    durations, estimated = estimate_durations(
+        [(item.nodeid, item.fixturenames, _item_engine(config, item)) for item in items], history
+    )
+    shards = assign_shards(durations, count)
+    selected = set(shards[current][1])
+    _deselect(config, items, lambda item: item.nodeid in selected)
+    shard_plan[:] = plan_lines(shards, current, estimated)
+
+
+def _configure_browsers(config):
+    try:
+        config.browser_names = parse_browsers(config.getoption("--browser"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    if len(config.browser_names) < 2 or hasattr(config, "workerinput") or not config.pluginmanager.hasplugin("xdist"):
+        return
+    # one engine per worker: without -n start a worker per engine, with -n keep each engine's tests together
+    # (-n 0 runs the engines one after another)
+    if config.option.numprocesses is None:
+        config.option.numprocesses = len(config.browser_names)
+        config.option.tx = ["popen"] * len(config.browser_names)
+        config.option.dist = "loadgroup"
+    elif config.option.dist == "load":
+        config.option.dist = "loadgroup"
+
+
+def _start_standin(config):
+    """Serve the stand-in from this process and point the app URLs at it (not on an xdist controller)."""
+    global standin_server
+    if not config.getoption("--standin") or (getattr(config.option, "numprocesses", None) and not hasattr(config, "workerinput")):
+        return
+    try:
+        faults = [FaultRule.parse(rule) for rule in config.getoption("--standin-fault")]
+    except ValueError as e:
+        raise pytest.UsageError(f"--standin-fault: {e}")
+    standin_server = StandInServer(faults=faults).start()
+    os.environ["LOCAL_SETUP_URL"] = f"{standin_server.url}/"
+    os.environ["LOCAL_API_URL"] = standin_server.api_url
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    _configure_browsers(config)
+    _start_standin(config)
+    visual_baselines.mode = config.getoption("--visual")
+
+
+def pytest_unconfigure(config):
+    if standin_server:
+        standin_server.stop()
+
+
+def pytest_generate_tests(metafunc):
+    names = metafunc.config.browser_names
+    if len(names) > 1 and "browser_name" in metafunc.fixturenames:
+        metafunc.parametrize(
+            "browser_name",
+            [pytest.param(name, id=name, marks=pytest.mark.xdist_group(name)) for name in names],
+            indirect=True,
+            scope="session",
+        )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    # impact selection first, so the shards split only the affected tests
+    if config.getoption("--affected-since"):
+        _select_affected(config, items, config.getoption("--affected-since"))
+    if config.getoption("--shard"):
+        _select_shard(config, items, config.getoption("--shard"))
+
+
+def _open_app(page, url):
+    with recorder_for(page).measure("open_app"):
+        page.goto(url)
+        PageWaiter(page).for_element(page.locator(LoginPageLocators.HOME_BUTTON), "setupcheck", legacy=10)
+
+
+@pytest.fixture(scope="session")
+def artifact_store(request):
+    if request.config.getoption("--artifact-steps"):
+        step_timer.listeners.append(after_step)
+    yield ArtifactStore(max_bytes=request.config.getoption("--artifact-max-mb") * 1024 * 1024)
+    if after_step in step_timer.listeners:
+        step_timer.listeners.remove(after_step)
+
+
+@pytest.fixture
+def artifacts(request, artifact_store):
+    """Wrap a page's lifetime: `with artifacts(context, page): ...` traces it and keeps the trace only if needed."""
+    mode = request.config.getoption("--artifacts")
+    marker = request.node.get_closest_marker("time_budget")
+    budget = marker.args[0] if marker else request.config.getoption("--artifact-time-budget")
+
+    @contextmanager
+    def capture(context, page):
+        if mode == "off":
+            yield
+            return
+        tracer = ArtifactCapture(request.node.nodeid, artifact_store, request.config.getoption("--artifact-steps"))
+        tracer.start(context, page)
+        try:
+            yield
+        except Exception:
+            request.node.kept_artifacts = tracer.finish(True, "setup failed")
+            raise
+        reports = [getattr(request.node, f"rep_{when}", None) for when in ("setup", "call")]
+        call = reports[1]
+        if any(r is not None and r.failed for r in reports):
+            reason = "failed"
+        elif call is not None and call.duration > budget:
+            reason = f"{call.duration:.1f}s > {budget:g}s budget"
+        else:
+            reason = "always" if mode == "always" else None
+        request.node.kept_artifacts = tracer.finish(reason is not None, reason)
+    return capture
+
 
 @pytest.fixture(scope="session")
-def setupcheck(request):
-    """Set up a single browser and page for the entire test session.
+def perf_budgets():
+    return load_budgets()
+
+
+@pytest.fixture
+def perf_metrics(request, perf_budgets):
+    """Returns a function that starts collecting front-end metrics on a page (before it navigates)."""
+    recorders = request.node.perf_recorders = []
+
+    def attach(page):
+        if request.config.getoption("--perf-budgets") != "off":
+            recorders.append(PerfRecorder(page, perf_budgets).attach())
+    return attach
+
+
+@pytest.fixture(scope="session")
+def resource_sizes():
+    """Response sizes seen in unblocked tests, to estimate what profiles save."""
+    sizes = ResourceSizes()
+    yield sizes
+    sizes.save()
+
+
+@pytest.fixture
+def network_profile(request, resource_sizes):
+    """Returns a function that routes a context through this test's network profile."""
+    marker = request.node.get_closest_marker("network_profile")
+    name = profile_for(
+        {m.name for m in request.node.iter_markers()},
+        explicit=marker.args[0] if marker else None,
+        option=request.config.getoption("--network-profile"),
+    )
+    return lambda context: apply_profile(context, name, resource_sizes)
+
+
+@pytest.fixture
+def har_cache(request):
+    """Returns a function that records or replays the API traffic of a context, and one that detaches it again."""
+    mode = request.config.getoption("--har")
+    if mode == "off" or not request.node.get_closest_marker("har_cache"):
+        return lambda context: (lambda: None)
+
+    def attach(context):
+        cache = HarCache(
+            har_path(request.node.nodeid), mode, os.getenv("LOCAL_API_URL"),
+            max_age_days=request.config.getoption("--har-max-age"),
+            stats=har_stats, git_rev=git_revision(),
+        ).attach(context)
 
-    This keeps the same logged-in session active across all tests that use
-    this fixture, until the full pytest run is completed.
+        def detach():
+            call = getattr(request.node, "rep_call", None)
+            cache.detach(context, save=call is not None and call.passed)
+        return detach
+    return attach
+
+
+@pytest.fixture(scope="session")
+def standin():
+    """This worker's stand-in server (`--standin`), e.g. to `reset()` it or change `faults`; skips without it."""
+    if standin_server is None:
+        pytest.skip("needs --standin")
+    return standin_server
+
+
+@pytest.fixture(scope="session")
+def browser_name(request):
+    """The engine under test: the test's --browser matrix entry, otherwise this worker's browser."""
+    if hasattr(request, "param"):
+        return request.param
+    return browser_for_worker(request.config.getoption("--worker-browsers"), request.config.browser_names[0])
+
+
+@pytest.fixture(scope="session")
+def worker_browser(request, browser_name):
+    """Launch one browser process per xdist worker (or one for a serial run)."""
+    headless = request.config.getoption("--headless")
+    print(f"Worker {worker_id()} using {browser_name}")
+    timeout = request.config.getoption("--startup-timeout")
+    targets = readiness_targets()
+    if request.config.getoption("--har") == "replay":
+        # replayed tests get their API responses from data/har
+        targets.pop("backend", None)
+    timer = StartupTimer()
+    stop_probe = threading.Event()
+    # the app is probed while Playwright and the browser start
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        ready = executor.submit(wait_until_ready, targets, timeout, timer, stop=stop_probe) if timeout else None
+        with timer.phase("playwright"):
+            p = sync_playwright().start()
+        try:
+            browser, lease = None, None
+            if request.config.getoption("--browser-server") == "auto":
+                with timer.phase("browser server"):
+                    browser, lease = browser_server.connect(p, browser_name, headless)
+            if browser is None:
+                with timer.phase(f"{browser_name} launch"):
+                    browser_launcher = getattr(p, browser_name)
+                    browser = browser_launcher.launch(
+                        headless=headless,
+                        args=browser_server.LAUNCH_ARGS
+                    )
+            if ready:
+                ready.result()
+        except Exception:
+            stop_probe.set()
+            p.stop()
+            raise
+    # attaching to the server means an edit-run loop against an already warm dev server
+    if lease is None:
+        prime(browser, os.getenv("LOCAL_SETUP_URL"), timer)
+    startup_breakdowns.append(timer.line(f"{worker_id()} {browser_name}"))
+    yield browser
+    # closes only this run's contexts when attached to the server
+    browser.close()
+    if lease is not None:
+        lease.release()
+    p.stop()
+
+
+@pytest.fixture(scope="session")
+def context_pool(request, worker_browser):
+    """Pre-warmed pool of browser contexts for this worker."""
+    pool = ContextPool(
+        worker_browser,
+        size=request.config.getoption("--context-pool-size"),
+        recycle=request.config.getoption("--context-recycle"),
+        max_uses=request.config.getoption("--context-max-uses"),
+        context_options=CONTEXT_OPTIONS,
+    )
+    pool.warm()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def setupcheck(context_pool, network_profile, har_cache, perf_metrics, artifacts):
+    """Give every test a fresh page in its own browser context.
+
+    Contexts come from the worker's pre-warmed pool, so tests no longer
+    share cookies, storage or navigation state and can run in parallel
+    with pytest-xdist (`-n auto`).
     """
     url = os.getenv("LOCAL_SETUP_URL")
     print(f"Testing URL: {url}")
-    headless = request.config.getoption("--headless")
-    browser_name = request.config.getoption("--browser")
-    with sync_playwright() as p:
-        browser_launcher = getattr(p, browser_name)
-        browser = browser_launcher.launch(
-            headless=headless,
-            args=["--start-maximized", "--window-size=1920,1080"]  
-        )
-        page = browser.new_page(viewport=None) 
-        page.goto(url)
-        time.sleep(10)
-        yield page
-        browser.close()
+    context = context_pool.acquire()
+    detach_profile = network_profile(context)
+    # routed after the profile, so API requests reach the cache first
+    detach_har = har_cache(context)
+    try:
+        page = context.new_page()
+        with artifacts(context, page):
+            perf_metrics(page)
+            _open_app(page, url)
+            yield page
+    finally:
+        detach_har()
+        detach_profile()
+        context_pool.release(context)
         
         
+def _login_and_save(browser, url, auth_state):
+    context = browser.new_context(**CONTEXT_OPTIONS)
+    try:
+        page = context.new_page()
+        _open_app(page, url)
+        login_page = LoginPage(page)
+        login_page.login_user()
+        login_page.wait.for_element(login_page.logout_button.first, "login_user")
+        auth_state.save(context)
+    finally:
+        context.close()
+
+
+@pytest.fixture(scope="session")
+def admin_state(request, worker_browser):
+    """Admin storage state, logged in through the UI only when the cache is cold."""
+    url = os.getenv("LOCAL_SETUP_URL")
+    scope = request.config.getoption("--auth-scope")
+    auth_state = AuthStateCache(
+        credentials_fingerprint(url),
+        scope="run" if scope == "run" else worker_id(),
+        ttl=request.config.getoption("--auth-ttl"),
+    )
+    with auth_state.lock():
+        if not auth_state.is_valid():
+            _login_and_save(worker_browser, url, auth_state)
+    return auth_state
+
+
+@pytest.fixture
+def admin_page(worker_browser, admin_state, network_profile, perf_metrics, artifacts):
+    """A fresh page that is already logged in as admin, opened on the dashboard.
+
+    Falls back to a UI login (and refreshes the cache) when the saved
+    session has gone stale.
+    """
+    url = os.getenv("LOCAL_SETUP_URL")
+    context = worker_browser.new_context(storage_state=admin_state.state_path, **CONTEXT_OPTIONS)
+    network_profile(context)
+    try:
+        page = context.new_page()
+        with artifacts(context, page):
+            perf_metrics(page)
+            _open_app(page, url)
+            login_page = LoginPage(page)
+            if not login_page.is_logged_in():
+                print("Saved admin session is stale, logging in through the UI")
+                login_page.login_user()
+                login_page.wait.for_element(login_page.logout_button.first, "login_user")
+                with admin_state.lock():
+                    admin_state.save(context)
+            login_page.navigate_to_dashboard()
+            yield page
+    finally:
+        context.close()
+
+
+@pytest.fixture(scope="session")
+def async_runner(request, browser_name):
+    """Runs read-only flows concurrently on async pages: `async_runner.run({name: flow})`."""
+    runner = AsyncFlowRunner(
+        os.getenv("LOCAL_SETUP_URL"),
+        browser_name=browser_name,
+        headless=request.config.getoption("--headless"),
+        concurrency=request.config.getoption("--async-concurrency"),
+    ).start()
+    yield runner
+    runner.close()
+    if runner.summary_line():
+        async_flow_summaries.append(f"{worker_id()}: {runner.summary_line()}")
+
+
+@pytest.fixture(scope="session")
+def blog_api():
+    """Logged-in API client with a pooled HTTP session, shared by the worker."""
+    factory = BlogFactory.from_config().login()
+    yield factory
+    factory.close()
+
+
+@pytest.fixture
+def blog_factory(blog_api):
+    """Create blog posts over the API; whatever the test created is deleted afterwards."""
+    try:
+        yield blog_api
+    finally:
+        blog_api.cleanup()
+
+
+@pytest.fixture(scope="session")
+def data_isolation(blog_api):
+    # a real backend may be shared with other workers; a --standin server belongs to this worker
+    return DataIsolation(blog_api, shared=standin_server is None)
+
+
+@pytest.fixture
+def isolated_data(request, data_isolation):
+    """Backend data is snapshotted before the test and restored after it, wherever the test failed.
+
+    Request it before `admin_page`/`seeded_blogs`, so the restore runs after the page has closed.
+    """
+    with data_isolation.isolated(request.node.nodeid) as snapshot:
+        yield snapshot
+
+
+@pytest.fixture
+def seeded_blogs(request, blog_factory):
+    """Posts from `@pytest.mark.seed_blogs("Title", ...)`, created in bulk before the test."""
+    marker = request.node.get_closest_marker("seed_blogs")
+    titles = marker.args if marker else getattr(request, "param", ())
+    return blog_factory.create_many(titles)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    report.user_properties.append(("step_durations", step_timer.drain()))
+    params = getattr(item, "callspec", None) and item.callspec.params
+    if params and "browser_name" in params:
+        others = {name: value for name, value in params.items() if name != "browser_name"}
+        report.user_properties.append(("browser", params["browser_name"]))
+        report.user_properties.append(("matrix_test", item.nodeid.split("[")[0] + (f"{others}" if others else "")))
+    elif "browser_name" in getattr(item, "funcargs", {}):
+        report.user_properties.append(("browser", item.funcargs["browser_name"]))
+    # the artifacts fixture decides at teardown from these whether to keep the trace
+    setattr(item, f"rep_{report.when}", report)
+    kept = getattr(item, "kept_artifacts", None)
+    if report.when == "teardown" and kept:
+        report_dir = os.path.dirname(os.path.abspath(item.config.getoption("htmlpath", None) or "reports/report.html"))
+        report.extras = getattr(report, "extras", []) + report_extras(kept, report_dir, pytest_html.extras)
+        report.sections.append(("artifacts", f"{kept['reason']}: {kept['folder']}"))
+        report.user_properties.append(("artifacts", {
+            "reason": kept["reason"], "folder": kept["folder"], "trace": kept["trace"],
+            "screenshot": kept["screenshot"],
+        }))
+    recorders = getattr(item, "perf_recorders", [])
+    if report.when != "call" or not any(r.records for r in recorders):
+        return
+    report.user_properties.append(("perf_metrics", [record for r in recorders for record in r.records]))
+    report.extras = getattr(report, "extras", []) + [pytest_html.extras.html(r.html_table()) for r in recorders]
+    violations = [v for r in recorders for v in r.violations()]
+    if not violations:
+        return
+    message = "Performance budget exceeded:\n" + "\n".join(
+        f"  {action}: {metric} = {value:.3f} > {limit}" for action, metric, value, limit in violations
+    )
+    if report.passed and item.config.getoption("--perf-budgets") == "enforce":
+        report.outcome = "failed"
+        report.longrepr = message
+    else:
+        report.sections.append(("perf budgets", message))
+
+
 def pytest_sessionstart(session):
+    if hasattr(session.config, "workerinput"):
+        # xdist workers share the controller's reports folder
+        return
     try:
         from utils.clean_reports import clean_reports_folder
         clean_reports_folder()
     except ImportError:
         # clean_reports module not available, skip cleaning
-        pass
\ No newline at end of file
+        pass
+    global results_stream
+    path = session.config.getoption("--results-stream")
+    if path != "off":
+        results_stream = ResultsStream(path)
+        results_stream.session_start(
+            browsers=session.config.browser_names,
+            workers=getattr(session.config.option, "numprocesses", None) or 0,
+            git_rev=git_revision(),
+            args=session.config.invocation_params.args,
+        )
+
+
+def pytest_runtest_logreport(report):
+    run_durations.add(report)
+    if results_stream:
+        node = getattr(report, "node", None)
+        results_stream.phase(report, worker=node.gateway.id if node else worker_id())
+    properties = dict(report.user_properties)
+    if "matrix_test" in properties and (report.when == "call" or (report.when == "setup" and not report.passed)):
+        browser_timings.add(properties["matrix_test"], properties["browser"], report.outcome, report.duration)
+
+
+def pytest_html_results_table_header(cells):
+    cells.insert(1, '<th class="sortable" data-column-type="browser">Browser</th>')
+
+
+def pytest_html_results_table_row(report, cells):
+    cells.insert(1, f'<td class="col-browser">{dict(report.user_properties).get("browser", "")}</td>')
+
+
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    lines = browser_timings.summary_lines()
+    if lines:
+        prefix.append("<h3>Browsers</h3><pre>" + "\n".join(lines) + "</pre>")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if results_stream:
+        results_stream.session_finish(exitstatus, collected=session.testscollected, failed=session.testsfailed)
+    path = session.config.getoption("--duration-store")
+    if not hasattr(session.config, "workerinput") and path != "off" and run_durations.tests:
+        store = DurationStore(path)
+        store.record_run(
+            run_durations.tests,
+            browser=session.config.getoption("--browser"),
+            headless=session.config.getoption("--headless"),
+            workers=getattr(session.config.option, "numprocesses", None) or 0,
+        )
+        store.close()
+    if hasattr(session.config, "workerinput"):
+        session.config.workeroutput["wait_records"] = wait_ledger.export()
+        session.config.workeroutput["network_savings"] = network_savings.export()
+        session.config.workeroutput["async_flows"] = async_flow_summaries
+        session.config.workeroutput["shard_plan"] = shard_plan
+        session.config.workeroutput["startup"] = startup_breakdowns
+        session.config.workeroutput["har_cache"] = har_stats.export()
+        session.config.workeroutput["restores"] = restore_timings.export()
+        session.config.workeroutput["visual"] = visual_stats.export()
+        session.config.workeroutput["locator_healing"] = healing_stats.export()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # xdist controller: collect what each worker measured
+    workeroutput = getattr(node, "workeroutput", {})
+    wait_ledger.merge(workeroutput.get("wait_records", []))
+    network_savings.merge(workeroutput.get("network_savings", {}))
+    async_flow_summaries.extend(workeroutput.get("async_flows", []))
+    startup_breakdowns.extend(workeroutput.get("startup", []))
+    har_stats.merge(workeroutput.get("har_cache", {}))
+    restore_timings.merge(workeroutput.get("restores", []))
+    visual_stats.merge(workeroutput.get("visual", {}))
+    healing_stats.merge(workeroutput.get("locator_healing", {}))
+    # every worker computes the same split, keep one copy
+    shard_plan[:] = workeroutput.get("shard_plan", shard_plan)
+
+
+def pytest_terminal_summary(terminalreporter):
+    lines = wait_ledger.summary_lines()
+    if lines:
+        terminalreporter.write_sep("-", "synchronization summary")
+        for line in lines:
+            terminalreporter.write_line(line)
+    lines = network_savings.summary_lines()
+    if lines:
+        terminalreporter.write_sep("-", "network profiles")
+        for line in lines:
+            terminalreporter.write_line(line)
+    lines = browser_timings.summary_lines()
+    if lines:
+        terminalreporter.write_sep("-", "browsers")
+        for line in lines:
+            terminalreporter.write_line(line)
+    lines = restore_timings.summary_lines()
+    if lines:
+        terminalreporter.write_sep("-", "data isolation")
+        for line in lines:
+            terminalreporter.write_line(line)
+    lines = healing_stats.summary_lines()
+    if lines:
+        terminalreporter.write_sep("-", "locator healing")
+        for line in lines:
+            terminalreporter.write_line(line)
+    lines = visual_stats.summary_lines()
+    if lines:
+        terminalreporter.write_sep("-", "visual checks")
+        for line in lines:
+            terminalreporter.write_line(line)
+    lines = har_stats.summary_lines()
+    if lines:
+        terminalreporter.write_sep("-", "har cache")
+        for line in lines:
+            terminalreporter.write_line(line)
+    if startup_breakdowns:
+        terminalreporter.write_sep("-", "startup")
+        for line in sorted(startup_breakdowns):
+            terminalreporter.write_line(line)
+    if async_flow_summaries:
+        terminalreporter.write_sep("-", "async flows")
+        for line in async_flow_summaries:
+            terminalreporter.write_line(line)
+    if impact_summary:
+        terminalreporter.write_sep("-", "affected tests")
+        for line in impact_summary:
+            terminalreporter.write_line(line)
+    if shard_plan:
+        terminalreporter.write_sep("-", "shards")
+        for line in shard_plan:
+            terminalreporter.write_line(line)
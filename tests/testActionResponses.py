@@ -0,0 +1,78 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from utils.action_responses import ActionResponses
+from utils.waits import PageWaiter, WaitLedger
+
+
+def fake_response(method, url, status=200, response_end=42.0):
+    # like Playwright, responseEnd is -1 until the body has been received
+    request = SimpleNamespace(method=method, timing={"responseEnd": -1})
+    return SimpleNamespace(request=request, url=url, status=status,
+                           finished=lambda: request.timing.update(responseEnd=response_end))
+
+
+class FakePage:
+    """Replays `responses` to whichever expect_response predicate matches first."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.settled = 0
+
+    @contextmanager
+    def expect_response(self, predicate, timeout=None):
+        info = SimpleNamespace(value=None)
+        yield info
+        info.value = next(r for r in self.responses if predicate(r))
+        self.responses.remove(info.value)
+
+    def wait_for_load_state(self, state, timeout=None):
+        pass
+
+    def evaluate(self, script, args):
+        self.settled += 1
+        return True
+
+
+REGISTRY = ActionResponses({
+    "publish": [{"method": "POST", "path": "/blogs"}],
+    "delete": [{"method": "DELETE", "path": "/blogs/*"}],
+})
+
+
+def test_actionresponses_001_specs_match_method_and_path_suffix():
+    publish, = REGISTRY.specs_for("publish")
+    delete, = REGISTRY.specs_for("delete")
+    assert publish.matches(fake_response("POST", "http://localhost:3001/api/blogs"))
+    assert publish.matches(fake_response("POST", "http://localhost:5173/api/blogs?draft=0"))
+    assert not publish.matches(fake_response("GET", "http://localhost:3001/api/blogs"))
+    assert not publish.matches(fake_response("POST", "http://localhost:3001/api/blogs/7"))
+    assert delete.matches(fake_response("DELETE", "http://localhost:3001/api/blogs/7"))
+    assert REGISTRY.specs_for("home_screen") == []
+
+
+def test_actionresponses_002_config_maps_the_networkidle_actions():
+    registry = ActionResponses.from_config()
+    for action in ("search_screen", "login_user_for_blog", "click_delete_icon_for_blog", "navigate_to_dashboard"):
+        assert registry.specs_for(action), action
+
+
+def test_actionresponses_003_for_action_records_responses_or_falls_back():
+    page = FakePage([
+        fake_response("GET", "http://localhost:3001/api/blogs"),
+        fake_response("POST", "http://localhost:3001/api/blogs", status=201, response_end=85.25),
+    ])
+    ledger = WaitLedger()
+    waiter = PageWaiter(page, ledger=ledger, registry=REGISTRY)
+    clicks = []
+
+    responses = waiter.for_action(lambda: clicks.append("publish"), "publish", legacy=2)
+    waiter.for_action(lambda: clicks.append("home"), "home_screen", legacy=1)
+
+    assert clicks == ["publish", "home"]
+    assert [r.status for r in responses] == [201]
+    publish, home = ledger.records
+    assert publish.condition == "responses"
+    assert publish.responses == [{"call": "POST /api/blogs", "status": 201, "ms": 85.2}]
+    assert home.condition == "dom_settled" and home.ok and page.settled == 1
+    assert ledger.summary()["responses"] == 1
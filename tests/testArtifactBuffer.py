@@ -0,0 +1,82 @@
+import os
+
+from utils.artifact_buffer import ArtifactCapture, ArtifactStore, ScreenshotRing, report_extras
+
+
+class FakeTracing:
+    def __init__(self):
+        self.calls = []
+
+    def start(self, **kwargs):
+        self.calls.append("start")
+
+    def start_chunk(self, **kwargs):
+        self.calls.append("start_chunk")
+
+    def stop_chunk(self, path=None):
+        self.calls.append(("stop_chunk", path))
+        if path:
+            with open(path, "wb") as file:
+                file.write(b"trace")
+
+
+class FakeContext:
+    def __init__(self):
+        self.tracing = FakeTracing()
+
+
+class FakePage:
+    def screenshot(self, path=None, **kwargs):
+        if path:
+            with open(path, "wb") as file:
+                file.write(b"png")
+        return b"png"
+
+
+class FakeExtras:
+    def url(self, content, name):
+        return ("url", content, name)
+
+
+def test_artifact_buffer_001_ring_keeps_last_steps():
+    ring = ScreenshotRing(2)
+    for step in ("open", "search", "readmore"):
+        ring.add(step, step.encode())
+    assert [step for step, _ in ring.frames] == ["search", "readmore"]
+
+
+def test_artifact_buffer_002_passing_chunk_is_discarded_failing_chunk_is_kept(tmp_path):
+    store = ArtifactStore(tmp_path)
+    context = FakeContext()
+
+    passed = ArtifactCapture("tests/test_a.py::test_ok", store).start(context, FakePage())
+    assert passed.finish(False) is None
+    failed = ArtifactCapture("tests/test_a.py::test_bad", store, step_screenshots=3).start(context, FakePage())
+    failed.after_step("search_screen")
+    kept = failed.finish(True, "failed")
+
+    # tracing is started once per (pooled) context, then chunked per test
+    assert context.tracing.calls.count("start") == 1
+    assert ("stop_chunk", None) in context.tracing.calls
+    assert sorted(os.listdir(kept["folder"])) == ["final.png", "step01_search_screen.jpg", "trace.zip"]
+    assert os.listdir(tmp_path) == [os.path.basename(kept["folder"])]
+
+    # linked from the report by relative path, not inlined into it
+    name = os.path.basename(kept["folder"])
+    assert report_extras(kept, str(tmp_path.parent), FakeExtras()) == [
+        ("url", f"{tmp_path.name}/{name}/final.png", "final screenshot"),
+        ("url", f"{tmp_path.name}/{name}/trace.zip", "trace (failed)"),
+    ]
+
+
+def test_artifact_buffer_003_store_evicts_oldest_over_budget(tmp_path):
+    store = ArtifactStore(tmp_path, max_bytes=150)
+    folders = []
+    for index in range(3):
+        folder = store.folder_for(f"tests/test_a.py::test_{index}")
+        with open(os.path.join(folder, "trace.zip"), "wb") as file:
+            file.write(b"x" * 100)
+        os.utime(folder, (index, index))
+        folders.append(folder)
+    store.evict(keep=folders[0])
+    assert sorted(os.listdir(tmp_path)) == ["tests_test_a.py_test_0"]
@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+import time
+
+from utils import auth_state
+from utils.auth_state import AuthStateCache, credentials_fingerprint
+
+STATE = {"cookies": [{"name": "session", "value": "abc"}], "origins": []}
+
+
+class FakeContext:
+    def storage_state(self):
+        return STATE
+
+
+def _config(tmp_path, password):
+    path = tmp_path / f"config-{password}.yaml"
+    path.write_text(f"credentials:\n  adminusername: admin\n  password: {password}\n")
+    return str(path)
+
+
+def test_authstate_001_valid_until_the_ttl_or_credentials_change(tmp_path, monkeypatch):
+    fingerprint = credentials_fingerprint("http://localhost:5173/", _config(tmp_path, "secret"))
+    assert fingerprint == credentials_fingerprint("http://localhost:5173/", _config(tmp_path, "secret"))
+    assert fingerprint != credentials_fingerprint("http://localhost:5173/", _config(tmp_path, "changed"))
+    assert fingerprint != credentials_fingerprint("http://localhost:3000/", _config(tmp_path, "secret"))
+
+    cache = AuthStateCache(fingerprint, ttl=60, directory=str(tmp_path / "auth"))
+    assert not cache.is_valid()
+    cache.save(FakeContext())
+    assert cache.is_valid()
+    # saved for other credentials
+    assert not AuthStateCache("other", ttl=60, directory=str(tmp_path / "auth")).is_valid()
+    now = time.time()
+    monkeypatch.setattr(auth_state.time, "time", lambda: now + 61)
+    assert not cache.is_valid()
+
+
+def test_authstate_002_save_replaces_whole_files_per_scope(tmp_path):
+    directory = tmp_path / "auth"
+    run, worker = AuthStateCache("fp", directory=str(directory)), AuthStateCache("fp", "gw1", directory=str(directory))
+    run.save(FakeContext())
+    assert json.loads((directory / "admin-run.json").read_text()) == STATE
+    assert json.loads((directory / "admin-run.meta.json").read_text())["fingerprint"] == "fp"
+    # written to a temporary file and renamed into place, nothing left behind
+    assert sorted(os.listdir(directory)) == ["admin-run.json", "admin-run.meta.json"]
+    assert not worker.is_valid()
+
+    (directory / "admin-run.meta.json").write_text("{not json")
+    assert not run.is_valid()
+    run.invalidate()
+    run.invalidate()
+    assert os.listdir(directory) == []
+
+
+def test_authstate_003_lock_is_exclusive_and_recovers_stale_locks(tmp_path):
+    cache = AuthStateCache("fp", directory=str(tmp_path / "auth"))
+    lock_path = cache.state_path + ".lock"
+    order = []
+    with cache.lock():
+        assert os.path.exists(lock_path)
+
+        def other_worker():
+            with cache.lock(timeout=5):
+                order.append("other")
+        thread = threading.Thread(target=other_worker)
+        thread.start()
+        time.sleep(0.2)
+        order.append("first")
+    thread.join()
+    assert order == ["first", "other"] and not os.path.exists(lock_path)
+
+    # left behind by a killed worker
+    open(lock_path, "w").close()
+    old = time.time() - 600
+    os.utime(lock_path, (old, old))
+    with cache.lock(timeout=120):
+        pass
+    assert not os.path.exists(lock_path)
@@ -0,0 +1,31 @@
+import pytest
+from utils.browser_matrix import BROWSERS, BrowserTimings, parse_browsers
+
+
+def test_browser_matrix_001_parse_browsers():
+    assert parse_browsers("chromium") == ["chromium"]
+    assert parse_browsers("firefox, chromium,firefox") == ["firefox", "chromium"]
+    assert parse_browsers("all") == list(BROWSERS)
+    with pytest.raises(ValueError):
+        parse_browsers("chromium,safari")
+
+
+def test_browser_matrix_002_summary_compares_tests_passed_on_every_engine():
+    timings = BrowserTimings()
+    for test, chromium, firefox in (("t1", 2.0, 3.0), ("t2", 4.0, 5.0), ("t3", 1.0, 1.5)):
+        timings.add(test, "chromium", "passed", chromium)
+        timings.add(test, "firefox", "passed", firefox)
+    # failed on firefox, so it is left out of the comparison
+    timings.add("t4", "chromium", "passed", 1.0)
+    timings.add("t4", "firefox", "failed", 30.0)
+    lines = timings.summary_lines()
+    assert lines[0] == "chromium: 4 tests, 4 passed, 0 not passed, 8.0s in tests"
+    assert lines[1] == "firefox: 4 tests, 3 passed, 1 not passed, 39.5s in tests"
+    assert lines[2] == "firefox vs chromium: median +50% per test over 3 tests"
+    assert lines[3] == "  t1: chromium 2.00s, firefox 3.00s"
+
+
+def test_browser_matrix_003_single_engine_has_no_summary():
+    timings = BrowserTimings()
+    timings.add("t1", "chromium", "passed", 1.0)
+    assert timings.summary_lines() == []
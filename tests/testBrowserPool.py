@@ -0,0 +1,96 @@
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+from utils.browser_pool import CONTEXT_OPTIONS, ContextPool, browser_for_worker
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    def evaluate(self, script):
+        if self.context.broken:
+            raise PlaywrightError("Target closed")
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.pages = []
+        self.closed = False
+        self.cookies_cleared = 0
+        self.broken = False
+
+    def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    def clear_cookies(self):
+        self.cookies_cleared += 1
+
+    def clear_permissions(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **options):
+        context = FakeContext(options)
+        self.contexts.append(context)
+        return context
+
+
+def test_browserpool_001_warm_pool_and_default_viewport():
+    browser = FakeBrowser()
+    pool = ContextPool(browser, size=2)
+    pool.warm()
+    assert len(browser.contexts) == 2
+    assert all(context.options == CONTEXT_OPTIONS for context in browser.contexts)
+    assert CONTEXT_OPTIONS["viewport"] == {"width": 1920, "height": 1080}
+    first, second, third = pool.acquire(), pool.acquire(), pool.acquire()
+    assert [first, second] == browser.contexts[:2] and third is browser.contexts[2]
+    assert pool.stats == {"created": 3, "reused": 0, "closed": 0, "cold": 1}
+    with pytest.raises(ValueError):
+        ContextPool(browser, recycle="keep")
+
+
+def test_browserpool_002_close_policy_replaces_every_context():
+    browser = FakeBrowser()
+    pool = ContextPool(browser, size=1, recycle="close")
+    pool.warm()
+    context = pool.acquire()
+    pool.release(context)
+    assert context.closed
+    assert pool.acquire() is browser.contexts[1]
+    assert pool.stats["closed"] == 1 and pool.stats["created"] == 2
+
+
+def test_browserpool_003_reuse_until_max_uses_or_reset_fails():
+    browser = FakeBrowser()
+    pool = ContextPool(browser, size=1, recycle="reuse", max_uses=2)
+    context = pool.acquire()
+    page = context.new_page()
+    pool.release(context)
+    assert not context.closed and page.closed and context.cookies_cleared == 1
+    assert pool.acquire() is context
+    pool.release(context)
+    # second use reached max_uses: closed and replaced
+    assert context.closed and pool.acquire() is browser.contexts[1]
+
+    broken = browser.contexts[1]
+    broken.new_page()
+    broken.broken = True
+    pool.release(broken)
+    assert broken.closed and pool.stats["reused"] == 1
+
+    assert browser_for_worker("chromium, firefox", "webkit") in ("chromium", "firefox")
+    assert browser_for_worker("", "webkit") == "webkit"
@@ -0,0 +1,46 @@
+import json
+import os
+import subprocess
+import sys
+
+from utils.browser_server import Lease, connect, read_state
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def _write_state(state_dir, **state):
+    with open(os.path.join(state_dir, "state.json"), "w") as file:
+        json.dump(dict({"browser": "chromium", "headless": False, "endpoint": "http://127.0.0.1:9"}, **state), file)
+
+
+def test_browser_server_001_state_of_a_dead_daemon_is_ignored(tmp_path):
+    assert read_state(tmp_path) is None
+    _write_state(tmp_path, pid=_dead_pid())
+    assert read_state(tmp_path) is None
+    _write_state(tmp_path, pid=os.getpid())
+    assert read_state(tmp_path)["pid"] == os.getpid()
+
+
+def test_browser_server_002_only_live_leases_count(tmp_path):
+    lease = Lease(tmp_path).acquire()
+    os.makedirs(tmp_path / "leases", exist_ok=True)
+    (tmp_path / "leases" / str(_dead_pid())).write_text("0")
+    assert Lease.live(tmp_path) == 1
+    assert os.listdir(tmp_path / "leases") == [str(os.getpid())]
+    lease.release()
+    assert Lease.live(tmp_path) == 0
+
+
+def test_browser_server_003_falls_back_to_launch_without_a_matching_server(tmp_path):
+    # no playwright needed: every fallback returns before connecting
+    assert connect(None, "chromium", False, tmp_path) == (None, None)
+    _write_state(tmp_path, pid=os.getpid())
+    assert connect(None, "firefox", False, tmp_path) == (None, None)
+    assert connect(None, "chromium", True, tmp_path) == (None, None)
+    # matching server whose endpoint does not answer
+    assert connect(None, "chromium", False, tmp_path) == (None, None)
+    assert not os.path.exists(tmp_path / "leases")
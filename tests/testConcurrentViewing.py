@@ -0,0 +1,73 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from utils.async_runner import assert_all_passed, run_flows
+
+SEARCH_TERMS = ["Getting Started with TypeScript", "TypeScript", "typescript"]
+
+
+def search_flow(term):
+    async def flow(login_page):
+        await login_page.search_and_verify_blog(term)
+    return flow
+
+
+async def no_results_flow(login_page):
+    await login_page.search_screen("Saikiran Shet")
+    await login_page.verify_no_blogs_found()
+
+
+async def dark_mode_flow(login_page):
+    await login_page.switch_to_dark_mode()
+    await login_page.verify_dark_mode_active()
+    await login_page.switch_to_light_mode()
+
+
+async def readmore_flow(login_page):
+    await login_page.search_and_verify_blog("Getting Started with TypeScript")
+    await login_page.click_readmore_button()
+    await login_page.wait.for_dom_settled("readmore_flow", legacy=2)
+
+
+@pytest.mark.public_viewing
+def test_concurrentviewing_001_search_flows(async_runner):
+    flows = {f"search {term!r} #{i}": search_flow(term) for term in SEARCH_TERMS for i in range(8)}
+    flows.update({f"no results #{i}": no_results_flow for i in range(8)})
+    assert_all_passed(async_runner.run(flows))
+
+
+@pytest.mark.public_viewing
+def test_concurrentviewing_002_dark_mode_and_readmore_flows(async_runner):
+    flows = {f"dark mode #{i}": dark_mode_flow for i in range(12)}
+    flows.update({f"read more #{i}": readmore_flow for i in range(12)})
+    assert_all_passed(async_runner.run(flows))
+
+
+def test_concurrentviewing_003_run_flows_caps_open_pages_and_collects_failures():
+    open_pages = {"now": 0, "peak": 0}
+
+    @asynccontextmanager
+    async def open_page():
+        open_pages["now"] += 1
+        open_pages["peak"] = max(open_pages["peak"], open_pages["now"])
+        try:
+            yield object()
+        finally:
+            open_pages["now"] -= 1
+
+    async def ok(login_page):
+        await asyncio.sleep(0.01)
+
+    async def broken(login_page):
+        await asyncio.sleep(0.01)
+        raise AssertionError("Expected blog title to be visible")
+
+    flows = {f"ok {i}": ok for i in range(10)}
+    flows["broken"] = broken
+    results = asyncio.run(run_flows(flows, open_page, concurrency=3))
+
+    assert open_pages["peak"] == 3
+    assert [r.name for r in results if not r.ok] == ["broken"]
+    with pytest.raises(AssertionError, match="1 of 11 flows failed:\nbroken: Expected blog title"):
+        assert_all_passed(results)
@@ -0,0 +1,60 @@
+import pytest
+import requests
+from utils.data_factory import BlogFactory
+from utils.standin_server import StandInServer
+
+
+@pytest.fixture
+def standin_api():
+    server = StandInServer(blogs=[], users={"admin": "admin123"}).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def factory(standin_api):
+    factory = BlogFactory(standin_api.api_url, "admin", "admin123", pool_size=4).login()
+    yield factory
+    factory.close()
+
+
+def test_datafactory_001_create_many_tracks_ids(standin_api, factory):
+    blogs = factory.create_many(["Blog One", "Blog Two", {"title": "Draft", "status": "draft"}])
+    assert sorted(blog["title"] for blog in blogs) == ["Blog One", "Blog Two", "Draft"]
+    assert sorted(factory.created_ids) == sorted(blog["id"] for blog in blogs)
+    assert standin_api.store.blogs[blogs[2]["id"]]["status"] == "draft"
+
+
+def test_datafactory_002_cleanup_deletes_only_created_posts(standin_api, factory):
+    standin_api.store.blogs[100] = {"id": 100, "title": "Seeded by the app"}
+    factory.create_many([f"Bulk {i}" for i in range(10)])
+    factory.cleanup()
+    assert list(standin_api.store.blogs) == [100]
+    assert factory.created_ids == []
+
+
+def test_datafactory_003_cleanup_ignores_already_deleted_posts(standin_api, factory):
+    blog = factory.create("Deleted by the test")
+    factory.delete(blog["id"])
+    assert factory.cleanup() == [False]
+
+
+def test_datafactory_004_delete_by_title(standin_api, factory):
+    standin_api.store.blogs[100] = {"id": 100, "title": "Blog One"}
+    standin_api.store.blogs[101] = {"id": 101, "title": "Keep me"}
+    factory.delete_by_title(["Blog One"])
+    assert list(standin_api.store.blogs) == [101]
+
+
+def test_datafactory_005_bulk_calls_reuse_pooled_connections(standin_api, factory):
+    factory.create_many([f"Pooled {i}" for i in range(40)])
+    factory.cleanup()
+    # login + 80 requests over at most pool_size keep-alive connections
+    assert len(standin_api.stats["connections"]) <= factory.pool_size + 1
+
+
+def test_datafactory_006_login_rejects_bad_credentials(standin_api):
+    factory = BlogFactory(standin_api.api_url, "admin", "wrong")
+    with pytest.raises(requests.HTTPError):
+        factory.login()
+    factory.close()
@@ -0,0 +1,70 @@
+import pytest
+from utils.data_factory import BlogFactory
+from utils.data_isolation import DataIsolation, RestoreTimings
+from utils.standin_server import StandInServer
+
+
+@pytest.fixture
+def standin_api():
+    server = StandInServer(users={"admin": "admin123"}).start()
+    yield server
+    server.stop()
+
+
+def _factory(server, **api_config):
+    return BlogFactory(server.api_url, "admin", "admin123", api_config=api_config).login()
+
+
+def _change_everything(factory, store):
+    first, second = sorted(store.blogs)[:2]
+    factory.create("Added by the test")
+    factory.delete(first)
+    factory.update(second, title="Edited by the test")
+
+
+@pytest.mark.parametrize("api_config, strategy", [
+    ({}, "endpoint"),
+    ({"snapshot_path": "/test/no-such-endpoint"}, "api-diff"),
+])
+def test_dataisolation_001_restores_added_deleted_and_edited_posts(standin_api, api_config, strategy):
+    store = standin_api.store
+    before = {blog_id: blog["title"] for blog_id, blog in store.blogs.items()}
+    factory = _factory(standin_api, **api_config)
+    timings = RestoreTimings()
+    isolation = DataIsolation(factory, timings=timings)
+    with isolation.isolated("test_something"):
+        _change_everything(factory, store)
+    assert isolation.strategy == strategy
+    assert sorted(blog["title"] for blog in store.blogs.values()) == sorted(before.values())
+    assert timings.rows[0]["test"] == "test_something"
+    assert timings.rows[0]["changes"] == 3
+    factory.close()
+
+
+def test_dataisolation_002_restores_when_the_test_fails(standin_api):
+    store = standin_api.store
+    before = sorted(store.blogs)
+    factory = _factory(standin_api)
+    isolation = DataIsolation(factory, timings=RestoreTimings(), shared=True)
+    with pytest.raises(AssertionError):
+        with isolation.isolated("test_failing"):
+            factory.create("Left behind by a failing test")
+            assert False
+    assert sorted(store.blogs) == before
+    # the shared lock is released again
+    with isolation.isolated("test_next"):
+        pass
+    factory.close()
+
+
+def test_dataisolation_003_timings_merge_and_summary():
+    timings = RestoreTimings()
+    timings.add("test_a", "endpoint", 0.002, 1)
+    other = RestoreTimings()
+    other.add("test_b", "endpoint", 0.004, 0)
+    other.add("test_c", "api-diff", 0.120, 3)
+    timings.merge(other.export())
+    lines = timings.summary_lines()
+    assert lines[0] == "api-diff: 1 restores, median 120.0 ms, max 120.0 ms, 3 posts put back"
+    assert lines[1] == "endpoint: 2 restores, median 3.0 ms, max 4.0 ms, 1 posts put back"
+    assert lines[2:] == ["  test_c: 120.0 ms, 3 posts", "  test_a: 2.0 ms, 1 posts"]
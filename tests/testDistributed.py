@@ -0,0 +1,111 @@
+import pytest
+from utils.distributed import Coordinator, CoordinatorClient, PullWorker, WorkQueue, order_tests
+from utils.results_stream import ResultsStream, read_records
+
+
+def test_distributed_001_tests_of_a_lost_worker_are_requeued_then_given_up():
+    queue = WorkQueue(["t1", "t2", "t3"], max_attempts=2)
+    assert queue.lease("a") == "t1" and queue.lease("a") == "t2"
+    assert queue.release_worker("a", "a disconnected") == ["t1", "t2"]
+    assert queue.lease("b") == "t1"
+    assert queue.complete("b", "t1", "passed")
+    # a late result from the worker that lost the lease does not count
+    assert not queue.complete("a", "t1", "failed")
+    assert queue.lease("b") == "t2"
+    queue.release_worker("b", "b disconnected")
+    assert queue.lost == {"t2": "b disconnected"}
+    assert queue.lease("c") == "t3"
+    queue.complete("c", "t3", "passed")
+    assert queue.lease("c", wait=True) is None
+    assert queue.outcomes == {"t1": "passed", "t2": "error", "t3": "passed"}
+
+
+def test_distributed_002_order_is_longest_first_grouped_by_engine():
+    tests = ["t.py::a[firefox]", "t.py::b[chromium]", "t.py::a[chromium]", "u.py::c"]
+    history = {("t.py::a[chromium]", "chromium"): [9.0], ("t.py::b[chromium]", "chromium"): [1.0],
+               ("t.py::a[firefox]", "firefox"): [12.0], ("u.py::c", None): [0.1]}
+    assert order_tests(tests, history) == ["u.py::c", "t.py::a[chromium]", "t.py::b[chromium]", "t.py::a[firefox]"]
+
+
+def test_distributed_003_worker_protocol_streams_records_and_requeues_on_disconnect(tmp_path):
+    stream = ResultsStream(tmp_path / "results.jsonl")
+    coordinator = Coordinator(["t1", "t2"], ["tests/"], stream, port=0).start()
+    try:
+        first = CoordinatorClient(coordinator.address)
+        assert first.hello("node")["pytest_args"] == ["tests/"]
+        assert first.next(wait=False) == "t1"
+        first.record({"type": "phase", "nodeid": "t1", "when": "call", "outcome": "passed", "duration": 0.2},
+                     {"logs": {"name": "t1.call.txt", "data": "b2s="}})
+        first.done("t1", "passed")
+        assert first.next(wait=False, ahead=True) == "t2" and first.start("t2")
+        first.close()
+
+        second = CoordinatorClient(coordinator.address)
+        assert second.hello("node")["worker"] == "node.2"
+        assert second.next(wait=True) == "t2"
+        second.done("t2", "passed")
+        assert second.next(wait=True) is None
+        second.close()
+        assert coordinator.queue.outcomes == {"t1": "passed", "t2": "passed"}
+        record = read_records(stream.path)[0][0]
+        assert record["logs"] == "logs/node/t1.call.txt"
+        assert (tmp_path / "logs" / "node" / "t1.call.txt").read_text() == "ok"
+    finally:
+        coordinator.stop()
+
+
+def test_distributed_004_lookahead_goes_to_an_idle_worker_unless_started():
+    queue = WorkQueue(["t1", "t2", "t3"])
+    assert queue.lease("a") == "t1" and queue.lease("a", ahead=True) == "t2"
+    # b is idle and nothing is pending: it takes a's lookahead instead of waiting for a to finish t1
+    assert queue.lease("b") == "t3" and queue.lease("b", ahead=True) is None
+    assert queue.lease("c", wait=True) == "t2"
+    assert not queue.start("a", "t2") and queue.start("c", "t2")
+    assert queue.complete("c", "t2", "passed")
+    # a lookahead that was started stays with its worker
+    queue = WorkQueue(["t1", "t2"])
+    queue.lease("a")
+    queue.lease("a", ahead=True)
+    assert queue.start("a", "t2") and queue.lease("b") is None
+    assert queue.attempts == {"t1": 1, "t2": 1}
+
+
+class FakeClient:
+    """Replays the coordinator's answers; the lookahead `test_a2` goes to another worker."""
+
+    def __init__(self, leases, reassigned=()):
+        self.leases = list(leases)
+        self.reassigned = set(reassigned)
+        self.done_tests = []
+        self.records = []
+
+    def next(self, wait, ahead=False):
+        return self.leases.pop(0)
+
+    def start(self, test):
+        return test not in self.reassigned
+
+    def record(self, record, files):
+        self.records.append(record)
+
+    def done(self, test, outcome):
+        self.done_tests.append((test, outcome))
+
+
+def test_distributed_005_worker_tears_down_for_a_reassigned_lookahead(tmp_path):
+    log = tmp_path / "fixtures.log"
+    fixture = ('import pytest\n\n@pytest.fixture(scope="module")\ndef mod(request):\n'
+               f'    open({str(log)!r}, "a").write(f"setup {{request.module.__name__}}\\n")\n    yield\n'
+               f'    open({str(log)!r}, "a").write(f"teardown {{request.module.__name__}}\\n")\n')
+    (tmp_path / "test_a.py").write_text(fixture + "def test_a1(mod): pass\ndef test_a2(mod): pass\n")
+    (tmp_path / "test_b.py").write_text(fixture + "def test_b1(mod): pass\ndef test_b2(mod): pass\n")
+    (tmp_path / "pytest.ini").write_text("[pytest]\n")
+    client = FakeClient(["test_a.py::test_a1", "test_a.py::test_a2", "test_b.py::test_b1", "test_b.py::test_b2",
+                         None, None], reassigned=["test_a.py::test_a2"])
+    worker = PullWorker(client, "w1", str(tmp_path / "results"))
+    code = pytest.main([str(tmp_path), "-q", "-p", "no:cacheprovider", "-c", str(tmp_path / "pytest.ini")],
+                       plugins=[worker])
+    assert code == 0
+    assert client.done_tests == [("test_a.py::test_a1", "passed"), ("test_b.py::test_b1", "passed"),
+                                 ("test_b.py::test_b2", "passed")]
+    assert log.read_text().split("\n")[:-1] == ["setup test_a", "teardown test_a", "setup test_b", "teardown test_b"]
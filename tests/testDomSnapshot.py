@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+from utils.dom_snapshot import parse_admin_rows, parse_blog_cards
+from utils.waits import PageWaiter, WaitLedger
+
+BLOG_LIST = """
+<main>
+  <div class="MuiCard-root">
+    <article>
+      <h5>Getting Started with TypeScript</h5>
+      <span class="MuiChip-label">Programming</span>
+      <span class="MuiChip-label">TypeScript</span>
+      <span class="MuiChip-label">Beginner</span>
+      <p>Types   for the
+         rest of us.</p>
+      <button>Read More</button>
+    </article>
+  </div>
+  <div class="MuiCard-root">
+    <h5>Draft notes</h5>
+  </div>
+</main>
+"""
+
+DASHBOARD = """
+<table>
+  <thead><tr><th>Title</th><th>Category</th><th>Tags</th><th>Status</th><th>Actions</th></tr></thead>
+  <tbody>
+    <tr><td>Test Title</td><td>Technology</td>
+        <td><span class="MuiChip-label">qa</span><span class="MuiChip-label">e2e</span></td>
+        <td>Published</td><td><button>Edit</button></td></tr>
+    <tr><td>Plain tags</td><td>Lifestyle</td><td>React, Node.js</td><td>Draft</td><td></td></tr>
+  </tbody>
+</table>
+"""
+
+
+def test_domsnapshot_001_cards_are_read_once_with_chips_and_read_more():
+    cards = parse_blog_cards(BLOG_LIST)
+    # the <article> inside the MUI card is the same card, not a second one
+    assert [card.title for card in cards] == ["Getting Started with TypeScript", "Draft notes"]
+    first, second = cards
+    assert first.category == "Programming"
+    assert first.tags == ["TypeScript", "Beginner"]
+    assert first.excerpt == "Types for the rest of us."
+    assert first.read_more and not second.read_more
+    assert second.category == "" and second.tags == []
+
+
+def test_domsnapshot_002_search_term_matches_any_visible_field():
+    first, second = parse_blog_cards(BLOG_LIST)
+    assert first.mentions("getting started")
+    assert first.mentions("beginner")
+    assert not second.mentions("typescript")
+
+
+def test_domsnapshot_003_admin_rows_are_mapped_by_header():
+    rows = parse_admin_rows(DASHBOARD)
+    assert [row.title for row in rows] == ["Test Title", "Plain tags"]
+    assert rows[0].status == "Published" and rows[0].category == "Technology"
+    assert rows[0].tags == ["qa", "e2e"]
+    assert rows[1].tags == ["React", "Node.js"]
+    assert rows[1].cells["status"] == "Draft"
+
+
+def test_domsnapshot_004_snapshot_waits_that_time_out_are_recorded_as_failed():
+    ledger = WaitLedger()
+    waiter = PageWaiter(SimpleNamespace(wait_for_timeout=lambda ms: None), ledger=ledger)
+    snapshots = iter([[], [], ["Test Title"]])
+    assert waiter.for_snapshot(lambda: next(snapshots), bool, "found", legacy=2) == ["Test Title"]
+    # the page never shows it: the last snapshot comes back for the assertion, the wait counts as a timeout
+    assert waiter.for_snapshot(lambda: [], bool, "missing", legacy=2, timeout=30) == []
+    found, missing = ledger.records
+    assert found.ok and not missing.ok
+    assert ledger.summary()["timeouts"] == 1
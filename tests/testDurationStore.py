@@ -0,0 +1,113 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import pandas as pd
+from utils import step_timer
+from utils.duration_report import build_report, find_regressions, load_frames
+from utils.duration_store import DurationStore, RunCollector
+
+
+@step_timer.timed_steps
+class FakePage:
+    def search_screen(self):
+        pass
+
+    def search_and_verify_blog(self):
+        self.search_screen()
+        raise AssertionError("no blog title")
+
+    async def home_screen(self):
+        await asyncio.sleep(0)
+
+    def _helper(self):
+        pass
+
+
+def test_durationstore_001_step_timer_records_public_methods():
+    step_timer.drain()
+    page = FakePage()
+    page._helper()
+    asyncio.run(page.home_screen())
+    try:
+        page.search_and_verify_blog()
+    except AssertionError:
+        pass
+    steps = step_timer.drain()
+    assert [(s["step"], s["ok"]) for s in steps] == [
+        ("FakePage.home_screen", True),
+        ("FakePage.search_screen", True),
+        ("FakePage.search_and_verify_blog", False),
+    ]
+    assert step_timer.drain() == []
+
+
+def test_durationstore_002_runs_round_trip_through_sqlite(tmp_path):
+    store = DurationStore(str(tmp_path / "durations.db"))
+    for duration in (4.0, 5.0, 6.0):
+        store.record_run({
+            "tests/testblogging.py::test_a": {"outcome": "passed", "duration": duration, "browser": "chromium",
+                                             "steps": [{"step": "LoginPage.search_screen", "duration": 1.5, "ok": True}]},
+            "tests/testblogging.py::test_b": {"outcome": "failed", "duration": 30.0, "steps": []},
+        }, browser="chromium", headless=True, git_rev="abc1234")
+    assert store.recent_durations(runs=2) == {"tests/testblogging.py::test_a": [6.0, 5.0]}
+    assert store.recent_durations(browser="firefox") == {}
+
+    # a --browser matrix run: each test is stored with the engine it ran on, not the option's value
+    collector = RunCollector()
+    for nodeid, engine, duration in (("test_m[chromium]", "chromium", 2.0), ("test_m[firefox]", "firefox", 3.0),
+                                     ("test_api", None, 0.2)):
+        properties = [("browser", engine), ("step_durations", [{"step": "LoginPage.search_screen", "duration": 1.0,
+                                                                "ok": True}])] if engine else []
+        collector.add(SimpleNamespace(nodeid=nodeid, duration=duration, failed=False, skipped=False,
+                                      user_properties=properties))
+    store.record_run(collector.tests, browser="chromium,firefox", headless=True, git_rev="abc1234")
+    assert store.recent_durations(browser="firefox") == {"test_m[firefox]": [3.0]}
+    per_engine = store.recent_durations(per_engine=True)
+    assert per_engine[("test_m[chromium]", "chromium")] == [2.0] and per_engine[("test_api", None)] == [0.2]
+    assert per_engine[("tests/testblogging.py::test_a", "chromium")] == [6.0, 5.0, 4.0]
+    store.close()
+
+    tests, steps = load_frames(str(tmp_path / "durations.db"))
+    assert len(tests) == 9 and len(steps) == 5
+    # steps carry their test's engine too, not the run's --browser string
+    assert dict(zip(steps["nodeid"], steps["browser"])) == {
+        "tests/testblogging.py::test_a": "chromium", "test_m[chromium]": "chromium", "test_m[firefox]": "firefox"}
+    assert "Test duration trends" in build_report(tests, steps, find_regressions(tests))
+
+
+def _history(nodeid, durations, browser="chromium"):
+    return pd.DataFrame({
+        "run_id": range(len(durations)), "git_rev": [f"rev{i}" for i in range(len(durations))],
+        "nodeid": nodeid, "browser": browser, "headless": 1, "outcome": "passed", "duration": durations,
+    })
+
+
+def test_durationstore_003_only_significant_slowdowns_are_flagged():
+    steady = [10.0, 10.4, 9.8, 10.1, 10.2, 9.9]
+    tests = pd.concat([
+        _history("slower", steady + [13.0, 13.4, 12.9]),
+        _history("noisy", [5, 15, 6, 14, 5, 16] + [12, 13, 11.0]),   # within its usual spread
+        _history("tiny", [0.10, 0.11, 0.10, 0.10, 0.11, 0.10] + [0.2, 0.2, 0.2]),   # below min_delta
+        _history("new", [1.0, 9.0, 9.0]),   # not enough history
+    ])
+    regressions = find_regressions(tests)
+    assert list(regressions["nodeid"]) == ["slower"]
+    assert regressions.loc[0, "since"] == "rev6"
+
+
+def test_durationstore_004_older_stores_take_the_run_browser_per_test(tmp_path):
+    path = str(tmp_path / "durations.db")
+    with sqlite3.connect(path) as connection:
+        connection.executescript(
+            "CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, started_at REAL NOT NULL, git_rev TEXT, "
+            "browser TEXT, headless INTEGER, workers INTEGER);"
+            "CREATE TABLE test_durations (run_id INTEGER NOT NULL, nodeid TEXT NOT NULL, outcome TEXT NOT NULL, "
+            "duration REAL NOT NULL);"
+            "INSERT INTO runs VALUES (1, 0, 'abc1234', 'webkit', 1, 0);"
+            "INSERT INTO test_durations VALUES (1, 'test_a', 'passed', 7.0);"
+        )
+    connection.close()
+    store = DurationStore(path)
+    assert store.recent_durations(per_engine=True) == {("test_a", "webkit"): [7.0]}
+    store.close()
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from utils import har_cache
+from utils.har_cache import HarCache, HarStats, har_entry, har_path, load_har, save_har
+
+API = "http://localhost:3001/api"
+
+
+def _entry(url, body, started=None, method="GET"):
+    started = started or har_cache._now()
+    return har_entry(method, url, None, 200, "OK", {"content-type": "application/json", "content-encoding": "gzip",
+                                                     "set-cookie": "sid=secret"}, body, started, 12.5)
+
+
+def test_harcache_001_replays_recorded_responses_in_order(tmp_path):
+    path = har_path("tests/testblogging.py::test_publicviewing_005_no_blogs_found[firefox]", str(tmp_path))
+    assert path == str(tmp_path / "testblogging" / "test_publicviewing_005_no_blogs_found.har")
+    save_har(path, [_entry(f"{API}/blogs?search=x", b'[]'), _entry(f"{API}/blogs?search=x", b'[{"id": 1}]')])
+
+    stats = HarStats()
+    # recorded against one host, replayed against another
+    cache = HarCache(path, "replay", "http://api.staging:8080/api", stats=stats)
+    first = cache.lookup("GET", "http://api.staging:8080/api/blogs?search=x")
+    second = cache.lookup("get", "http://api.staging:8080/api/blogs?search=x")
+    third = cache.lookup("GET", "http://api.staging:8080/api/blogs?search=x")
+    assert first["response"]["content"]["text"] == "[]"
+    assert second["response"]["content"]["text"] == third["response"]["content"]["text"] == '[{"id": 1}]'
+    assert cache.lookup("GET", f"{API}/blogs/7") is None
+    assert stats.counts["hits"] == 3 and stats.counts["misses"] == 1 and stats.counts["stale"] == 0
+    assert stats.misses == {"GET /api/blogs/7": 1}
+    # decoded body and no cookies on disk
+    headers = {header["name"] for header in first["response"]["headers"]}
+    assert headers == {"content-type"}
+
+
+def test_harcache_002_stale_entries_and_other_versions(tmp_path, monkeypatch):
+    path = str(tmp_path / "flow.har")
+    old = har_cache._now() - timedelta(days=45)
+    save_har(path, [_entry(f"{API}/blogs", b'[]', started=old)], git_rev="abc123")
+
+    stats = HarStats()
+    assert HarCache(path, "replay", API, max_age_days=30, stats=stats).lookup("GET", f"{API}/blogs") is not None
+    assert stats.counts["stale"] == 1
+    assert HarCache(path, "replay", API, max_age_days=60, stats=HarStats()).is_stale(load_har(path)[0]) is False
+
+    monkeypatch.setattr(har_cache, "CACHE_VERSION", "2")
+    assert load_har(path) is None
+    stats = HarStats()
+    HarCache(path, "replay", API, stats=stats)
+    assert stats.missing == [path]
+
+
+def test_harcache_003_worker_stats_are_merged_for_the_summary():
+    controller, worker = HarStats(), HarStats()
+    worker.add("tests", 2)
+    worker.add("hits", 5)
+    worker.add("stale", 1)
+    worker.miss(("GET", "/api/blogs/9", ""))
+    worker.no_recording("data/har/testblogging/test_x.har")
+    controller.merge(worker.export())
+    controller.merge(worker.export())
+    lines = controller.summary_lines()
+    assert lines[0] == "4 tests replayed: 10 hits (2 stale), 2 misses went to the network, 0 recorded responses unused"
+    assert "  miss x2: GET /api/blogs/9" in lines
+    assert HarStats().summary_lines() == []
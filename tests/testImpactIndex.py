@@ -0,0 +1,135 @@
+import subprocess
+import textwrap
+
+import pytest
+from utils.impact_index import ImpactIndex, select_since
+
+FILES = {
+    ".gitignore": """
+        .cache/
+    """,
+    "locators/pageLocators.py": """
+        class PageLocators:
+            SEARCH_INPUT = "//input"
+            LOGOUT = "//*[contains(text(),'Logout')]"
+            HOME_BUTTON = "//a[contains(text(),'Home')]"
+    """,
+    "POM/page.py": """
+        from locators.pageLocators import PageLocators
+
+
+        class Page:
+            def __init__(self, page):
+                self.page = page
+                self.search_input = page.locator(PageLocators.SEARCH_INPUT)
+
+            def search_screen(self, term):
+                self.search_input.fill(term)
+
+            def search_and_verify(self, term):
+                self.search_screen(term)
+
+            def logout_user(self):
+                self.page.locator(PageLocators.LOGOUT).click()
+    """,
+    "tests/conftest.py": """
+        import pytest
+        from locators.pageLocators import PageLocators
+
+
+        def _open_app(page):
+            page.locator(PageLocators.HOME_BUTTON).click()
+
+
+        @pytest.fixture
+        def setupcheck(page):
+            _open_app(page)
+            return page
+    """,
+    "tests/testPages.py": """
+        from POM.page import Page
+
+
+        def test_search(setupcheck):
+            Page(setupcheck).search_and_verify("TypeScript")
+
+
+        def test_logout(setupcheck):
+            Page(setupcheck).logout_user()
+
+
+        def test_plain():
+            assert True
+    """,
+}
+
+
+def git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    for path, source in FILES.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(textwrap.dedent(source).lstrip())
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "base")
+    return tmp_path
+
+
+def edit(repo, path, old, new):
+    file = repo / path
+    file.write_text(file.read_text().replace(old, new))
+
+
+def select(repo):
+    affected, _, _ = select_since("HEAD", root=str(repo), cache_path=str(repo / ".cache" / "index.json"))
+    return [test.split("::")[1] for test in affected]
+
+
+def test_impactindex_001_locator_change_selects_only_tests_reaching_it(repo):
+    edit(repo, "locators/pageLocators.py", '"//input"', '"#search"')
+    assert select(repo) == ["test_search"]
+    edit(repo, "locators/pageLocators.py", "Home", "Start")
+    assert select(repo) == ["test_logout", "test_search"]
+
+
+def test_impactindex_002_pom_methods_attributes_and_test_bodies(repo):
+    edit(repo, "POM/page.py", "self.page.locator(PageLocators.LOGOUT).click()", "self.page.locator(PageLocators.LOGOUT).dblclick()")
+    assert select(repo) == ["test_logout"]
+    git(repo, "checkout", "-q", ".")
+    edit(repo, "tests/testPages.py", "assert True", "assert 1")
+    assert select(repo) == ["test_plain"]
+    git(repo, "checkout", "-q", ".")
+    edit(repo, "POM/page.py", "    def logout_user", "    # comment only\n    def logout_user")
+    assert select(repo) == []
+
+
+def test_impactindex_003_unattributable_changes_select_everything(repo):
+    edit(repo, "POM/page.py", "from locators.pageLocators import PageLocators", "from locators.pageLocators import PageLocators as PageLocators")
+    assert select(repo) == ["test_logout", "test_plain", "test_search"]
+    git(repo, "checkout", "-q", ".")
+    (repo / "requirements.txt").write_text("pytest\n")
+    assert len(select(repo)) == 3
+    (repo / "requirements.txt").unlink()
+    (repo / "NOTES.md").write_text("docs only\n")
+    assert select(repo) == []
+
+
+def test_impactindex_004_index_is_rebuilt_incrementally(repo):
+    cache = str(repo / ".cache" / "index.json")
+    assert len(ImpactIndex(str(repo), cache).build().rebuilt) == 4
+    assert ImpactIndex(str(repo), cache).build().rebuilt == []
+    edit(repo, "POM/page.py", "fill(term)", "type(term)")
+    assert ImpactIndex(str(repo), cache).build().rebuilt == ["POM/page.py"]
+
+
+def test_impactindex_005_candidate_lists_follow_the_selectors_they_include(repo):
+    edit(repo, "locators/pageLocators.py", "    HOME_BUTTON =",
+         '    LOGOUT_CANDIDATES = (("role", "button", "Logout"), ("xpath", LOGOUT))\n    HOME_BUTTON =')
+    edit(repo, "POM/page.py", "self.page.locator(PageLocators.LOGOUT)", 'self.locate("logout", PageLocators.LOGOUT_CANDIDATES)')
+    git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qam", "candidates")
+    edit(repo, "locators/pageLocators.py", "'Logout'", "'Sign out'")
+    assert select(repo) == ["test_logout"]
@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+import playwright.async_api
+from utils.browser_pool import CONTEXT_OPTIONS
+from utils.load_runner import LoadStats, percentile, render_html, run_load, write_reports
+
+
+class FakeApi:
+    def __init__(self, pool_size=None):
+        self.cleaned = False
+
+    def cleanup(self):
+        self.cleaned = True
+
+    def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.closed = False
+
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePage:
+    url = "about:blank"
+
+    def locator(self, selector):
+        return selector
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.closed = False
+
+    async def launch(self, headless):
+        return self
+
+    async def new_context(self, **options):
+        self.contexts.append(FakeContext(options))
+        return self.contexts[-1]
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePlaywright:
+    def __init__(self, browser):
+        self.chromium = browser
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+
+def test_loadrunner_001_nearest_rank_percentiles():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.050
+    assert percentile(values, 95) == 0.095
+    assert percentile(values, 99) == 0.099
+    assert percentile([0.2], 99) == 0.2
+    assert percentile([], 50) is None
+
+
+def test_loadrunner_002_virtual_users_record_steps_until_the_deadline(tmp_path, monkeypatch):
+    apis = []
+
+    def api_factory(pool_size):
+        apis.append(FakeApi(pool_size))
+        return apis[-1]
+
+    async def fast(user):
+        await asyncio.sleep(0.001)
+
+    async def broken(user):
+        raise RuntimeError("500 Server Error")
+
+    journeys = {
+        "search": {"http": [("list_blogs", fast)]},
+        "admin_crud": {"http": [("create_post", fast), ("delete_post", broken), ("never_reached", fast)]},
+    }
+    stats = asyncio.run(run_load(
+        users=4, ramp_up=0.04, duration=0.2, think_time=0, journey_names=["search", "admin_crud"],
+        mode="browser", journeys=journeys, api_factory=api_factory,
+    ))
+    report = stats.report({"users": 4})
+
+    assert len(apis) == 4 and all(api.cleaned for api in apis)
+    assert report["steps"]["search.list_blogs"]["count"] > 4
+    assert report["steps"]["admin_crud.delete_post"]["errors"] == report["journeys"]["admin_crud"]["failed"] > 0
+    assert report["steps"]["admin_crud.delete_post"]["sample_errors"] == ["500 Server Error"]
+    assert "admin_crud.never_reached" not in report["steps"]
+    assert report["journeys"]["search"]["failed"] == 0
+
+    json_path, html_path = write_reports(report, str(tmp_path))
+    assert json.load(open(json_path))["settings"] == {"users": 4}
+    assert "search.list_blogs" in open(html_path).read()
+
+    # browser journeys: one context per virtual user, at the same viewport as the test suite
+    browser = FakeBrowser()
+    monkeypatch.setattr(playwright.async_api, "async_playwright", lambda: FakePlaywright(browser))
+    journeys["search"]["browser"] = [("open", fast)]
+    stats = asyncio.run(run_load(
+        users=2, ramp_up=0, duration=0.05, think_time=0, journey_names=["search"],
+        mode="browser", journeys=journeys, api_factory=api_factory,
+    ))
+    assert stats.report()["steps"]["search.open"]["count"] >= 2
+    assert len(browser.contexts) == 2 and browser.closed
+    assert all(context.options == CONTEXT_OPTIONS and context.closed for context in browser.contexts)
+
+
+def test_loadrunner_003_report_without_samples():
+    stats = LoadStats()
+    stats.record("search.open", 0.0, error="Timeout 10000ms exceeded.")
+    report = stats.report()
+    assert report["steps"]["search.open"]["p95_ms"] is None
+    assert "<td>-</td>" in render_html(report)
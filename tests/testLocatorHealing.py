@@ -0,0 +1,60 @@
+import logging
+
+from locators.loginPageLocators import LoginPageLocators
+from utils.locator_healing import (HealingStats, LocatorResolver, ResolutionCache, build_key, describe, fill, page_key,
+                                   xpath_literal)
+
+
+def test_locatorhealing_001_candidates_pages_and_builds(monkeypatch):
+    candidates = LoginPageLocators.USERNAME_FIELD_CANDIDATES
+    assert candidates[-1] == ("xpath", LoginPageLocators.USERNAME_FIELD)
+    assert describe(("role", "link", "Admin")) == "role=link[name=Admin]"
+    assert fill(LoginPageLocators.DELETE_ICON_FOR_TITLE_CANDIDATES[1], {"title": "Blog One"})[1] == \
+        LoginPageLocators.DELETE_ICON_FOR_TITLE.format(title="'Blog One'")
+    # titles are XPath literals, whatever quotes they contain
+    assert fill(LoginPageLocators.DELETE_ICON_FOR_TITLE_CANDIDATES[0], {"title": "Bob's post"})[1].startswith(
+        "//tr[td[contains(text(),\"Bob's post\")]]")
+    assert xpath_literal('Say "hi", it\'s me') == "concat('Say \"hi\", it', \"'\", 's me')"
+    assert fill(("text", "{title}"), {"title": "Bob's post"}) == ("text", "Bob's post")
+    assert page_key("http://localhost:5173/#/blog/42?x=1") == "/#/blog/:id"
+    assert page_key("http://localhost:5173/admin/blogs/7/edit") == "/admin/blogs/:id/edit"
+    monkeypatch.delenv("APP_BUILD", raising=False)
+    assert build_key("/assets/index-a1.js") != build_key("/assets/index-b2.js")
+    monkeypatch.setenv("APP_BUILD", "v1.4.2")
+    assert build_key("/assets/index-a1.js") == "v1.4.2"
+
+
+def test_locatorhealing_002_cache_is_shared_through_the_file(tmp_path):
+    path = str(tmp_path / "resolution.json")
+    first, second = ResolutionCache(path, keep_builds=2), ResolutionCache(path, keep_builds=2)
+    first.put("b1", "/#/login", "LoginPage.username_field", "label=Username")
+    second.put("b1", "/", "LoginPage.search_input", "role=searchbox")
+    assert ResolutionCache(path).get("b1", "/#/login", "LoginPage.username_field") == "label=Username"
+    assert ResolutionCache(path).get("b1", "/", "LoginPage.search_input") == "role=searchbox"
+    first.put("b2", "/", "LoginPage.search_input", "role=searchbox")
+    first.put("b3", "/", "LoginPage.search_input", "role=searchbox")
+    assert ResolutionCache(path).get("b1", "/", "LoginPage.search_input") is None
+    assert ResolutionCache(path).get("b3", "/", "LoginPage.search_input") == "role=searchbox"
+
+
+def test_locatorhealing_003_last_match_first_and_fallbacks_logged(tmp_path, caplog):
+    cache, stats = ResolutionCache(str(tmp_path / "resolution.json")), HealingStats()
+    resolver = LocatorResolver(None, "LoginPage", cache=cache, stats=stats)
+    candidates = LoginPageLocators.SEARCH_INPUT_CANDIDATES
+    assert resolver._order("search_input", candidates, "b1", "/") == list(candidates)
+
+    with caplog.at_level(logging.WARNING, logger="utils.locator_healing"):
+        # only the original XPath still matches
+        index = resolver._pick("search_input", candidates, list(candidates), [0, 0, 1], "b1", "/")
+    assert index == 2
+    assert "role=searchbox did not match, resolved with xpath=//*[@id=':r3:']" in caplog.text
+    ordered = resolver._order("search_input", candidates, "b1", "/")
+    assert ordered[0] == ("xpath", LoginPageLocators.SEARCH_INPUT)
+
+    resolver._pick("search_input", candidates, ordered, [1, 0, 0], "b1", "/")
+    other = HealingStats()
+    other.merge(stats.export())
+    assert other.summary_lines() == [
+        "2 elements resolved, 2 through a fallback candidate",
+        "  fallback x2: LoginPage.search_input -> xpath=//*[@id=':r3:']",
+    ]
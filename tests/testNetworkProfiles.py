@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import pytest
+from utils.network_profiles import (PROFILES, TRANSPARENT_GIF, NetworkSavings, ProfileRouter, ResourceSizes,
+                                    RouteProfile, apply_profile, profile_for)
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type="image"):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.result = None
+
+    def abort(self, error_code):
+        self.result = ("abort", error_code)
+
+    def fulfill(self, status, content_type, body):
+        self.result = ("fulfill", content_type, len(body))
+
+    def fallback(self):
+        self.result = ("fallback",)
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = {}
+        self.listeners = {}
+        self.unrouted = None
+
+    def route(self, pattern, handler):
+        self.routes[pattern] = handler
+
+    def unroute_all(self, behavior=None):
+        self.unrouted = behavior
+        self.routes = {}
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+
+def test_networkprofiles_001_profile_from_marker_option_or_markers():
+    assert profile_for(["public_viewing"]) == "public"
+    assert profile_for(["blog_management", "slow"]) == "admin"
+    assert profile_for(["slow"]) is None
+    # an explicit marker argument wins over --network-profile, which wins over the markers
+    assert profile_for(["public_viewing"], explicit="strict", option="admin") == "strict"
+    assert profile_for(["public_viewing"], explicit="off") is None
+    assert profile_for(["public_viewing"], option="admin") == "admin"
+    assert profile_for(["public_viewing"], option="off") is None
+
+
+def test_networkprofiles_002_savings_merge_and_sizes_are_learned(tmp_path):
+    worker = NetworkSavings()
+    worker.add("public", "blocked", 2048)
+    worker.add("public", "stubbed", None)
+    controller = NetworkSavings()
+    controller.merge(worker.export())
+    controller.merge(worker.export())
+    assert controller.by_profile["public"] == {"blocked": 2, "stubbed": 2, "bytes": 4096, "unknown_size": 2}
+    assert controller.summary_lines() == [
+        "public: 4 requests avoided (2 blocked, 2 stubbed), ~4.0 KiB not downloaded, 2 of unknown size"
+    ]
+
+    path = str(tmp_path / "sizes.json")
+    sizes = ResourceSizes(path)
+    for url, kind, length in (("http://app/logo.png", "image", "5120"), ("http://api/blogs", "fetch", "900"),
+                              ("http://app/font.woff2", "font", None)):
+        headers = {"content-length": length} if length else {}
+        sizes.learn(SimpleNamespace(url=url, headers=headers, request=SimpleNamespace(resource_type=kind)))
+    sizes.save()
+    assert ResourceSizes(path).sizes == {"http://app/logo.png": 5120}
+
+
+def test_networkprofiles_003_router_blocks_stubs_and_detaches(monkeypatch):
+    sizes, savings = ResourceSizes("/nonexistent/sizes.json"), NetworkSavings()
+    sizes.sizes = {"http://localhost:5173/cover.png": 5000}
+    context = FakeContext()
+    ProfileRouter(PROFILES["public"], sizes, savings).attach(context)
+    assert "**/*" not in context.routes
+    cover = FakeRoute("http://localhost:5173/cover.png")
+    context.routes["**/*.{png,jpg,jpeg,gif,webp,avif,svg,ico,bmp}"](cover)
+    font = FakeRoute("https://fonts.gstatic.com/roboto.woff2", "font")
+    context.routes["**/*.{woff,woff2,ttf,otf,eot}"](font)
+    assert cover.result == ("fulfill", "image/gif", len(TRANSPARENT_GIF))
+    assert font.result == ("abort", "blockedbyclient")
+    assert savings.by_profile["public"] == {"blocked": 1, "stubbed": 1,
+                                            "bytes": 5000 - len(TRANSPARENT_GIF), "unknown_size": 1}
+
+    monkeypatch.setenv("LOCAL_SETUP_URL", "http://localhost:5173/")
+    strict = ProfileRouter(RouteProfile("strict", block_types=("image",), allowed_origins=("LOCAL_SETUP_URL",)),
+                           sizes, savings)
+    routes = [FakeRoute("http://localhost:5173/api/blogs", "fetch"), FakeRoute("http://localhost:5173/a.png"),
+              FakeRoute("https://cdn.example.com/lib.js", "script"), FakeRoute("data:text/plain,hi", "other")]
+    for route in routes:
+        strict._filter(route)
+    assert [route.result[0] for route in routes] == ["fallback", "abort", "abort", "fallback"]
+
+    detach = apply_profile(context, "admin", sizes)
+    detach()
+    assert context.routes == {} and context.unrouted == "ignoreErrors"
+    detach = apply_profile(context, None, sizes)
+    assert context.listeners["response"] == [sizes.learn]
+    detach()
+    assert context.listeners["response"] == []
+    with pytest.raises(ValueError):
+        apply_profile(context, "fast", sizes)
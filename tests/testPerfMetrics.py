@@ -0,0 +1,60 @@
+from utils.perf_metrics import PerfRecorder, budget_for, load_budgets, recorder_for
+
+
+def snapshot(document, cls=0.0, long_task_ms=0.0, long_tasks=0, lcp=None, heap=50 * 1048576, nav=None):
+    return {
+        "document": document, "url": "http://localhost:5173/", "lcp": lcp, "cls": cls,
+        "longTasks": long_tasks, "longTaskMs": long_task_ms, "heap": heap, "nav": nav,
+    }
+
+
+class FakePage:
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.init_scripts = []
+
+    def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    def evaluate(self, script):
+        return self.snapshots.pop(0)
+
+
+BUDGETS = {"default": {"cls": 0.1, "long_task_ms": 200}, "actions": {"search_screen": {"action_ms": 60000, "cls": 0.25}}}
+
+
+def test_perfmetrics_001_records_deltas_and_navigation_timing():
+    page = FakePage([
+        None,  # nothing loaded yet
+        snapshot(1.0, cls=0.02, lcp=900, nav={"ttfb": 120, "dcl": 400, "load": 0}),
+        snapshot(1.0, cls=0.02),
+        snapshot(1.0, cls=0.2, long_tasks=2, long_task_ms=310),
+    ])
+    recorder = PerfRecorder(page, BUDGETS).attach()
+    assert page.init_scripts and recorder_for(page) is recorder
+    with recorder.measure("open_app"):
+        pass
+    with recorder.measure("search_screen"):
+        pass
+
+    open_app, search = recorder.records
+    assert (open_app["ttfb_ms"], open_app["lcp_ms"], open_app["load_ms"]) == (120, 900, None)
+    assert "lcp_ms" not in search
+    assert round(search["cls"], 3) == 0.18 and search["long_task_ms"] == 310 and search["heap_mb"] == 50
+    # search_screen allows more layout shift than the default, but not more long task time
+    assert recorder.violations() == [("search_screen", "long_task_ms", 310, 200)]
+    assert 'style="color:#c00;font-weight:bold">310<' in recorder.html_table()
+
+
+def test_perfmetrics_002_pages_without_a_recorder_measure_nothing():
+    page = FakePage([])
+    with recorder_for(page).measure("home_screen"):
+        pass
+    assert recorder_for(page).records == []
+
+
+def test_perfmetrics_003_config_budgets_merge_action_overrides():
+    budgets = load_budgets()
+    assert budget_for(budgets, "open_app")["ttfb_ms"] == 800
+    assert budget_for(budgets, "open_app")["lcp_ms"] == budgets["default"]["lcp_ms"]
+    assert budget_for(budgets, "home_screen") == budgets["default"]
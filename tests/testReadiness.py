@@ -0,0 +1,61 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from utils.readiness import StartupTimer, readiness_targets, wait_until_ready
+
+
+class WarmingUp(BaseHTTPRequestHandler):
+    """Answers 503 for the first `server.cold` requests, then 200."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.hits += 1
+        self.send_response(503 if self.server.hits <= self.server.cold else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def warming_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WarmingUp)
+    server.hits, server.cold = 0, 2
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_readiness_001_waits_through_startup_errors(warming_server):
+    timer = StartupTimer()
+    url = f"http://127.0.0.1:{warming_server.server_address[1]}/"
+    wait_until_ready({"frontend": url}, timeout=10, timer=timer, initial_delay=0.01)
+    assert warming_server.hits == 3
+    assert [name for name, _, _ in timer.phases] == ["probe frontend"]
+    assert timer.line("master").startswith("master: ready after")
+
+
+def test_readiness_002_timeout_names_the_target_that_never_answered(warming_server):
+    targets = {
+        "frontend": f"http://127.0.0.1:{warming_server.server_address[1]}/",
+        "backend": f"http://127.0.0.1:{_closed_port()}/api/blogs",
+    }
+    with pytest.raises(RuntimeError) as error:
+        wait_until_ready(targets, timeout=0.5, initial_delay=0.01)
+    assert "backend" in str(error.value) and "ConnectionError" in str(error.value)
+    assert "frontend" not in str(error.value)
+
+
+def test_readiness_003_targets_are_filled_in_from_env(monkeypatch):
+    monkeypatch.setenv("LOCAL_SETUP_URL", "http://localhost:5173/")
+    monkeypatch.setenv("LOCAL_API_URL", "http://localhost:3001/api")
+    assert readiness_targets() == {"frontend": "http://localhost:5173/", "backend": "http://localhost:3001/api/blogs"}
@@ -0,0 +1,51 @@
+import json
+import os
+from types import SimpleNamespace
+
+from utils.results_stream import ResultsStream, read_records
+
+
+def _report(when, outcome="passed", sections=(), user_properties=()):
+    return SimpleNamespace(
+        nodeid="tests/test_a.py::test_one[chromium]", when=when, outcome=outcome, duration=0.5, start=1.0,
+        failed=outcome == "failed", skipped=outcome == "skipped", longrepr="AssertionError" if outcome == "failed" else None,
+        sections=list(sections), user_properties=list(user_properties),
+    )
+
+
+def test_results_stream_001_one_record_per_phase_with_logs_referenced(tmp_path):
+    stream = ResultsStream(tmp_path / "results.jsonl")
+    stream.session_start(browser="chromium")
+    stream.phase(_report("setup"))
+    stream.phase(_report("call", "failed", sections=[("Captured stdout call", "searching...\n")],
+                         user_properties=[("browser", "chromium"), ("step_durations", [{"step": "x"}])]))
+    stream.session_finish(1, collected=1, failed=1)
+
+    records, offset = read_records(stream.path)
+    assert [r["type"] for r in records] == ["session_start", "phase", "phase", "session_finish"]
+    call = records[2]
+    assert call["outcome"] == "failed" and call["longrepr"] == "AssertionError" and call["browser"] == "chromium"
+    assert "step_durations" not in call
+    assert open(tmp_path / call["logs"]).read().startswith("----- Captured stdout call -----")
+    assert offset == os.path.getsize(stream.path)
+
+
+def test_results_stream_002_reader_skips_a_half_written_line(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text(json.dumps({"type": "phase", "when": "setup"}) + "\n" + '{"type": "pha')
+    records, offset = read_records(path)
+    assert len(records) == 1
+    with open(path, "a") as file:
+        file.write('se", "when": "call"}\n')
+    records, offset = read_records(path, offset)
+    assert records == [{"type": "phase", "when": "call"}]
+
+
+def test_results_stream_003_artifacts_are_referenced_relative_to_the_stream(tmp_path):
+    stream = ResultsStream(tmp_path / "results.jsonl")
+    folder = tmp_path / "artifacts" / "test_one"
+    artifacts = {"reason": "failed", "folder": str(folder), "trace": str(folder / "trace.zip"), "screenshot": None}
+    stream.phase(_report("teardown", user_properties=[("artifacts", artifacts)]))
+    record = read_records(stream.path)[0][0]
+    assert record["artifacts"] == {"reason": "failed", "folder": "artifacts/test_one",
+                                   "trace": "artifacts/test_one/trace.zip", "screenshot": None}
@@ -0,0 +1,36 @@
+from utils.selector_bench import collect_selectors, compare_to_baseline, lint, main, selector_kind
+
+
+def test_selectorbench_001_collects_both_locator_classes():
+    selectors = collect_selectors()
+    assert "LoginPageLocators.BLOG_CARD" in selectors
+    assert "AdminPageLocators.PUBLISH_NOW_BUTTON" in selectors
+    assert "{title}" not in selectors["LoginPageLocators.DELETE_ICON_FOR_TITLE"]
+    # css and xpath candidates are benchmarked too, unless they repeat a constant
+    assert selectors["LoginPageLocators.SEARCH_INPUT_CANDIDATES[1]"] == "input[placeholder^='Search']"
+    assert "contains(text(),'Test Title')" in selectors["LoginPageLocators.DELETE_ICON_FOR_TITLE_CANDIDATES[0]"]
+    assert "LoginPageLocators.SEARCH_INPUT_CANDIDATES[0]" not in selectors
+    assert "LoginPageLocators.SEARCH_INPUT_CANDIDATES[2]" not in selectors
+
+
+def test_selectorbench_002_selector_kinds_and_lint():
+    selectors = collect_selectors()
+    assert selector_kind(selectors["LoginPageLocators.BLOG_CARD"]) == "xpath"
+    assert selector_kind(selectors["AdminPageLocators.SAVE_BUTTON"]) == "playwright"
+    assert selector_kind(selectors["AdminPageLocators.BLOG_CARD"]) == "css"
+    assert "union of 4" in lint(selectors["LoginPageLocators.BLOG_CARD"])
+    assert "positional" in lint(selectors["LoginPageLocators.DELETE_ICON"])
+    assert "generated id" in lint(selectors["LoginPageLocators.USERNAME_FIELD"])
+
+
+def test_selectorbench_003_only_real_slowdowns_fail_the_baseline():
+    baseline = {"A": {"cost_us": 100.0}, "B": {"cost_us": 5.0}, "C": {"cost_us": 100.0}}
+    results = {
+        "A": {"cost_us": 200.0},   # slower by 100%
+        "B": {"cost_us": 15.0},    # 3x, but below the noise floor
+        "C": {"cost_us": 110.0},   # within tolerance
+        "D": {"cost_us": 999.0},   # new selector, no baseline yet
+    }
+    assert compare_to_baseline(results, baseline, tolerance=0.25, min_delta_us=20.0) == [("A", 100.0, 200.0)]
+    # the gate fails without a baseline, before any browser is started
+    assert main(["--snapshot", "home.html", "--baseline", "/nonexistent/selector_baseline.json"]) == 2
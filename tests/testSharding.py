@@ -0,0 +1,55 @@
+import pytest
+from utils.sharding import DEFAULT_OTHER_SECONDS, DEFAULT_UI_SECONDS, assign_shards, estimate_durations, parse_shard
+
+
+def test_sharding_001_parse_shard():
+    assert parse_shard("1/4") == (0, 4)
+    assert parse_shard("4/4") == (3, 4)
+    for bad in ("0/4", "5/4", "1/0", "two/4", "1"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+
+def test_sharding_002_estimates_fall_back_from_history_to_file_to_kind():
+    tests = [
+        ("tests/testblogging.py::test_a", ["admin_page"], "chromium"),
+        ("tests/testblogging.py::test_new", ["setupcheck"], "chromium"),
+        ("tests/testConcurrentViewing.py::test_new", ["async_runner"], "chromium"),
+        ("tests/testSharding.py::test_new", [], None),
+    ]
+    history = {("tests/testblogging.py::test_a", "chromium"): [20.0, 30.0, 22.0],
+               ("tests/testblogging.py::test_b", "chromium"): [8.0]}
+    durations, estimated = estimate_durations(tests, history)
+    assert durations == {
+        "tests/testblogging.py::test_a": 22.0,
+        "tests/testblogging.py::test_new": 15.0,
+        "tests/testConcurrentViewing.py::test_new": DEFAULT_UI_SECONDS,
+        "tests/testSharding.py::test_new": DEFAULT_OTHER_SECONDS,
+    }
+    assert estimated == 3
+
+    # history is per engine: the test's own runs, its file's runs on that engine, then on any engine
+    history[("tests/testblogging.py::test_a", "webkit")] = [60.0]
+    history[("tests/testblogging.py::test_c", "webkit")] = [40.0]
+    durations, estimated = estimate_durations([
+        ("tests/testblogging.py::test_a", ["admin_page"], "webkit"),
+        ("tests/testblogging.py::test_b", ["admin_page"], "webkit"),
+        ("tests/testblogging.py::test_d", ["admin_page"], "firefox"),
+    ], history)
+    assert durations == {"tests/testblogging.py::test_a": 60.0, "tests/testblogging.py::test_b": 50.0,
+                         "tests/testblogging.py::test_d": 31.0}
+    assert estimated == 2
+    # an engine only known at run time (--worker-browsers) uses all of the test's runs
+    durations, estimated = estimate_durations([("tests/testblogging.py::test_a", ["admin_page"], None)], history)
+    assert durations == {"tests/testblogging.py::test_a": 26.0} and estimated == 0
+
+
+def test_sharding_003_lpt_balances_the_slowest_shard_and_covers_every_test():
+    durations = {f"slow{i}": 30.0 for i in range(3)}
+    durations.update({f"fast{i}": 1.0 for i in range(30)})
+    shards = assign_shards(durations, 3)
+    # a file-based split would put all three slow tests on one node (90s+)
+    assert [total for total, _ in shards] == [40.0, 40.0, 40.0]
+    assert sorted(n for _, nodeids in shards for n in nodeids) == sorted(durations)
+    assert assign_shards(durations, 3) == shards
+    assert assign_shards({"only": 5.0}, 2) == [(5.0, ["only"]), (0.0, [])]
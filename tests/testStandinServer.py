@@ -0,0 +1,59 @@
+import pytest
+import requests
+from utils.standin_server import FaultRule, Faults, StandInServer
+
+
+@pytest.fixture
+def standin():
+    server = StandInServer(users={"admin": "admin123"}).start()
+    yield server
+    server.stop()
+
+
+def _admin(server):
+    token = requests.post(f"{server.api_url}/auth/login", json={"username": "admin", "password": "admin123"}).json()["token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_standin_001_public_and_admin_views_of_the_blogs(standin):
+    public = requests.get(f"{standin.api_url}/blogs", params={"search": "typescript"}).json()["blogs"]
+    assert [blog["title"] for blog in public] == ["Getting Started with TypeScript"]
+    everything = requests.get(f"{standin.api_url}/blogs", headers=_admin(standin)).json()["blogs"]
+    draft = next(blog for blog in everything if blog["status"] == "draft")
+    assert requests.get(f"{standin.api_url}/blogs/{draft['id']}").status_code == 404
+    assert requests.post(f"{standin.api_url}/blogs", json={"title": "Anonymous"}).status_code == 401
+    assert requests.get(f"{standin.api_url}/blogs", headers={"Authorization": "Bearer expired"}).status_code == 401
+
+    created = requests.post(f"{standin.api_url}/blogs", json={"title": "Test Title"}, headers=_admin(standin)).json()
+    # newest first, as the dashboard's first row
+    assert requests.get(f"{standin.api_url}/blogs").json()["blogs"][0]["id"] == created["id"]
+    assert requests.get(f"{standin.url}/").headers["Content-Type"].startswith("text/html")
+
+
+def test_standin_002_fault_rules_are_deterministic_and_expire():
+    assert FaultRule.parse("POST /api/blogs* latency=300 rate=0.5 status=503 times=2") == FaultRule(
+        "POST", "/api/blogs*", latency_ms=300, error_rate=0.5, status=503, times=2)
+    assert FaultRule.parse("/api/*").method == "*"
+    with pytest.raises(ValueError):
+        FaultRule.parse("/api/* delay=3")
+
+    def run():
+        faults = Faults(["/api/* rate=0.3 status=503", "GET /api/blogs latency=200 jitter=100 times=2"], seed=7)
+        return [faults.decide("GET", "/api/blogs") for _ in range(20)]
+    decisions = run()
+    assert decisions == run()
+    assert all(0.2 <= delay <= 0.3 for delay, _ in decisions[:2]) and all(delay == 0 for delay, _ in decisions[2:])
+    assert {status for _, status in decisions} == {None, 503}
+    assert Faults(["/api/*"]).decide("GET", "/") == (0.0, None)
+
+
+def test_standin_003_control_endpoints_reset_data_and_faults(standin):
+    requests.post(f"{standin.api_url}/blogs", json={"title": "Leftover"}, headers=_admin(standin))
+    assert requests.post(f"{standin.url}/__standin/faults", json={"rules": ["GET /api/blogs status=502 rate=1"]}).ok
+    assert requests.get(f"{standin.api_url}/blogs").status_code == 502
+    assert requests.get(f"{standin.url}/__standin/stats").json()["injected_errors"] == 1
+
+    assert requests.post(f"{standin.url}/__standin/reset").json() == {"blogs": 5}
+    response = requests.get(f"{standin.api_url}/blogs")
+    assert response.status_code == 200 and "Leftover" not in [blog["title"] for blog in response.json()["blogs"]]
+    assert requests.post(f"{standin.url}/__standin/faults", json={"rules": ["GET / bogus=1"]}).status_code == 400
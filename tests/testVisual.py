@@ -0,0 +1,75 @@
+import io
+
+import numpy as np
+import pytest
+from utils.visual import (VisualBaselines, VisualStats, compared_area, diff_ratio, downsample, hash_distance,
+                          perceptual_hash, theme_of)
+
+
+def _page(background, text):
+    """A 64x96 page: a header bar and a few lines of text on a background."""
+    pixels = np.full((64, 96, 3), background, dtype=np.uint8)
+    pixels[:8] = (25, 118, 210)
+    for top in (16, 28, 40):
+        pixels[top:top + 4, 8:80] = text
+    return pixels
+
+
+def test_visual_001_tolerance_masks_and_hashes():
+    light = _page(255, 30)
+    noisy = np.clip(light.astype(int) + np.random.default_rng(1).integers(-3, 4, light.shape), 0, 255)
+    changed = light.copy()
+    changed[48:56, 60:68] = (255, 0, 0)
+
+    assert theme_of(light) == "light" and theme_of(_page(18, 230)) == "dark"
+    expected, actual = downsample(light, 4), downsample(changed, 4)
+    assert expected.shape == (16, 24, 3)
+    assert diff_ratio(expected, downsample(noisy, 4), tolerance=4) == 0
+    assert diff_ratio(expected, actual, tolerance=(8, 255, 255)) == 0
+    assert diff_ratio(expected, actual, tolerance=8) == 4 / (16 * 24)
+    keep = compared_area(expected.shape, [(60, 48, 8, 8)], factor=4)
+    assert diff_ratio(expected, actual, tolerance=8, keep=keep) == 0
+
+    same = hash_distance(perceptual_hash(expected), perceptual_hash(downsample(noisy, 4)))
+    inverted = hash_distance(perceptual_hash(expected), perceptual_hash(downsample(_page(18, 230), 4)))
+    assert same == 0 and inverted > 12
+
+
+def test_visual_002_new_then_identical_baselines_skip_the_diff(tmp_path):
+    stats = VisualStats()
+    baselines = VisualBaselines(root=str(tmp_path / "visual"), stats=stats, actual_dir=str(tmp_path / "actual"))
+    screenshot = b"\x89PNG not decoded when identical"
+    assert baselines.compare("header", screenshot, "firefox").status == "new"
+    assert (tmp_path / "visual" / "firefox" / "header.png").read_bytes() == screenshot
+    for _ in range(3):
+        result = baselines.compare("header", screenshot, "firefox")
+        assert result.status == "identical" and result.ok
+    assert len(baselines._cache) == 1
+
+    baselines.mode = "update"
+    assert baselines.compare("header", b"\x89PNG new look", "firefox").status == "updated"
+    assert not baselines._cache
+    assert stats.counts == {"checks": 5, "identical": 3, "match": 0, "different": 0, "mismatch": 0, "size": 0,
+                            "new": 1, "updated": 1}
+    other = VisualStats()
+    other.merge(stats.export())
+    assert other.summary_lines()[0].startswith("5 checks") and "2 baselines written" in other.summary_lines()[0]
+
+
+def test_visual_003_screenshots_are_compared_after_decoding(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+
+    def png(pixels):
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    baselines = VisualBaselines(root=str(tmp_path / "visual"), stats=VisualStats(), actual_dir=str(tmp_path / "actual"))
+    baselines.compare("page", png(_page(255, 30)))
+    changed = _page(255, 30)
+    changed[48:56, 60:68] = (255, 0, 0)
+    assert baselines.compare("page", png(changed), regions=[(60, 48, 8, 8)]).status == "match"
+    result = baselines.compare("page", png(changed))
+    assert result.status == "mismatch" and (tmp_path / "actual" / "chromium" / "page.actual.png").exists()
+    assert baselines.compare("page", png(_page(18, 230))).status == "different"
+    assert baselines.compare("page", png(_page(255, 30)[:32])).status == "size"
@@ -0,0 +1,94 @@
+import pytest
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from utils.waits import PageWaiter, WaitLedger, WaitRecord
+
+
+class FakeLocator:
+    def __init__(self, appears=True):
+        self.appears = appears
+        self.waits = []
+
+    def wait_for(self, state, timeout):
+        self.waits.append((state, timeout))
+        if not self.appears:
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded")
+
+
+class FakePage:
+    """`evaluate` fails with the given errors first, as when a navigation replaces the document;
+    `settles` is what the DOM-settled script resolves with."""
+
+    def __init__(self, errors=(), settles=True):
+        self.errors = list(errors)
+        self.settles = settles
+        self.load_states = 0
+
+    def wait_for_load_state(self, state, timeout=None):
+        self.load_states += 1
+
+    def evaluate(self, script, args):
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.settles
+
+
+def test_waits_001_ledger_exports_and_merges_worker_records():
+    worker = WaitLedger()
+    worker.add(WaitRecord("search_screen", "responses", 0.4, 2.5,
+                          responses=[{"call": "GET /api/blogs", "status": 200, "ms": 35.5}]))
+    worker.add(WaitRecord("home_screen", "dom_settled", 0.3, 1.5, ok=False))
+    rows = worker.export()
+    assert rows[0] == {"action": "search_screen", "condition": "responses", "elapsed": 0.4, "legacy_budget": 2.5,
+                       "ok": True, "responses": [{"call": "GET /api/blogs", "status": 200, "ms": 35.5}]}
+
+    controller = WaitLedger()
+    controller.merge(rows)
+    controller.merge(rows)
+    assert [r.action for r in controller.records] == ["search_screen", "home_screen"] * 2
+    assert controller.records[0].saved == pytest.approx(2.1)
+    worker.clear()
+    assert worker.export() == [] and worker.summary_lines() == []
+
+
+def test_waits_002_summary_totals_per_action():
+    ledger = WaitLedger()
+    ledger.add(WaitRecord("search_screen", "responses", 0.5, 2.5, responses=[
+        {"call": "GET /api/blogs", "status": 200, "ms": 30.0},
+        {"call": "GET /api/blogs", "status": 500, "ms": 12.0},
+    ]))
+    ledger.add(WaitRecord("search_screen", "responses", 1.5, 2.5))
+    ledger.add(WaitRecord("reload_page", "dom_settled", 0.25, 0.5, ok=False))
+    summary = ledger.summary()
+    assert summary["waits"] == 3 and summary["timeouts"] == 1
+    assert summary["responses"] == 2 and summary["error_responses"] == 1
+    assert summary["elapsed"] == pytest.approx(2.25) and summary["saved"] == pytest.approx(3.25)
+    assert summary["by_action"]["search_screen"] == {"waits": 2, "elapsed": 2.0, "legacy_budget": 5.0}
+    lines = ledger.summary_lines(top=1)
+    assert lines[0] == "condition waits: 3 (1 timed out)"
+    assert "finished on 2 API calls (1 with an error status)" in lines[3]
+    assert lines[-1] == "  search_screen: 2 waits, 2.00s (was 5.00s of sleeps)"
+
+
+def test_waits_003_page_waiter_records_failures_timeouts_and_retries_navigations():
+    ledger = WaitLedger()
+    waiter = PageWaiter(FakePage(), ledger=ledger, timeout=3000)
+    waiter.for_element(FakeLocator(), "home_screen", legacy=1.5)
+    missing = FakeLocator(appears=False)
+    with pytest.raises(PlaywrightTimeoutError):
+        waiter.for_element(missing, "verify_no_blogs_found", state="attached", legacy=2.5, timeout=500)
+    assert missing.waits == [("attached", 500)]
+    found, timed_out = ledger.records
+    assert found.ok and found.condition == "element:visible" and found.legacy_budget == 1.5
+    assert not timed_out.ok and timed_out.condition == "element:attached"
+
+    # a navigation during the observation is waited for once, anything else is raised
+    page = FakePage([PlaywrightError("Execution context was destroyed")])
+    PageWaiter(page, ledger=ledger).for_dom_settled("reload_page", legacy=0.5)
+    assert page.load_states == 2 and ledger.records[-1].ok
+    # still mutating at the timeout: not raised, but recorded as timed out
+    PageWaiter(FakePage(settles=False), ledger=ledger).for_dom_settled("home_screen", legacy=1.5)
+    assert not ledger.records[-1].ok and ledger.summary()["timeouts"] == 2
+    page = FakePage([PlaywrightError("Target closed")])
+    with pytest.raises(PlaywrightError):
+        PageWaiter(page, ledger=ledger).for_dom_settled("reload_page", legacy=0.5)
+    assert not ledger.records[-1].ok
@@ -0,0 +1,50 @@
+import os
+from fnmatch import fnmatch
+from urllib.parse import urlparse
+
+import yaml
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(BASE_DIR, "..", "data", "config.yaml")
+
+
+class ResponseSpec:
+    """One backend call an action triggers: HTTP method plus a path glob.
+
+    The glob is matched against the end of the request path, so "/blogs"
+    matches /api/blogs whether the app calls the API directly or through
+    the dev server's proxy. Query strings are ignored.
+    """
+
+    def __init__(self, method, path):
+        self.method = method.upper()
+        self.path = path
+
+    def matches(self, response):
+        request = response.request
+        return request.method == self.method and fnmatch(urlparse(response.url).path, "*" + self.path)
+
+    def __repr__(self):
+        return f"{self.method} {self.path}"
+
+
+class ActionResponses:
+    """Maps POM action names to the API responses that mark them as done."""
+
+    def __init__(self, mapping=None):
+        self.specs = {
+            action: [ResponseSpec(spec["method"], spec["path"]) for spec in specs]
+            for action, specs in (mapping or {}).items()
+        }
+
+    @classmethod
+    def from_config(cls, config_path=CONFIG_PATH):
+        with open(config_path, "r") as file:
+            config = yaml.safe_load(file)
+        return cls(config.get("action_responses"))
+
+    def specs_for(self, action):
+        return self.specs.get(action, [])
+
+
+action_responses = ActionResponses.from_config()
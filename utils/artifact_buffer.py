@@ -0,0 +1,140 @@
+import os
+import re
+import shutil
+import threading
+import weakref
+from collections import deque
+
+from playwright.sync_api import Error as PlaywrightError
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ARTIFACTS_DIR = os.path.join(BASE_DIR, "..", "reports", "artifacts")
+DEFAULT_MAX_MB = 200
+
+# Contexts that already record a trace; a pooled context is traced once and
+# then cut into one chunk per test.
+_traced = weakref.WeakSet()
+_captures = weakref.WeakKeyDictionary()
+
+
+class ScreenshotRing:
+    """The last `size` step screenshots of a page, in memory."""
+
+    def __init__(self, size):
+        self.frames = deque(maxlen=size)
+
+    def add(self, step, image):
+        self.frames.append((step, image))
+
+
+class ArtifactStore:
+    """Kept artifacts on disk, evicting the oldest tests once over `max_bytes`."""
+
+    def __init__(self, directory=ARTIFACTS_DIR, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def folder_for(self, nodeid):
+        name = re.sub(r"[^\w.-]+", "_", nodeid)[-120:]
+        path = os.path.join(self.directory, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def evict(self, keep):
+        with self._lock:
+            folders = []
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                size = sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+                folders.append((os.path.getmtime(path), path, size))
+            total = sum(size for _, _, size in folders)
+            for _, path, size in sorted(folders):
+                if total <= self.max_bytes:
+                    break
+                if path != keep:
+                    # another xdist worker may be evicting the same folder
+                    shutil.rmtree(path, ignore_errors=True)
+                    total -= size
+
+
+class ArtifactCapture:
+    """Trace chunk and screenshots for one test, written out only when the test is kept.
+
+    The trace chunk stays inside Playwright until `finish`: stopping it
+    without a path throws it away, so passing tests write nothing.
+    """
+
+    def __init__(self, nodeid, store, step_screenshots=0):
+        self.nodeid = nodeid
+        self.store = store
+        self.ring = ScreenshotRing(step_screenshots) if step_screenshots else None
+        self.context = None
+        self.page = None
+
+    def start(self, context, page):
+        self.context, self.page = context, page
+        if context not in _traced:
+            context.tracing.start(screenshots=True, snapshots=True)
+            _traced.add(context)
+        context.tracing.start_chunk(title=self.nodeid)
+        _captures[page] = self
+        return self
+
+    def after_step(self, step):
+        if self.ring is None:
+            return
+        try:
+            self.ring.add(step, self.page.screenshot(type="jpeg", quality=50, timeout=2000))
+        except PlaywrightError:
+            pass
+
+    def finish(self, keep, reason=""):
+        """Stop the chunk. Returns the kept artifacts (folder and trace/screenshot paths), or None."""
+        if self.context is None:
+            return None
+        if not keep:
+            self.context.tracing.stop_chunk()
+            return None
+        folder = self.store.folder_for(self.nodeid)
+        artifacts = {"folder": folder, "reason": reason, "trace": None, "screenshot": None}
+        try:
+            screenshot_path = os.path.join(folder, "final.png")
+            self.page.screenshot(path=screenshot_path, full_page=True, timeout=5000)
+            artifacts["screenshot"] = screenshot_path
+        except PlaywrightError:
+            pass
+        for index, (step, image) in enumerate(self.ring.frames if self.ring else []):
+            with open(os.path.join(folder, f"step{index + 1:02d}_{step}.jpg"), "wb") as file:
+                file.write(image)
+        trace_path = os.path.join(folder, "trace.zip")
+        self.context.tracing.stop_chunk(path=trace_path)
+        artifacts["trace"] = trace_path
+        self.store.evict(keep=folder)
+        return artifacts
+
+
+def after_step(instance, step, ok):
+    """step_timer listener: a screenshot after each page-object step, when enabled."""
+    page = getattr(instance, "page", None)
+    capture = _captures.get(page) if page is not None else None
+    if capture is not None:
+        capture.after_step(step.rsplit(".", 1)[-1])
+
+
+def report_extras(artifacts, report_dir, extras):
+    """pytest-html extras for kept artifacts: links to the final screenshot and the trace.
+
+    Both are linked by path relative to the report, not inlined: a full-page
+    PNG per failing test would bloat the self-contained HTML.
+    """
+    items = []
+    if artifacts["screenshot"]:
+        items.append(extras.url(_relative(artifacts["screenshot"], report_dir), name="final screenshot"))
+    if artifacts["trace"]:
+        items.append(extras.url(_relative(artifacts["trace"], report_dir), name=f"trace ({artifacts['reason']})"))
+    return items
+
+
+def _relative(path, report_dir):
+    return os.path.relpath(path, report_dir).replace(os.sep, "/")
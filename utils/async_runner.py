@@ -0,0 +1,104 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from playwright.async_api import async_playwright
+from POM.async_login import AsyncLoginPage
+from utils.browser_pool import CONTEXT_OPTIONS
+
+DEFAULT_CONCURRENCY = 16
+
+
+@dataclass
+class FlowResult:
+    name: str
+    ok: bool
+    elapsed: float
+    error: str = None
+
+
+async def run_flows(flows, open_page, concurrency=DEFAULT_CONCURRENCY):
+    """Run `flows` ({name: async fn(login_page)}) with at most `concurrency` pages open.
+
+    `open_page` is an async context manager factory that yields a ready
+    AsyncLoginPage. A failing flow is recorded, it does not stop the others.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(name, flow):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                async with open_page() as login_page:
+                    await flow(login_page)
+            except Exception as e:
+                message = str(e).splitlines()[0] if str(e) else type(e).__name__
+                return FlowResult(name, False, time.perf_counter() - start, message)
+            return FlowResult(name, True, time.perf_counter() - start)
+
+    return await asyncio.gather(*(run_one(name, flow) for name, flow in flows.items()))
+
+
+def assert_all_passed(results):
+    failures = [f"{r.name}: {r.error}" for r in results if not r.ok]
+    assert not failures, f"{len(failures)} of {len(results)} flows failed:\n" + "\n".join(failures)
+
+
+class AsyncFlowRunner:
+    """One async browser driving many pages from a single event loop.
+
+    The loop is private to the runner and only runs inside `run()`, so it
+    coexists with the sync Playwright fixtures in the same process. Every
+    flow gets its own browser context.
+    """
+
+    def __init__(self, url, browser_name="chromium", headless=True, concurrency=DEFAULT_CONCURRENCY):
+        self.url = url
+        self.browser_name = browser_name
+        self.headless = headless
+        self.concurrency = concurrency
+        self.loop = asyncio.new_event_loop()
+        self._playwright = None
+        self.browser = None
+        self.stats = {"flows": 0, "failed": 0, "wall": 0.0}
+
+    def start(self):
+        self._playwright = self.loop.run_until_complete(async_playwright().start())
+        launcher = getattr(self._playwright, self.browser_name)
+        self.browser = self.loop.run_until_complete(launcher.launch(headless=self.headless))
+        return self
+
+    @asynccontextmanager
+    async def _open_page(self):
+        context = await self.browser.new_context(**CONTEXT_OPTIONS)
+        try:
+            login_page = AsyncLoginPage(await context.new_page())
+            await login_page.open(self.url)
+            yield login_page
+        finally:
+            await context.close()
+
+    def run(self, flows, concurrency=None):
+        start = time.perf_counter()
+        results = self.loop.run_until_complete(run_flows(flows, self._open_page, concurrency or self.concurrency))
+        self.stats["flows"] += len(results)
+        self.stats["failed"] += sum(1 for r in results if not r.ok)
+        self.stats["wall"] += time.perf_counter() - start
+        return results
+
+    def summary_line(self):
+        if not self.stats["flows"]:
+            return None
+        rate = self.stats["flows"] / self.stats["wall"] if self.stats["wall"] else 0.0
+        return (
+            f"{self.stats['flows']} async flows ({self.stats['failed']} failed) in {self.stats['wall']:.2f}s, "
+            f"{rate:.1f} flows/s at concurrency {self.concurrency}"
+        )
+
+    def close(self):
+        if self.browser:
+            self.loop.run_until_complete(self.browser.close())
+        if self._playwright:
+            self.loop.run_until_complete(self._playwright.stop())
+        self.loop.close()
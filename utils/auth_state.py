@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import yaml
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+AUTH_DIR = os.path.join(BASE_DIR, "..", ".auth")
+CONFIG_PATH = os.path.join(BASE_DIR, "..", "data", "config.yaml")
+
+DEFAULT_TTL = 1800
+
+
+def credentials_fingerprint(base_url, config_path=CONFIG_PATH):
+    """Hash of the admin credentials and app URL; a change invalidates saved state."""
+    with open(config_path, "r") as file:
+        credentials = yaml.safe_load(file).get("credentials", {})
+    payload = json.dumps({"credentials": credentials, "url": base_url}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AuthStateCache:
+    """Playwright storage state of a logged-in admin, cached on disk.
+
+    The state is valid while it is younger than `ttl` seconds and was saved
+    for the same credentials and URL. `scope` is "run" (shared by every
+    worker) or a worker id, so each worker logs in on its own.
+    """
+
+    def __init__(self, fingerprint, scope="run", ttl=DEFAULT_TTL, directory=AUTH_DIR):
+        self.fingerprint = fingerprint
+        self.ttl = ttl
+        self.directory = directory
+        self.state_path = os.path.join(directory, f"admin-{scope}.json")
+        self.meta_path = os.path.join(directory, f"admin-{scope}.meta.json")
+
+    def _read_meta(self):
+        try:
+            with open(self.meta_path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def is_valid(self):
+        meta = self._read_meta()
+        if not meta or not os.path.exists(self.state_path):
+            return False
+        if meta.get("fingerprint") != self.fingerprint:
+            return False
+        return time.time() - meta.get("created_at", 0) < self.ttl
+
+    def save(self, context):
+        """Capture `context`'s cookies and local storage."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._write_json(self.state_path, context.storage_state())
+        self._write_json(self.meta_path, {"fingerprint": self.fingerprint, "created_at": time.time()})
+
+    def invalidate(self):
+        for path in (self.state_path, self.meta_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _write_json(path, data):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(data, file)
+        os.replace(tmp_path, path)
+
+    @contextmanager
+    def lock(self, timeout=120):
+        """Cross-process lock so only one worker logs in for a shared scope."""
+        os.makedirs(self.directory, exist_ok=True)
+        lock_path = self.state_path + ".lock"
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > timeout:
+                        # left behind by a killed worker
+                        os.remove(lock_path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for auth state lock {lock_path}")
+                time.sleep(0.1)
+        try:
+            yield
+        finally:
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
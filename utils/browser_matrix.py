@@ -0,0 +1,59 @@
+import statistics
+
+BROWSERS = ("chromium", "firefox", "webkit")
+
+
+def parse_browsers(value):
+    """'chromium,firefox' -> ['chromium', 'firefox']; 'all' is every engine."""
+    if value.strip() == "all":
+        return list(BROWSERS)
+    names = []
+    for name in (part.strip() for part in value.split(",")):
+        if name not in BROWSERS:
+            raise ValueError(f"--browser: unknown browser '{name}', expected a comma separated list of {BROWSERS} or 'all'")
+        if name not in names:
+            names.append(name)
+    return names
+
+
+class BrowserTimings:
+    """Outcome and call duration of every test per engine, for the cross-browser summary."""
+
+    def __init__(self):
+        self.results = {}
+
+    def add(self, test, browser, outcome, duration):
+        self.results.setdefault(test, {})[browser] = (outcome, duration)
+
+    def browsers(self):
+        return sorted({browser for per_browser in self.results.values() for browser in per_browser})
+
+    def summary_lines(self, slowest=5):
+        """Per engine: counts and total time; then how much slower each engine is on the tests all of them passed."""
+        browsers = self.browsers()
+        if len(browsers) < 2:
+            return []
+        lines = []
+        for browser in browsers:
+            rows = [per_browser[browser] for per_browser in self.results.values() if browser in per_browser]
+            passed = sum(1 for outcome, _ in rows if outcome == "passed")
+            lines.append(f"{browser}: {len(rows)} tests, {passed} passed, {len(rows) - passed} not passed, "
+                         f"{sum(duration for _, duration in rows):.1f}s in tests")
+        common = {
+            test: {browser: duration for browser, (_, duration) in per_browser.items()}
+            for test, per_browser in self.results.items()
+            if len(per_browser) == len(browsers) and all(outcome == "passed" for outcome, _ in per_browser.values())
+        }
+        if not common:
+            return lines
+        fastest = min(browsers, key=lambda browser: sum(durations[browser] for durations in common.values()))
+        for browser in browsers:
+            if browser == fastest:
+                continue
+            ratios = [durations[browser] / durations[fastest] for durations in common.values() if durations[fastest] > 0]
+            if ratios:
+                lines.append(f"{browser} vs {fastest}: median {statistics.median(ratios) - 1:+.0%} per test over {len(ratios)} tests")
+        spread = sorted(common.items(), key=lambda kv: max(kv[1].values()) - min(kv[1].values()), reverse=True)
+        for test, durations in spread[:slowest]:
+            lines.append(f"  {test}: " + ", ".join(f"{browser} {durations[browser]:.2f}s" for browser in browsers))
+        return lines
@@ -0,0 +1,101 @@
+import os
+from collections import deque
+
+from playwright.sync_api import Error as PlaywrightError
+
+RECYCLE_POLICIES = ("close", "reuse")
+
+# every context gets the 1920x1080 layout the browsers used to be launched with
+# (--window-size=1920,1080); positional locators and visual baselines depend on it
+CONTEXT_OPTIONS = {"viewport": {"width": 1920, "height": 1080}}
+
+CLEAR_STORAGE_JS = "() => { try { localStorage.clear(); sessionStorage.clear(); } catch (e) {} }"
+
+
+def worker_id():
+    """Name of the current pytest-xdist worker ("gw0", "gw1", ...) or "master"."""
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+
+def worker_index():
+    wid = worker_id()
+    return int(wid[2:]) if wid.startswith("gw") and wid[2:].isdigit() else 0
+
+
+def browser_for_worker(worker_browsers, default):
+    """Pick this worker's browser from a comma separated round-robin list."""
+    names = [name.strip() for name in (worker_browsers or "").split(",") if name.strip()]
+    if not names:
+        return default
+    return names[worker_index() % len(names)]
+
+
+class ContextPool:
+    """Pre-warmed pool of browser contexts for one worker's browser.
+
+    Every test gets its own context. With the "close" policy a context is
+    thrown away after the test and a new one is warmed in its place; with
+    "reuse" it is wiped (cookies, storage, pages) and handed out again up
+    to `max_uses` times.
+    """
+
+    def __init__(self, browser, size=2, recycle="close", max_uses=20, context_options=None):
+        if recycle not in RECYCLE_POLICIES:
+            raise ValueError(f"Unknown recycle policy '{recycle}', expected one of {RECYCLE_POLICIES}")
+        self.browser = browser
+        self.size = max(size, 0)
+        self.recycle = recycle
+        self.max_uses = max_uses
+        self.context_options = CONTEXT_OPTIONS if context_options is None else context_options
+        self._idle = deque()
+        self._uses = {}
+        self.stats = {"created": 0, "reused": 0, "closed": 0, "cold": 0}
+
+    def _new_context(self):
+        context = self.browser.new_context(**self.context_options)
+        self._uses[context] = 0
+        self.stats["created"] += 1
+        return context
+
+    def warm(self):
+        while len(self._idle) < self.size:
+            self._idle.append(self._new_context())
+
+    def acquire(self):
+        if self._idle:
+            return self._idle.popleft()
+        self.stats["cold"] += 1
+        return self._new_context()
+
+    def release(self, context):
+        uses = self._uses.get(context, 0) + 1
+        self._uses[context] = uses
+        if self.recycle == "reuse" and uses < self.max_uses and len(self._idle) < self.size:
+            try:
+                self._reset(context)
+                self._idle.append(context)
+                self.stats["reused"] += 1
+                return
+            except PlaywrightError:
+                pass
+        self._close(context)
+        self.warm()
+
+    def _reset(self, context):
+        for page in context.pages:
+            page.evaluate(CLEAR_STORAGE_JS)
+            page.close()
+        context.clear_cookies()
+        context.clear_permissions()
+
+    def _close(self, context):
+        self._uses.pop(context, None)
+        try:
+            context.close()
+        except PlaywrightError:
+            pass
+        self.stats["closed"] += 1
+
+    def close(self):
+        while self._idle:
+            self._close(self._idle.popleft())
@@ -0,0 +1,297 @@
+"""Keep one Chromium running between pytest invocations.
+
+The daemon launches Chromium with a DevTools port and keeps it alive;
+`worker_browser` attaches to it over CDP instead of launching a browser,
+so rerunning a single test skips the browser startup. Every attached pytest
+process holds a lease. Without leases the daemon recycles a browser that
+still has pages open (left behind by a killed run) or has been up for
+`--max-age`, and exits after `--idle-timeout`.
+
+    python utils/browser_server.py start            # headed, like a normal local run
+    python utils/browser_server.py start --headless
+    python utils/browser_server.py status
+    python utils/browser_server.py stop
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import requests
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import sync_playwright
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.path.join(BASE_DIR, "..", ".cache", "browser_server")
+LAUNCH_ARGS = ["--start-maximized", "--window-size=1920,1080"]
+# Firefox and WebKit have no CDP endpoint to attach to
+SERVER_BROWSERS = ("chromium",)
+
+
+def _path(state_dir, name):
+    return os.path.join(os.path.abspath(state_dir), name)
+
+
+def pid_alive(pid):
+    if os.name == "nt":
+        import ctypes
+        # PROCESS_QUERY_LIMITED_INFORMATION; signal 0 would terminate the process on Windows
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_state(state_dir=STATE_DIR):
+    try:
+        with open(_path(state_dir, "state.json"), "r") as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return state if pid_alive(state["pid"]) else None
+
+
+def healthy(endpoint, timeout=1.0):
+    try:
+        return requests.get(f"{endpoint}/json/version", timeout=timeout).ok
+    except requests.RequestException:
+        return False
+
+
+def page_targets(endpoint):
+    try:
+        targets = requests.get(f"{endpoint}/json/list", timeout=2).json()
+    except (requests.RequestException, ValueError):
+        return 0
+    return sum(1 for target in targets if target.get("type") == "page")
+
+
+class Lease:
+    """Marks the browser as in use by this process, so the daemon does not recycle it."""
+
+    def __init__(self, state_dir=STATE_DIR):
+        self.directory = _path(state_dir, "leases")
+        self.path = os.path.join(self.directory, str(os.getpid()))
+
+    def acquire(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, "w") as file:
+            file.write(str(time.time()))
+        return self
+
+    def release(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def live(state_dir=STATE_DIR):
+        """Leases of processes that are still running; stale ones are removed."""
+        directory = _path(state_dir, "leases")
+        live = 0
+        for name in os.listdir(directory) if os.path.isdir(directory) else []:
+            if name.isdigit() and pid_alive(int(name)):
+                live += 1
+                continue
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+        return live
+
+
+def connect(playwright, browser_name, headless, state_dir=STATE_DIR):
+    """(browser, lease) attached to a running server that matches, or (None, None)."""
+    state = read_state(state_dir)
+    if browser_name not in SERVER_BROWSERS or not state:
+        return None, None
+    if state["browser"] != browser_name or state["headless"] != headless:
+        print(f"Browser server runs {state['browser']} headless={state['headless']}, launching a browser instead")
+        return None, None
+    if not healthy(state["endpoint"]):
+        return None, None
+    lease = Lease(state_dir).acquire()
+    try:
+        return playwright.chromium.connect_over_cdp(state["endpoint"], timeout=5000), lease
+    except PlaywrightError as error:
+        lease.release()
+        print(f"Browser server at {state['endpoint']} did not accept the connection: {error}")
+        return None, None
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class BrowserServer:
+    """The daemon side: one Chromium with a DevTools port, relaunched when it dies or leaks."""
+
+    def __init__(self, headless, state_dir=STATE_DIR, idle_timeout=1800, max_age=4 * 3600, check_interval=5):
+        self.headless = headless
+        self.state_dir = state_dir
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self.browser = None
+        self.launched_at = 0.0
+        self.recycles = 0
+
+    def launch(self, playwright):
+        port = _free_port()
+        self.browser = playwright.chromium.launch(
+            headless=self.headless, args=LAUNCH_ARGS + [f"--remote-debugging-port={port}"]
+        )
+        self.launched_at = time.time()
+        self.endpoint = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 10
+        while not healthy(self.endpoint) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self._write_state()
+
+    def _write_state(self):
+        state = {
+            "pid": os.getpid(), "browser": "chromium", "headless": self.headless, "endpoint": self.endpoint,
+            "version": self.browser.version, "launched_at": self.launched_at, "recycles": self.recycles,
+        }
+        os.makedirs(os.path.abspath(self.state_dir), exist_ok=True)
+        temp = _path(self.state_dir, "state.json.tmp")
+        with open(temp, "w") as file:
+            json.dump(state, file)
+        os.replace(temp, _path(self.state_dir, "state.json"))
+
+    def recycle(self, playwright, reason):
+        print(f"{time.strftime('%H:%M:%S')} recycling browser: {reason}", flush=True)
+        try:
+            self.browser.close()
+        except PlaywrightError:
+            pass
+        self.recycles += 1
+        self.launch(playwright)
+
+    def check(self, playwright, idle_since):
+        """One health pass. Returns when the browser became idle (0.0 while in use), or None to shut down."""
+        if not self.browser.is_connected() or not healthy(self.endpoint, timeout=3):
+            self.recycle(playwright, "browser is not responding")
+            return idle_since
+        if Lease.live(self.state_dir):
+            return 0.0
+        now = time.time()
+        idle_since = idle_since or now
+        if now - idle_since > self.idle_timeout:
+            return None
+        pages = page_targets(self.endpoint)
+        if pages:
+            self.recycle(playwright, f"{pages} pages left open without a test run")
+        elif now - self.launched_at > self.max_age:
+            self.recycle(playwright, f"up for more than {self.max_age}s")
+        return idle_since
+
+    def serve(self):
+        stop_file = _path(self.state_dir, "stop")
+        if os.path.exists(stop_file):
+            os.remove(stop_file)
+        with sync_playwright() as playwright:
+            self.launch(playwright)
+            print(f"{time.strftime('%H:%M:%S')} serving chromium {self.browser.version} at {self.endpoint}", flush=True)
+            idle_since, next_check = 0.0, time.monotonic() + self.check_interval
+            try:
+                while not os.path.exists(stop_file):
+                    time.sleep(0.5)
+                    if time.monotonic() < next_check:
+                        continue
+                    next_check = time.monotonic() + self.check_interval
+                    idle_since = self.check(playwright, idle_since)
+                    if idle_since is None:
+                        print(f"{time.strftime('%H:%M:%S')} idle for {self.idle_timeout}s, stopping", flush=True)
+                        break
+            finally:
+                for name in ("state.json", "stop"):
+                    if os.path.exists(_path(self.state_dir, name)):
+                        os.remove(_path(self.state_dir, name))
+                self.browser.close()
+
+
+def start(args):
+    state = read_state(args.state_dir)
+    if state and healthy(state["endpoint"]):
+        print(f"Already running: chromium at {state['endpoint']} (pid {state['pid']})")
+        return 0
+    os.makedirs(os.path.abspath(args.state_dir), exist_ok=True)
+    command = [
+        sys.executable, os.path.abspath(__file__), "serve", "--state-dir", args.state_dir,
+        "--idle-timeout", str(args.idle_timeout), "--max-age", str(args.max_age),
+    ] + (["--headless"] if args.headless else [])
+    if os.name == "nt":
+        detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        detach = {"start_new_session": True}
+    with open(_path(args.state_dir, "server.log"), "a") as log:
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, **detach)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline and process.poll() is None:
+        state = read_state(args.state_dir)
+        if state and healthy(state["endpoint"]):
+            print(f"Started chromium {state['version']} at {state['endpoint']} (pid {state['pid']})")
+            return 0
+        time.sleep(0.2)
+    print(f"Browser server did not start, see {_path(args.state_dir, 'server.log')}")
+    return 1
+
+
+def status(args):
+    state = read_state(args.state_dir)
+    if not state:
+        print("Not running")
+        return 1
+    uptime = time.time() - state["launched_at"]
+    print(
+        f"chromium {state['version']} at {state['endpoint']} (pid {state['pid']}, headless={state['headless']}), "
+        f"browser up {uptime:.0f}s, {state['recycles']} recycles, healthy={healthy(state['endpoint'])}, "
+        f"{Lease.live(args.state_dir)} pytest processes attached, {page_targets(state['endpoint'])} pages open"
+    )
+    return 0
+
+
+def stop(args):
+    state = read_state(args.state_dir)
+    if not state:
+        print("Not running")
+        return 0
+    open(_path(args.state_dir, "stop"), "w").close()
+    deadline = time.monotonic() + 15
+    while pid_alive(state["pid"]) and time.monotonic() < deadline:
+        time.sleep(0.2)
+    print("Stopped" if not pid_alive(state["pid"]) else f"pid {state['pid']} is still running")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["start", "status", "stop", "serve"])
+    parser.add_argument("--headless", action="store_true", help="Must match the --headless of the pytest runs")
+    parser.add_argument("--idle-timeout", type=int, default=1800, help="Stop after this many seconds without pytest (default: 1800)")
+    parser.add_argument("--max-age", type=int, default=4 * 3600, help="Relaunch an idle browser older than this (default: 14400)")
+    parser.add_argument("--state-dir", default=STATE_DIR)
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        BrowserServer(args.headless, args.state_dir, args.idle_timeout, args.max_age).serve()
+        return 0
+    return {"start": start, "status": status, "stop": stop}[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
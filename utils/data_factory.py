@@ -0,0 +1,191 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(BASE_DIR, "..", "data", "config.yaml")
+
+DEFAULT_API_CONFIG = {
+    "login_path": "/auth/login",
+    "blogs_path": "/blogs",
+    "token_field": "token",
+    "id_field": "id",
+    "snapshot_path": "/test/snapshot",
+    "restore_path": "/test/restore",
+}
+
+
+def load_config(config_path=CONFIG_PATH):
+    with open(config_path, "r") as file:
+        return yaml.safe_load(file)
+
+
+def _items(payload):
+    """Blog list responses come either as a bare list or wrapped in an object."""
+    if isinstance(payload, list):
+        return payload
+    for key in ("blogs", "data", "items", "results"):
+        if isinstance(payload.get(key), list):
+            return payload[key]
+    return []
+
+
+class BlogFactory:
+    """Creates and deletes blog posts through the backend API.
+
+    Every post created through the factory is tracked, so `cleanup()` can
+    remove exactly what a test added. Requests share one pooled
+    `requests.Session`; bulk calls fan out over `pool_size` connections.
+    """
+
+    def __init__(self, base_url, username, password, api_config=None, pool_size=8, timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = password
+        self.api = dict(DEFAULT_API_CONFIG, **(api_config or {}))
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.created_ids = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, base_url=None, config_path=CONFIG_PATH, **kwargs):
+        config = load_config(config_path)
+        return cls(
+            base_url or os.getenv("LOCAL_API_URL"),
+            config["credentials"]["adminusername"],
+            config["credentials"]["password"],
+            api_config=config.get("api"),
+            **kwargs,
+        )
+
+    def _url(self, path):
+        return f"{self.base_url}{path}"
+
+    def _blog_url(self, blog_id=None):
+        url = self._url(self.api["blogs_path"])
+        return url if blog_id is None else f"{url}/{blog_id}"
+
+    def login(self):
+        response = self.session.post(
+            self._url(self.api["login_path"]),
+            json={"username": self.username, "password": self.password},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        token = response.json().get(self.api["token_field"])
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        return self
+
+    @staticmethod
+    def blog_payload(title, **fields):
+        """Same defaults as the posts LoginPage creates through the UI."""
+        payload = {
+            "title": title,
+            "excerpt": "This is a custom blog excerpt",
+            "content": "This is custom blog content",
+            "category": "Technology",
+            "tags": ["JavaScript"],
+            "status": "published",
+        }
+        payload.update(fields)
+        return payload
+
+    def create(self, title, **fields):
+        response = self.session.post(self._blog_url(), json=self.blog_payload(title, **fields), timeout=self.timeout)
+        response.raise_for_status()
+        blog = response.json()
+        blog = blog.get("blog", blog) if isinstance(blog, dict) else blog
+        with self._lock:
+            self.created_ids.append(blog[self.api["id_field"]])
+        return blog
+
+    def create_many(self, specs):
+        """Create posts concurrently. `specs` are titles or dicts of blog fields."""
+        specs = [spec if isinstance(spec, dict) else {"title": spec} for spec in specs]
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            return list(executor.map(lambda spec: self.create(**spec), specs))
+
+    def list_blogs(self):
+        response = self.session.get(self._blog_url(), timeout=self.timeout)
+        response.raise_for_status()
+        return _items(response.json())
+
+    def get(self, blog_id):
+        response = self.session.get(self._blog_url(blog_id), timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def update(self, blog_id, **fields):
+        response = self.session.put(self._blog_url(blog_id), json=fields, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def snapshot(self):
+        """Name of a backend snapshot, or None when the backend has no snapshot endpoint."""
+        response = self.session.post(self._url(self.api["snapshot_path"]), timeout=self.timeout)
+        if response.status_code in (404, 405, 501):
+            return None
+        response.raise_for_status()
+        return response.json()["snapshot"]
+
+    def restore(self, name):
+        """Put the backend back to snapshot `name`; returns how many posts changed."""
+        response = self.session.post(self._url(self.api["restore_path"]), json={"snapshot": name}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json().get("changes")
+
+    def forget(self, blog_id):
+        """Stop tracking a post that the caller has already deleted."""
+        with self._lock:
+            if blog_id in self.created_ids:
+                self.created_ids.remove(blog_id)
+
+    def delete(self, blog_id):
+        """Delete one post; returns False when it was already gone."""
+        response = self.session.delete(self._blog_url(blog_id), timeout=self.timeout)
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def delete_many(self, blog_ids):
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            return list(executor.map(self.delete, blog_ids))
+
+    def delete_by_title(self, titles):
+        """Delete posts that were created some other way, e.g. through the UI."""
+        titles = set(titles)
+        ids = [blog[self.api["id_field"]] for blog in self.list_blogs() if blog.get("title") in titles]
+        return self.delete_many(ids)
+
+    def cleanup(self):
+        """Delete every post this factory created, attempting all before raising."""
+        with self._lock:
+            blog_ids, self.created_ids = self.created_ids, []
+        failures = []
+
+        def delete_quietly(blog_id):
+            try:
+                return self.delete(blog_id)
+            except requests.RequestException as e:
+                failures.append(f"{blog_id}: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            results = list(executor.map(delete_quietly, blog_ids))
+        if failures:
+            raise RuntimeError("Failed to delete seeded blog posts: " + "; ".join(failures))
+        return results
+
+    def close(self):
+        self.session.close()
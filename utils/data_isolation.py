@@ -0,0 +1,147 @@
+import hashlib
+import os
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOCK_DIR = os.path.join(BASE_DIR, "..", ".cache", "data_isolation")
+# fields put back when the blog list is restored through the regular API
+BLOG_FIELDS = ("title", "excerpt", "content", "category", "tags", "status")
+
+
+def _fields(blog):
+    return {name: blog.get(name) for name in BLOG_FIELDS if name in blog}
+
+
+class RestoreTimings:
+    """How long every restore took, per strategy, for the terminal summary."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rows = []
+
+    def add(self, test, strategy, seconds, changes):
+        with self._lock:
+            self.rows.append({"test": test, "strategy": strategy, "seconds": seconds, "changes": changes})
+
+    def export(self):
+        with self._lock:
+            return list(self.rows)
+
+    def merge(self, rows):
+        with self._lock:
+            self.rows.extend(rows)
+
+    def summary_lines(self, slowest=3):
+        lines = []
+        for strategy in sorted({row["strategy"] for row in self.rows}):
+            rows = [row for row in self.rows if row["strategy"] == strategy]
+            seconds = [row["seconds"] for row in rows]
+            lines.append(
+                f"{strategy}: {len(rows)} restores, median {statistics.median(seconds) * 1000:.1f} ms, "
+                f"max {max(seconds) * 1000:.1f} ms, {sum(row['changes'] or 0 for row in rows)} posts put back"
+            )
+        for row in sorted(self.rows, key=lambda row: row["seconds"], reverse=True)[:slowest]:
+            if row["changes"]:
+                lines.append(f"  {row['test']}: {row['seconds'] * 1000:.1f} ms, {row['changes']} posts")
+        return lines
+
+
+restore_timings = RestoreTimings()
+
+
+class DataIsolation:
+    """Snapshots the backend's blog posts before a test and restores them afterwards.
+
+    With the backend's snapshot/restore endpoints (`snapshot_path` and
+    `restore_path` under `api:` in config.yaml) this is one request each way.
+    Without them the blog list is recorded and restored through the regular
+    API: posts the test added are deleted, deleted posts are created again
+    (with new ids) and edited posts are put back.
+
+    A restore covers the whole backend, so when workers share one backend
+    (`shared=True`) isolated tests hold a cross-process lock until they are
+    restored.
+    """
+
+    def __init__(self, factory, shared=False, timings=None, lock_timeout=900):
+        self.factory = factory
+        self.shared = shared
+        self.timings = timings if timings is not None else restore_timings
+        self.lock_timeout = lock_timeout
+        self.strategy = None
+        key = hashlib.sha256(factory.base_url.encode("utf-8")).hexdigest()[:16]
+        self.lock_path = os.path.join(LOCK_DIR, f"{key}.lock")
+
+    def snapshot(self):
+        if self.strategy != "api-diff":
+            name = self.factory.snapshot()
+            if name is not None:
+                self.strategy = "endpoint"
+                return name
+            self.strategy = "api-diff"
+        id_field = self.factory.api["id_field"]
+        return {blog[id_field]: blog for blog in self.factory.list_blogs()}
+
+    def restore(self, snapshot):
+        """Put the backend back to `snapshot`; the number of posts that were changed."""
+        if self.strategy == "endpoint":
+            return self.factory.restore(snapshot)
+        factory = self.factory
+        id_field = factory.api["id_field"]
+        current = {blog[id_field]: blog for blog in factory.list_blogs()}
+        added = [blog_id for blog_id in current if blog_id not in snapshot]
+        removed = [blog for blog_id, blog in snapshot.items() if blog_id not in current]
+        edited = [blog for blog_id, blog in snapshot.items()
+                  if blog_id in current and _fields(current[blog_id]) != _fields(blog)]
+        factory.delete_many(added)
+        for blog in removed:
+            # not the test's post, so the factory's cleanup must not delete it again
+            factory.forget(factory.create(**_fields(blog))[id_field])
+        for blog in edited:
+            factory.update(blog[id_field], **_fields(blog))
+        return len(added) + len(removed) + len(edited)
+
+    @contextmanager
+    def isolated(self, test):
+        """Snapshot, run the test, restore; the restore happens however the test ended."""
+        with self._shared_lock():
+            snapshot = self.snapshot()
+            try:
+                yield snapshot
+            finally:
+                start = time.perf_counter()
+                changes = self.restore(snapshot)
+                self.timings.add(test, self.strategy, time.perf_counter() - start, changes)
+
+    @contextmanager
+    def _shared_lock(self):
+        if not self.shared:
+            yield
+            return
+        os.makedirs(LOCK_DIR, exist_ok=True)
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                os.close(os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.lock_path) > self.lock_timeout:
+                        # left behind by a killed worker
+                        os.remove(self.lock_path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for data isolation lock {self.lock_path}")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            try:
+                os.remove(self.lock_path)
+            except FileNotFoundError:
+                pass
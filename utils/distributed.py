@@ -0,0 +1,518 @@
+"""Work-stealing runner: a coordinator hands out tests one at a time, workers on any host pull them.
+
+The coordinator collects the tests for the given pytest arguments and serves
+them over TCP, longest expected first. Each worker runs one ordinary pytest
+session (all fixtures, one browser) and asks for the next test whenever it
+is free, so fast nodes simply take more tests. Results, logs and kept
+artifacts are sent back and written to the coordinator's results stream.
+Tests of a worker that disconnects, or goes silent for --lease-timeout, are
+requeued.
+
+    # one box, 4 worker processes
+    python utils/distributed.py run --workers 4 -- tests/ --headless
+
+    # several machines: one coordinator, then any number of workers per node
+    python utils/distributed.py coordinator --bind 0.0.0.0 --port 7788 -- tests/ --headless
+    python utils/distributed.py worker --connect build-01:7788
+"""
+import argparse
+import base64
+import importlib.util
+import json
+import os
+import re
+import shutil
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.duration_store import DEFAULT_DB_PATH, DurationStore, git_revision
+from utils.results_stream import STREAM_PATH, ResultsStream, safe_name
+from utils.sharding import estimate_durations
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_PORT = 7788
+ENGINES = ("chromium", "firefox", "webkit")
+
+
+def send(stream, message):
+    stream.write((json.dumps(message) + "\n").encode("utf-8"))
+    stream.flush()
+
+
+def receive(stream):
+    line = stream.readline()
+    return json.loads(line) if line else None
+
+
+def collect(pytest_args):
+    """Node ids pytest selects for these arguments."""
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", "-q", "--results-stream", "off", *pytest_args],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    tests = [line.strip() for line in result.stdout.splitlines() if "::" in line and not line.startswith("ERROR")]
+    if result.returncode not in (0, 5):
+        raise RuntimeError(f"Collection failed:\n{result.stdout[-3000:]}{result.stderr[-2000:]}")
+    return tests
+
+
+def _engine_name(nodeid):
+    match = re.search(r"\[(?:[^\]]*-)?(chromium|firefox|webkit)(?:-[^\]]*)?\]$", nodeid)
+    return match.group(1) if match else None
+
+
+def _engine(nodeid):
+    name = _engine_name(nodeid)
+    return ENGINES.index(name) if name else -1
+
+
+def order_tests(tests, history=None):
+    """Longest expected first, so stragglers start early; a --browser matrix is kept grouped by engine
+    because switching engines relaunches the worker's browser. `history` maps (nodeid, engine) to durations."""
+    durations, _ = estimate_durations([(nodeid, [], _engine_name(nodeid)) for nodeid in tests], history or {})
+    return sorted(tests, key=lambda nodeid: (_engine(nodeid), -durations[nodeid]))
+
+
+class WorkQueue:
+    """Tests that are pending, leased to a worker, or finished.
+
+    Leases of a worker that goes away are put back at the front of the
+    queue; a test that was lost `max_attempts` times is given up as an error.
+    A test leased `ahead` (fetched while the worker still runs another one)
+    is handed to an idle worker when nothing else is pending, unless its
+    worker has started it meanwhile.
+    """
+
+    def __init__(self, tests, max_attempts=2, lease_timeout=900):
+        self.pending = deque(tests)
+        self.total = len(tests)
+        self.max_attempts = max_attempts
+        self.lease_timeout = lease_timeout
+        self.leases = {}
+        self.ahead = {}
+        self.attempts = Counter()
+        self.outcomes = {}
+        self.lost = {}
+        self._changed = threading.Condition()
+
+    def _finished(self):
+        return len(self.outcomes) >= self.total
+
+    def lease(self, worker, wait=False, ahead=False):
+        """The next test for `worker`. With `wait`, blocks while other workers may still hand tests back;
+        None means there is nothing (left) to run. A lookahead (`ahead`) is never taken from another worker."""
+        with self._changed:
+            while True:
+                self._expire()
+                if self.pending:
+                    test = self.pending.popleft()
+                    self.leases[test] = (worker, time.monotonic())
+                    self.attempts[test] += 1
+                    if ahead:
+                        self.ahead[test] = worker
+                    return test
+                taken = None if ahead else next((test for test, owner in self.ahead.items() if owner != worker), None)
+                if taken is not None:
+                    # not started yet: better run now by an idle worker than after its worker's current test
+                    del self.ahead[taken]
+                    self.leases[taken] = (worker, time.monotonic())
+                    return taken
+                if not wait or self._finished():
+                    return None
+                self._changed.wait(1.0)
+
+    def start(self, worker, test):
+        """Confirm a lookahead before running it; False when it was handed to another worker."""
+        with self._changed:
+            if self.leases.get(test, (None,))[0] != worker:
+                return False
+            self.ahead.pop(test, None)
+            return True
+
+    def complete(self, worker, test, outcome):
+        """Record a result; a late result from a worker whose lease was already requeued is ignored."""
+        with self._changed:
+            if self.leases.get(test, (None,))[0] != worker:
+                return False
+            del self.leases[test]
+            self.ahead.pop(test, None)
+            self.outcomes[test] = outcome
+            self._changed.notify_all()
+            return True
+
+    def release_worker(self, worker, reason):
+        with self._changed:
+            lost = [test for test, (owner, _) in self.leases.items() if owner == worker]
+            # back to the front in their original order
+            for test in reversed(lost):
+                self._requeue(test, reason)
+            self._changed.notify_all()
+            return lost
+
+    def _requeue(self, test, reason):
+        del self.leases[test]
+        self.ahead.pop(test, None)
+        if self.attempts[test] < self.max_attempts:
+            self.pending.appendleft(test)
+        else:
+            self.outcomes[test] = "error"
+            self.lost[test] = reason
+
+    def _expire(self):
+        now = time.monotonic()
+        for test, (worker, since) in list(self.leases.items()):
+            if now - since > self.lease_timeout:
+                self._requeue(test, f"no result from {worker} within {self.lease_timeout}s")
+                self._changed.notify_all()
+
+    def wait_finished(self, timeout):
+        with self._changed:
+            self._expire()
+            if not self._finished():
+                self._changed.wait(timeout)
+            return self._finished()
+
+    def give_up(self, reason):
+        """Mark everything not finished as an error (no workers left)."""
+        with self._changed:
+            for test in list(self.pending) + list(self.leases):
+                self.outcomes[test] = "error"
+                self.lost[test] = reason
+            self.pending.clear()
+            self.leases.clear()
+            self.ahead.clear()
+            self._changed.notify_all()
+
+
+class _WorkerConnection(socketserver.StreamRequestHandler):
+    def handle(self):
+        coordinator = self.server.coordinator
+        hello = receive(self.rfile)
+        if not hello or hello.get("op") != "hello":
+            return
+        worker = coordinator.join(hello.get("name") or f"{self.client_address[0]}")
+        send(self.wfile, {"op": "welcome", "worker": worker, "pytest_args": coordinator.pytest_args})
+        try:
+            while True:
+                message = receive(self.rfile)
+                if message is None:
+                    break
+                reply = coordinator.handle(worker, message)
+                if reply is not None:
+                    send(self.wfile, reply)
+        except (OSError, ValueError):
+            pass
+        finally:
+            coordinator.leave(worker)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class Coordinator:
+    """Serves the queue to workers and writes everything they report into one results stream."""
+
+    def __init__(self, tests, pytest_args, stream, host="127.0.0.1", port=DEFAULT_PORT, max_attempts=2,
+                 lease_timeout=900):
+        self.queue = WorkQueue(tests, max_attempts, lease_timeout)
+        self.pytest_args = pytest_args
+        self.stream = stream
+        self.stats = {}
+        self.connected = set()
+        self._lock = threading.Lock()
+        self.server = _Server((host, port), _WorkerConnection)
+        self.server.coordinator = self
+        self.address = self.server.server_address
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def join(self, name):
+        with self._lock:
+            worker, suffix = name, 1
+            while worker in self.stats:
+                suffix += 1
+                worker = f"{name}.{suffix}"
+            self.stats[worker] = {"tests": 0, "busy": 0.0, "joined": time.monotonic(), "left": None}
+            self.connected.add(worker)
+        print(f"{worker} joined")
+        return worker
+
+    def leave(self, worker):
+        with self._lock:
+            self.connected.discard(worker)
+            self.stats[worker]["left"] = time.monotonic()
+        lost = self.queue.release_worker(worker, f"{worker} disconnected")
+        if lost:
+            print(f"{worker} disconnected with {len(lost)} tests in hand, requeued: {', '.join(lost)}")
+
+    def handle(self, worker, message):
+        op = message.get("op")
+        if op == "next":
+            wait, ahead = message.get("wait", False), message.get("ahead", False)
+            return {"test": self.queue.lease(worker, wait=wait, ahead=ahead)}
+        if op == "start":
+            return {"ok": self.queue.start(worker, message["test"])}
+        if op == "record":
+            record = self._store_files(worker, message["record"], message.get("files", {}))
+            with self._lock:
+                self.stats[worker]["busy"] += record.get("duration") or 0
+            self.stream.append(record)
+        elif op == "done":
+            if self.queue.complete(worker, message["test"], message["outcome"]):
+                with self._lock:
+                    self.stats[worker]["tests"] += 1
+        return None
+
+    def _store_files(self, worker, record, files):
+        """Write files sent by a worker under the stream folder and point the record at them."""
+        for key, file in files.items():
+            name = os.path.basename(file["name"])
+            if key == "logs":
+                folder = os.path.join(self.stream.root, "logs", worker)
+            else:
+                folder = os.path.join(self.stream.root, "artifacts", worker, safe_name(record["nodeid"]))
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, name)
+            with open(path, "wb") as target:
+                target.write(base64.b64decode(file["data"]))
+            if key == "logs":
+                record["logs"] = self.stream.relative(path)
+            else:
+                record["artifacts"][key] = self.stream.relative(path)
+                record["artifacts"]["folder"] = self.stream.relative(folder)
+        return record
+
+    def summary_lines(self, elapsed):
+        outcomes = Counter(self.queue.outcomes.values())
+        lines = [f"{self.queue.total} tests in {elapsed:.1f}s: " + ", ".join(f"{n} {o}" for o, n in sorted(outcomes.items()))]
+        for worker, stats in sorted(self.stats.items()):
+            alive = (stats["left"] or time.monotonic()) - stats["joined"]
+            lines.append(f"  {worker}: {stats['tests']} tests, busy {stats['busy']:.1f}s of {alive:.1f}s")
+        for test, reason in self.queue.lost.items():
+            lines.append(f"  LOST {test}: {reason}")
+        return lines
+
+
+class CoordinatorClient:
+    def __init__(self, address, timeout=30):
+        self.socket = socket.create_connection(address, timeout=timeout)
+        # a lease can block until other workers finish
+        self.socket.settimeout(None)
+        self.rfile = self.socket.makefile("rb")
+        self.wfile = self.socket.makefile("wb")
+
+    def hello(self, name):
+        send(self.wfile, {"op": "hello", "name": name})
+        return receive(self.rfile)
+
+    def _request(self, message):
+        send(self.wfile, message)
+        reply = receive(self.rfile)
+        if reply is None:
+            raise ConnectionError("coordinator went away")
+        return reply
+
+    def next(self, wait, ahead=False):
+        return self._request({"op": "next", "wait": wait, "ahead": ahead})["test"]
+
+    def start(self, test):
+        return self._request({"op": "start", "test": test})["ok"]
+
+    def record(self, record, files):
+        send(self.wfile, {"op": "record", "record": record, "files": files})
+
+    def done(self, test, outcome):
+        send(self.wfile, {"op": "done", "test": test, "outcome": outcome})
+
+    def close(self):
+        for closable in (self.rfile, self.wfile, self.socket):
+            closable.close()
+
+
+class PullWorker:
+    """pytest plugin: run whatever test the coordinator hands out next, instead of the collected order.
+
+    One test is fetched ahead and passed as `nextitem`, so session and module
+    fixtures (browser, context pool) stay up between tests. The coordinator
+    may give that test to an idle worker meanwhile; it is only run here
+    once `start` confirms it is still ours, and otherwise whatever was kept
+    set up for it is torn down before the next test.
+    """
+
+    def __init__(self, client, name, results_dir):
+        self.client = client
+        self.name = name
+        self.stream = ResultsStream(os.path.join(results_dir, "results.jsonl"))
+        self.outcomes = {}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            raise session.Interrupted(f"{session.testsfailed} errors during collection")
+        items = {item.nodeid: item for item in session.items}
+        # the test the last one was run with as `nextitem`, and so kept set up for
+        kept_for, previous = None, None
+        current = self.client.next(wait=True)
+        while current is not None:
+            following = self.client.next(wait=False, ahead=True)
+            item = items.get(current)
+            if item is None:
+                self.client.record({"type": "phase", "nodeid": current, "when": "setup", "outcome": "failed",
+                                    "duration": 0, "worker": self.name,
+                                    "longrepr": f"{self.name} did not collect this test"}, {})
+            else:
+                if kept_for is not None and kept_for is not item:
+                    self._switch_to(session, item, previous)
+                kept_for, previous = items.get(following), current
+                item.config.hook.pytest_runtest_protocol(item=item, nextitem=kept_for)
+            self.client.done(current, self.outcomes.pop(current, "error"))
+            if session.shouldfail or session.shouldstop:
+                break
+            if following is not None and not self.client.start(following):
+                following = None
+            current = following if following is not None else self.client.next(wait=True)
+        return True
+
+    def _switch_to(self, session, item, previous):
+        """The lookahead went to another worker: tear down what was kept for it and `item` does not share."""
+        try:
+            session._setupstate.teardown_exact(item)
+        except Exception as e:
+            self.client.record({"type": "phase", "nodeid": previous, "when": "teardown", "outcome": "failed",
+                                "duration": 0, "worker": self.name,
+                                "longrepr": f"teardown before {item.nodeid} failed: {e!r}"}, {})
+
+    def pytest_runtest_logreport(self, report):
+        previous = self.outcomes.get(report.nodeid)
+        if report.failed and previous not in ("failed", "error"):
+            self.outcomes[report.nodeid] = "failed" if report.when == "call" else "error"
+        elif previous is None and (report.when == "call" or report.skipped):
+            self.outcomes[report.nodeid] = report.outcome
+        record = self.stream.record(report, self.name)
+        files = {}
+        paths = {"logs": record.get("logs")}
+        for key in ("screenshot", "trace"):
+            paths[key] = (record.get("artifacts") or {}).get(key)
+        for key, relative in paths.items():
+            if relative:
+                path = os.path.join(self.stream.root, relative)
+                with open(path, "rb") as file:
+                    files[key] = {"name": os.path.basename(path), "data": base64.b64encode(file.read()).decode("ascii")}
+        self.client.record(record, files)
+
+
+def run_worker(address, name=None):
+    client = CoordinatorClient(address)
+    welcome = client.hello(name or f"{socket.gethostname()}-{os.getpid()}")
+    results_dir = tempfile.mkdtemp(prefix=f"bloggy-{welcome['worker']}-")
+    args = list(welcome["pytest_args"]) + ["--results-stream", "off", f"--html={os.path.join(results_dir, 'report.html')}"]
+    if importlib.util.find_spec("xdist"):
+        # the worker is the unit of parallelism, no xdist inside it (also not for --browser lists)
+        args += ["-n", "0"]
+    os.chdir(ROOT)
+    try:
+        return pytest.main(args, plugins=[PullWorker(client, welcome["worker"], results_dir)])
+    finally:
+        # logs and artifacts have been sent to the coordinator
+        shutil.rmtree(results_dir, ignore_errors=True)
+
+
+def _history():
+    if not os.path.exists(DEFAULT_DB_PATH):
+        return {}
+    store = DurationStore(DEFAULT_DB_PATH)
+    try:
+        return store.recent_durations(per_engine=True)
+    finally:
+        store.close()
+
+
+def run_coordinator(pytest_args, host, port, workers=0, max_attempts=2, lease_timeout=900, stream_path=STREAM_PATH):
+    tests = order_tests(collect(pytest_args), _history())
+    stream = ResultsStream(stream_path)
+    stream.session_start(mode="distributed", args=pytest_args, git_rev=git_revision(), tests=len(tests))
+    coordinator = Coordinator(tests, pytest_args, stream, host, port, max_attempts, lease_timeout).start()
+    host, port = coordinator.address
+    print(f"Serving {len(tests)} tests on {host}:{port}")
+    started = time.monotonic()
+
+    worker_log = open(os.path.join(stream.root, "workers.log"), "w")
+
+    def spawn():
+        return subprocess.Popen([sys.executable, os.path.abspath(__file__), "worker", "--connect", f"127.0.0.1:{port}"],
+                                cwd=ROOT, stdout=worker_log, stderr=subprocess.STDOUT)
+
+    local = [spawn() for _ in range(workers)]
+    respawns = workers
+    while not coordinator.queue.wait_finished(timeout=2):
+        if not local:
+            continue
+        for index, process in enumerate(local):
+            if process.poll() is not None and process.returncode not in (0, 1) and respawns:
+                # a crashed worker: its tests were requeued on disconnect, start a replacement
+                print(f"local worker exited with {process.returncode}, starting another")
+                local[index] = spawn()
+                respawns -= 1
+        if all(process.poll() is not None for process in local) and not coordinator.connected:
+            coordinator.queue.give_up("no workers left")
+    elapsed = time.monotonic() - started
+    for test, reason in coordinator.queue.lost.items():
+        stream.append({"type": "phase", "nodeid": test, "when": "call", "outcome": "failed", "duration": 0,
+                       "worker": "coordinator", "longrepr": reason})
+    failed = sum(1 for outcome in coordinator.queue.outcomes.values() if outcome in ("failed", "error"))
+    stream.session_finish(1 if failed else 0, collected=len(tests), failed=failed)
+    for process in local:
+        process.wait()
+    worker_log.close()
+    coordinator.stop()
+    print("\n".join(coordinator.summary_lines(elapsed)))
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["run", "coordinator", "worker"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Local worker processes for 'run'")
+    parser.add_argument("--bind", default="127.0.0.1", help="Coordinator address (0.0.0.0 for remote workers)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Coordinator port, 0 for any free port")
+    parser.add_argument("--connect", help="host:port of the coordinator, for 'worker'")
+    parser.add_argument("--name", help="Worker name in the summary (default: host-pid)")
+    parser.add_argument("--max-attempts", type=int, default=2, help="Times a test is handed out before it counts as lost")
+    parser.add_argument("--lease-timeout", type=int, default=900, help="Seconds a worker may hold a test without a result")
+    parser.add_argument("--stream", default=STREAM_PATH, help="Results stream written by the coordinator")
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # everything after -- goes to pytest, e.g. -- tests/ --headless
+    split = argv.index("--") if "--" in argv else len(argv)
+    args = parser.parse_args(argv[:split])
+    pytest_args = argv[split + 1:]
+
+    if args.mode == "worker":
+        if not args.connect:
+            parser.error("worker needs --connect host:port")
+        host, port = args.connect.rsplit(":", 1)
+        return run_worker((host, int(port)), args.name)
+    workers = args.workers if args.mode == "run" else 0
+    port = 0 if args.mode == "run" and args.port == DEFAULT_PORT else args.port
+    return run_coordinator(pytest_args or ["tests/"], args.bind, port, workers, args.max_attempts,
+                           args.lease_timeout, args.stream)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
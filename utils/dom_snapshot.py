@@ -0,0 +1,95 @@
+from dataclasses import dataclass, field
+
+from bs4 import BeautifulSoup
+
+from locators.blogPageLocators import BlogPageLocators
+
+
+def _text(element):
+    return " ".join(element.get_text(" ", strip=True).split()) if element is not None else ""
+
+
+@dataclass
+class BlogCard:
+    """One card of the public blog list."""
+    title: str
+    excerpt: str = ""
+    category: str = ""
+    tags: list = field(default_factory=list)
+    read_more: bool = False
+
+    def mentions(self, term):
+        """Case-insensitive match on anything the card shows."""
+        term = term.lower()
+        return any(term in value.lower() for value in [self.title, self.excerpt, self.category] + self.tags)
+
+
+@dataclass
+class BlogRow:
+    """One row of the admin dashboard table; `cells` maps lower-cased column headers to cell text."""
+    title: str
+    status: str = ""
+    category: str = ""
+    tags: list = field(default_factory=list)
+    cells: dict = field(default_factory=dict)
+
+
+def parse_blog_cards(html):
+    soup = BeautifulSoup(html, "html.parser")
+    matches = soup.select(BlogPageLocators.BLOG_CARD)
+    # an <article> inside a MUI card matches twice; keep the outermost element
+    # (by identity: bs4 compares tags by content)
+    matched = {id(card) for card in matches}
+    outermost = [card for card in matches if not any(id(parent) in matched for parent in card.parents)]
+    cards = []
+    for card in outermost:
+        chips = [_text(chip) for chip in card.select(BlogPageLocators.CARD_CHIP)]
+        cards.append(BlogCard(
+            title=_text(card.select_one(BlogPageLocators.CARD_TITLE)),
+            excerpt=_text(card.select_one(BlogPageLocators.CARD_EXCERPT)),
+            category=chips[0] if chips else "",
+            tags=chips[1:],
+            read_more=any(BlogPageLocators.READ_MORE_TEXT.lower() in _text(button).lower()
+                          for button in card.find_all(["button", "a"])),
+        ))
+    return cards
+
+
+def parse_admin_rows(html):
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.select_one(BlogPageLocators.ADMIN_TABLE)
+    if table is None:
+        return []
+    headers = [_text(cell).lower() for cell in table.select(BlogPageLocators.ADMIN_HEADER_CELL)]
+    rows = []
+    for row in table.select(BlogPageLocators.ADMIN_ROW):
+        cells = row.find_all("td")
+        by_header = {headers[i] if i < len(headers) and headers[i] else f"column {i + 1}": _text(cell)
+                     for i, cell in enumerate(cells)}
+        tags = []
+        if "tags" in headers and headers.index("tags") < len(cells):
+            tags_cell = cells[headers.index("tags")]
+            tags = [_text(chip) for chip in tags_cell.select(BlogPageLocators.ADMIN_CHIP)]
+            tags = tags or [tag.strip() for tag in _text(tags_cell).split(",") if tag.strip()]
+        rows.append(BlogRow(
+            title=by_header.get("title", _text(cells[0]) if cells else ""),
+            status=by_header.get("status", ""),
+            category=by_header.get("category", ""),
+            tags=tags,
+            cells=by_header,
+        ))
+    return rows
+
+
+def blog_cards(page):
+    """The public blog list as BlogCard records, read with a single page.content() call."""
+    return parse_blog_cards(page.content())
+
+
+def admin_rows(page):
+    """The admin dashboard table as BlogRow records, read with a single page.content() call."""
+    return parse_admin_rows(page.content())
+
+
+async def async_blog_cards(page):
+    return parse_blog_cards(await page.content())
@@ -0,0 +1,134 @@
+"""Trend charts and slowdown detection from the test duration history.
+
+Reads the SQLite store written by every pytest run (.perf/durations.db),
+draws duration trends per test and per page-object step, and flags tests
+whose recent runs are significantly slower than their history.
+
+    python utils/duration_report.py
+    python utils/duration_report.py --browser chromium --recent 3 --fail-on-regression
+"""
+import argparse
+import math
+import os
+import sqlite3
+import sys
+
+import pandas as pd
+import plotly.express as px
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.duration_store import DEFAULT_DB_PATH, DurationStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_PATH = os.path.join(BASE_DIR, "..", "reports", "durations.html")
+GROUP = ["nodeid", "browser", "headless"]
+
+
+def load_frames(db_path=DEFAULT_DB_PATH):
+    # opening the store adds the per-test browser column to older files
+    DurationStore(db_path).close()
+    with sqlite3.connect(db_path) as connection:
+        tests = pd.read_sql_query(
+            "SELECT r.id AS run_id, r.started_at, r.git_rev, COALESCE(t.browser, '') AS browser, r.headless, "
+            "t.nodeid, t.outcome, t.duration FROM test_durations t JOIN runs r ON r.id = t.run_id",
+            connection,
+        )
+        steps = pd.read_sql_query(
+            "SELECT r.id AS run_id, r.started_at, r.git_rev, COALESCE(t.browser, '') AS browser, r.headless, "
+            "s.nodeid, s.step, s.duration, s.ok FROM step_durations s JOIN runs r ON r.id = s.run_id "
+            "LEFT JOIN test_durations t ON t.run_id = s.run_id AND t.nodeid = s.nodeid",
+            connection,
+        )
+    for frame in (tests, steps):
+        frame["started_at"] = pd.to_datetime(frame["started_at"], unit="s")
+    return tests, steps
+
+
+def find_regressions(tests, recent=3, min_history=5, z_threshold=3.0, min_slowdown=0.10, min_delta=0.5):
+    """Tests whose mean over the last `recent` passing runs is significantly above their earlier runs.
+
+    Significant means all of: a z-score of the recent mean against the
+    history's standard error above `z_threshold`, at least `min_slowdown`
+    relative slowdown, and at least `min_delta` seconds. Tests are compared
+    within the same browser and headless mode only.
+    """
+    rows = []
+    passed = tests[tests["outcome"] == "passed"].sort_values("run_id")
+    for key, group in passed.groupby(GROUP):
+        durations = group["duration"].to_numpy()
+        history, latest = durations[:-recent], durations[-recent:]
+        if len(latest) < recent or len(history) < min_history:
+            continue
+        mean, std = history.mean(), history.std(ddof=1)
+        recent_mean = latest.mean()
+        # std of 0 (identical history) would make any change infinitely significant
+        std_error = max(std, mean * 0.01, 1e-6) / math.sqrt(recent)
+        z = (recent_mean - mean) / std_error
+        if z > z_threshold and recent_mean >= mean * (1 + min_slowdown) and recent_mean - mean >= min_delta:
+            rows.append(dict(zip(GROUP, key), baseline=mean, recent=recent_mean, slowdown=recent_mean / mean - 1, z=z,
+                             since=group["git_rev"].iloc[-recent]))
+    columns = GROUP + ["baseline", "recent", "slowdown", "z", "since"]
+    return pd.DataFrame(rows, columns=columns).sort_values("z", ascending=False, ignore_index=True)
+
+
+def build_report(tests, steps, regressions, top=15):
+    """One HTML page: regressions table, test trends, step trends."""
+    passed = tests[tests["outcome"] == "passed"]
+    slowest = passed.groupby("nodeid")["duration"].median().nlargest(top).index
+    test_chart = px.line(
+        passed[passed["nodeid"].isin(slowest)].sort_values("run_id"),
+        x="started_at", y="duration", color="nodeid", line_dash="browser", markers=True,
+        hover_data=["git_rev", "headless"], title=f"Test duration per run ({top} slowest tests)",
+        labels={"duration": "seconds", "started_at": "run"},
+    )
+    per_run_steps = steps.groupby(["run_id", "started_at", "browser", "step"], as_index=False)["duration"].median()
+    step_chart = px.line(
+        per_run_steps.sort_values("run_id"), x="started_at", y="duration", color="step", line_dash="browser",
+        markers=True, title="Median page-object step duration per run", labels={"duration": "seconds", "started_at": "run"},
+    )
+    if regressions.empty:
+        table = "<p>No significant slowdowns.</p>"
+    else:
+        table = regressions.to_html(index=False, float_format=lambda v: f"{v:.2f}")
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Test duration trends</title></head><body>"
+        f"<h1>Test duration trends</h1><p>{tests['run_id'].nunique()} runs, {tests['nodeid'].nunique()} tests</p>"
+        f"<h2>Slowdowns</h2>{table}"
+        + test_chart.to_html(full_html=False, include_plotlyjs="cdn")
+        + step_chart.to_html(full_html=False, include_plotlyjs=False)
+        + "</body></html>"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--out", default=REPORT_PATH)
+    parser.add_argument("--browser", help="Only runs with this browser")
+    parser.add_argument("--recent", type=int, default=3, help="Runs compared against the history (default: 3)")
+    parser.add_argument("--min-history", type=int, default=5, help="Earlier runs needed before judging a test (default: 5)")
+    parser.add_argument("--z", type=float, default=3.0, help="z-score threshold (default: 3)")
+    parser.add_argument("--min-slowdown", type=float, default=0.10, help="Minimum relative slowdown (default: 0.10)")
+    parser.add_argument("--min-delta", type=float, default=0.5, help="Minimum slowdown in seconds (default: 0.5)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 when a slowdown is found")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"No duration history at {args.db}; run the suite first")
+        return 0
+    tests, steps = load_frames(args.db)
+    if args.browser:
+        tests, steps = tests[tests["browser"] == args.browser], steps[steps["browser"] == args.browser]
+    regressions = find_regressions(tests, args.recent, args.min_history, args.z, args.min_slowdown, args.min_delta)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as file:
+        file.write(build_report(tests, steps, regressions))
+    for row in regressions.itertuples():
+        print(f"SLOWER: {row.nodeid} [{row.browser}] {row.baseline:.2f}s -> {row.recent:.2f}s "
+              f"(+{row.slowdown:.0%}, z={row.z:.1f}, since {row.since})")
+    print(f"Report written to {args.out}")
+    return 1 if args.fail_on_regression and not regressions.empty else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import subprocess
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Kept outside reports/, which is wiped at the start of every run
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "..", ".perf", "durations.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    git_rev TEXT,
+    browser TEXT,
+    headless INTEGER,
+    workers INTEGER
+);
+CREATE TABLE IF NOT EXISTS test_durations (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    browser TEXT
+);
+CREATE TABLE IF NOT EXISTS step_durations (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    step TEXT NOT NULL,
+    duration REAL NOT NULL,
+    ok INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS test_durations_nodeid ON test_durations(nodeid);
+"""
+
+
+def git_revision(cwd=BASE_DIR):
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=cwd, capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return os.getenv("GITHUB_SHA", "unknown")[:7]
+
+
+class DurationStore:
+    """SQLite history of test and page-object step durations, one row set per run."""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.executescript(SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(test_durations)")}
+        if "browser" not in columns:
+            # stores written before each test was tagged with its own engine: take the run's --browser
+            with self.connection:
+                self.connection.execute("ALTER TABLE test_durations ADD COLUMN browser TEXT")
+                self.connection.execute(
+                    "UPDATE test_durations SET browser = (SELECT browser FROM runs WHERE runs.id = run_id)"
+                )
+
+    def record_run(self, tests, browser, headless, workers=0, git_rev=None, started_at=None):
+        """`tests` maps nodeid -> {"outcome", "duration", "browser", "steps": [{"step", "duration", "ok"}]}.
+
+        `browser` is the run's --browser option; each test is stored with the engine it ran on,
+        None for tests without a browser.
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started_at, git_rev, browser, headless, workers) VALUES (?, ?, ?, ?, ?)",
+                (started_at or time.time(), git_rev or git_revision(), browser, int(bool(headless)), workers),
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO test_durations (run_id, nodeid, outcome, duration, browser) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, nodeid, test["outcome"], test["duration"], test.get("browser"))
+                 for nodeid, test in tests.items()],
+            )
+            self.connection.executemany(
+                "INSERT INTO step_durations (run_id, nodeid, step, duration, ok) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (run_id, nodeid, step["step"], step["duration"], int(step["ok"]))
+                    for nodeid, test in tests.items() for step in test.get("steps", [])
+                ],
+            )
+        return run_id
+
+    def recent_durations(self, runs=10, browser=None, outcome="passed", per_engine=False):
+        """nodeid -> durations of its last `runs` runs (newest first), for passing runs only.
+
+        `browser` keeps the tests that ran on that engine. With `per_engine` the keys are
+        (nodeid, engine), engine None for tests without a browser.
+        """
+        query = (
+            "SELECT t.nodeid, t.browser, t.duration FROM test_durations t JOIN runs r ON r.id = t.run_id "
+            "WHERE t.outcome = ?" + (" AND t.browser = ?" if browser else "") + " ORDER BY r.id DESC"
+        )
+        params = (outcome, browser) if browser else (outcome,)
+        durations = {}
+        for nodeid, engine, duration in self.connection.execute(query, params):
+            values = durations.setdefault((nodeid, engine) if per_engine else nodeid, [])
+            if len(values) < runs:
+                values.append(duration)
+        return durations
+
+    def close(self):
+        self.connection.close()
+
+
+class RunCollector:
+    """Builds the per-test rows for one run from pytest reports (also the ones xdist forwards)."""
+
+    def __init__(self):
+        self.tests = {}
+
+    def add(self, report):
+        test = self.tests.setdefault(report.nodeid, {"outcome": "passed", "duration": 0.0, "steps": []})
+        test["duration"] += report.duration
+        if report.failed:
+            test["outcome"] = "failed"
+        elif report.skipped and test["outcome"] == "passed":
+            test["outcome"] = "skipped"
+        for name, value in report.user_properties:
+            if name == "step_durations":
+                test["steps"].extend(value)
+            elif name == "browser":
+                test["browser"] = value
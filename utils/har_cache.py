@@ -0,0 +1,250 @@
+import base64
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+from playwright.sync_api import Error as PlaywrightError
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HAR_DIR = os.path.join(BASE_DIR, "..", "data", "har")
+# bump when the recorded format or the request key changes; older files are then ignored
+CACHE_VERSION = "1"
+DEFAULT_MAX_AGE_DAYS = 30
+MODES = ("off", "record", "replay")
+
+# not replayed: the body is stored decoded, and cookies stay out of files that are committed
+SKIPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+TEXT_TYPES = ("json", "text", "javascript", "xml", "html")
+
+
+def har_path(nodeid, har_dir=HAR_DIR):
+    """data/har/<module>/<test>.har; the same file for every browser and parameter."""
+    module, _, name = nodeid.split("[")[0].partition("::")
+    return os.path.join(har_dir, os.path.splitext(os.path.basename(module))[0], name.replace("::", ".") + ".har")
+
+
+def request_key(method, url, post_data=None):
+    """Method, path and query: recordings replay against any host the API runs on."""
+    parsed = urlparse(url)
+    path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+    return method.upper(), path, post_data or ""
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def har_entry(method, url, post_data, status, status_text, headers, body, started, elapsed_ms):
+    """One HAR 1.2 entry. Request headers are not kept (they may carry credentials)."""
+    content_type = headers.get("content-type", "")
+    content = {"size": len(body), "mimeType": content_type}
+    if any(kind in content_type for kind in TEXT_TYPES):
+        content["text"] = body.decode("utf-8", errors="replace")
+    else:
+        content["text"] = base64.b64encode(body).decode("ascii")
+        content["encoding"] = "base64"
+    request = {
+        "method": method, "url": url, "httpVersion": "HTTP/1.1", "headers": [], "cookies": [],
+        "queryString": [], "headersSize": -1, "bodySize": len(post_data or ""),
+    }
+    if post_data:
+        request["postData"] = {"mimeType": "application/json", "text": post_data}
+    return {
+        "startedDateTime": started.isoformat(),
+        "time": round(elapsed_ms, 1),
+        "request": request,
+        "response": {
+            "status": status, "statusText": status_text, "httpVersion": "HTTP/1.1", "cookies": [],
+            "headers": [{"name": name, "value": value} for name, value in headers.items()
+                        if name.lower() not in SKIPPED_RESPONSE_HEADERS],
+            "content": content, "redirectURL": "", "headersSize": -1, "bodySize": len(body),
+        },
+        "cache": {},
+        "timings": {"send": 0, "wait": round(elapsed_ms, 1), "receive": 0},
+    }
+
+
+def save_har(path, entries, **info):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    har = {"log": {
+        "version": "1.2",
+        "creator": {"name": "bloggy-har-cache", "version": CACHE_VERSION},
+        "_recorded": _now().isoformat(),
+        **{f"_{name}": value for name, value in info.items()},
+        "entries": entries,
+    }}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(har, file, indent=1)
+    os.replace(tmp_path, path)
+
+
+def load_har(path):
+    """The entries of a recording, or None when it is missing or from another cache version."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            log = json.load(file)["log"]
+    except (OSError, ValueError, KeyError):
+        return None
+    if log.get("creator", {}).get("version") != CACHE_VERSION:
+        return None
+    return log["entries"]
+
+
+class HarStats:
+    """Hits, misses and stale entries of the replayed tests, and what was recorded."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {"hits": 0, "stale": 0, "misses": 0, "unused": 0, "recorded": 0, "tests": 0}
+        self.missing = []
+        self.misses = {}
+
+    def add(self, name, count=1):
+        with self._lock:
+            self.counts[name] += count
+
+    def miss(self, key):
+        with self._lock:
+            self.counts["misses"] += 1
+            label = " ".join(key[:2])
+            self.misses[label] = self.misses.get(label, 0) + 1
+
+    def no_recording(self, path):
+        with self._lock:
+            self.missing.append(path)
+
+    def export(self):
+        with self._lock:
+            return {"counts": dict(self.counts), "missing": list(self.missing), "misses": dict(self.misses)}
+
+    def merge(self, exported):
+        with self._lock:
+            for name, count in exported.get("counts", {}).items():
+                self.counts[name] += count
+            self.missing.extend(exported.get("missing", []))
+            for label, count in exported.get("misses", {}).items():
+                self.misses[label] = self.misses.get(label, 0) + count
+
+    def summary_lines(self, top=10):
+        counts = self.counts
+        if not counts["tests"] and not counts["recorded"]:
+            return []
+        lines = []
+        if counts["recorded"]:
+            lines.append(f"recorded {counts['recorded']} API responses")
+        if counts["tests"]:
+            lines.append(
+                f"{counts['tests']} tests replayed: {counts['hits']} hits ({counts['stale']} stale), "
+                f"{counts['misses']} misses went to the network, {counts['unused']} recorded responses unused"
+            )
+        if counts["stale"]:
+            lines.append("  stale entries are older than --har-max-age; re-record with --har record")
+        for path in sorted(set(self.missing)):
+            lines.append(f"  no recording: {os.path.relpath(path)}")
+        for label, count in sorted(self.misses.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+            lines.append(f"  miss x{count}: {label}")
+        return lines
+
+
+har_stats = HarStats()
+
+
+class HarCache:
+    """Records the API responses of one test, or serves them back from its HAR file.
+
+    Only requests under `api_url` are routed; the frontend and everything
+    the network profile handles are untouched. Repeated requests are served
+    in recorded order, the last response repeating.
+    """
+
+    def __init__(self, path, mode, api_url, max_age_days=DEFAULT_MAX_AGE_DAYS, stats=None, **info):
+        self.path = path
+        self.mode = mode
+        self.pattern = api_url.rstrip("/") + "/**"
+        self.max_age = timedelta(days=max_age_days)
+        self.stats = stats if stats is not None else har_stats
+        self.info = info
+        self.recorded = []
+        self.entries = {}
+        self.served = {}
+        if mode == "replay":
+            entries = load_har(path)
+            if entries is None:
+                self.stats.no_recording(path)
+            for entry in entries or []:
+                request = entry["request"]
+                key = request_key(request["method"], request["url"], request.get("postData", {}).get("text"))
+                self.entries.setdefault(key, []).append(entry)
+
+    def attach(self, context):
+        self._handler = self._record if self.mode == "record" else self._replay
+        context.route(self.pattern, self._handler)
+        if self.mode == "replay":
+            self.stats.add("tests")
+        return self
+
+    def detach(self, context, save=True):
+        """Unroute; a recording is written only when `save` (the test passed)."""
+        context.unroute(self.pattern, self._handler)
+        if self.mode == "record" and save and self.recorded:
+            save_har(self.path, self.recorded, **self.info)
+            self.stats.add("recorded", len(self.recorded))
+        if self.mode == "replay":
+            self.stats.add("unused", sum(max(len(entries) - self.served.get(key, 0), 0)
+                                         for key, entries in self.entries.items()))
+
+    def is_stale(self, entry):
+        try:
+            started = datetime.fromisoformat(entry["startedDateTime"])
+        except (KeyError, ValueError):
+            return True
+        return _now() - started > self.max_age
+
+    def lookup(self, method, url, post_data=None):
+        """The recorded entry for a request (counted as hit, stale or miss), or None."""
+        key = request_key(method, url, post_data)
+        entries = self.entries.get(key)
+        if not entries:
+            self.stats.miss(key)
+            return None
+        index = self.served.get(key, 0)
+        self.served[key] = index + 1
+        entry = entries[min(index, len(entries) - 1)]
+        self.stats.add("hits")
+        if self.is_stale(entry):
+            self.stats.add("stale")
+        return entry
+
+    def _replay(self, route):
+        request = route.request
+        entry = self.lookup(request.method, request.url, request.post_data)
+        if entry is None:
+            route.fallback()
+            return
+        response = entry["response"]
+        content = response["content"]
+        body = content.get("text", "")
+        body = base64.b64decode(body) if content.get("encoding") == "base64" else body.encode("utf-8")
+        route.fulfill(
+            status=response["status"],
+            headers={header["name"]: header["value"] for header in response["headers"]},
+            body=body,
+        )
+
+    def _record(self, route):
+        request = route.request
+        started = _now()
+        try:
+            response = route.fetch()
+            body = response.body()
+        except PlaywrightError:
+            # the browser reports the failure itself
+            route.fallback()
+            return
+        elapsed_ms = (_now() - started).total_seconds() * 1000
+        self.recorded.append(har_entry(request.method, request.url, request.post_data, response.status,
+                                       response.status_text, response.headers, body, started, elapsed_ms))
+        route.fulfill(response=response)
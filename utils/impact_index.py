@@ -0,0 +1,374 @@
+"""Select the tests a change can affect, from a static POM/locator usage index.
+
+The index is built from the AST of the test modules (and conftest.py), the
+page objects in POM/ and the locator classes in locators/. Every test maps
+to the page-object methods, page-object attributes, locator constants,
+fixtures and helpers it reaches. Changed lines from `git diff` are mapped
+to the same symbols, so a one-selector change selects only the tests that
+can reach that selector.
+
+    python utils/impact_index.py --since origin/main            # affected test ids
+    python utils/impact_index.py --since HEAD~1 --explain       # with the reasons
+
+Changes the index cannot attribute (other Python files, requirements,
+pytest.ini, module-level code) select every test.
+"""
+import argparse
+import ast
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+CACHE_PATH = os.path.join(ROOT, ".cache", "impact_index.json")
+CACHE_VERSION = 2
+
+INDEXED_GLOBS = ("tests/test*.py", "tests/conftest.py", "POM/*.py", "locators/*.py")
+# Changes to these never affect test behaviour (docs, generated reports)
+IGNORED_GLOBS = ("*.md", ".gitignore", "LICENSE*", "reports/*")
+ALL = "*"
+
+
+def _kind(path):
+    if path.startswith("locators/"):
+        return "locators"
+    if path.startswith("POM/"):
+        return "pom"
+    return "tests"
+
+
+def _span(node):
+    start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+    return [start, node.end_lineno]
+
+
+def _locator_refs(node):
+    """`SomethingLocators.NAME` references below `node`."""
+    return sorted({
+        f"{n.value.id}.{n.attr}" for n in ast.walk(node)
+        if isinstance(n, ast.Attribute) and isinstance(n.value, ast.Name) and n.value.id.endswith("Locators")
+    })
+
+
+def _self_refs(node):
+    """(attributes read from self, methods called on self)."""
+    attrs, calls = set(), set()
+    for n in ast.walk(node):
+        if isinstance(n, ast.Attribute) and isinstance(n.value, ast.Name) and n.value.id == "self":
+            attrs.add(n.attr)
+        if isinstance(n, ast.Call) and isinstance(n.func, ast.Attribute) and isinstance(n.func.value, ast.Name) \
+                and n.func.value.id == "self":
+            calls.add(n.func.attr)
+    return sorted(attrs), sorted(calls)
+
+
+def file_facts(source, path):
+    """The per-file part of the index; cached by content hash."""
+    tree = ast.parse(source)
+    kind = _kind(path)
+    facts = {"kind": kind, "symbols": {}}
+    if kind == "locators":
+        for cls in (n for n in tree.body if isinstance(n, ast.ClassDef)):
+            for stmt in cls.body:
+                if isinstance(stmt, ast.Assign):
+                    # constants built from other constants of the class, e.g. candidate lists
+                    refs = sorted({f"{cls.name}.{n.id}" for n in ast.walk(stmt.value) if isinstance(n, ast.Name)})
+                    for target in stmt.targets:
+                        if isinstance(target, ast.Name):
+                            facts["symbols"][f"{cls.name}.{target.id}"] = {"lines": _span(stmt), "refs": refs}
+        return facts
+    if kind == "pom":
+        for cls in (n for n in tree.body if isinstance(n, ast.ClassDef)):
+            for fn in (n for n in cls.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))):
+                if fn.name == "__init__":
+                    # each `self.x = page.locator(...)` is its own symbol
+                    for stmt in fn.body:
+                        if isinstance(stmt, ast.Assign):
+                            for target in stmt.targets:
+                                if isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name) \
+                                        and target.value.id == "self":
+                                    facts["symbols"][f"{cls.name}.{target.attr}"] = {
+                                        "lines": _span(stmt), "type": "attr", "locators": _locator_refs(stmt),
+                                    }
+                    continue
+                attrs, calls = _self_refs(fn)
+                facts["symbols"][f"{cls.name}.{fn.name}"] = {
+                    "lines": _span(fn), "type": "method", "locators": _locator_refs(fn),
+                    "self_attrs": attrs, "self_calls": calls,
+                }
+        return facts
+    for fn in (n for n in tree.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))):
+        fixture = any("fixture" in ast.dump(d) for d in fn.decorator_list)
+        facts["symbols"][fn.name] = {
+            "lines": _span(fn),
+            "type": "test" if fn.name.startswith("test") else ("fixture" if fixture else "function"),
+            "args": [a.arg for a in fn.args.args],
+            "names": sorted({n.id for n in ast.walk(fn) if isinstance(n, ast.Name)}),
+            "attrs": sorted({n.attr for n in ast.walk(fn) if isinstance(n, ast.Attribute)}),
+            "locators": _locator_refs(fn),
+        }
+    return facts
+
+
+class ImpactIndex:
+    """Per-file facts (incrementally cached) and the test -> symbols closure built from them."""
+
+    def __init__(self, root=ROOT, cache_path=CACHE_PATH):
+        self.root = root
+        self.cache_path = cache_path
+        self.files = {}
+        self.rebuilt = []
+
+    def _paths(self):
+        paths = set()
+        for pattern in INDEXED_GLOBS:
+            paths.update(os.path.relpath(p, self.root).replace(os.sep, "/") for p in glob.glob(os.path.join(self.root, pattern)))
+        return sorted(paths)
+
+    def build(self):
+        """Load the cache and re-parse only files whose content changed."""
+        try:
+            with open(self.cache_path, "r") as file:
+                cache = json.load(file)
+            cached = cache["files"] if cache.get("version") == CACHE_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            cached = {}
+        self.files, self.rebuilt = {}, []
+        for path in self._paths():
+            with open(os.path.join(self.root, path), "rb") as file:
+                data = file.read()
+            sha = hashlib.sha1(data).hexdigest()
+            entry = cached.get(path)
+            if not entry or entry["sha"] != sha:
+                entry = {"sha": sha, "facts": file_facts(data.decode("utf-8"), path)}
+                self.rebuilt.append(path)
+            self.files[path] = entry
+        if self.rebuilt or set(cached) != set(self.files):
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump({"version": CACHE_VERSION, "files": self.files}, file)
+            os.replace(tmp_path, self.cache_path)
+        return self
+
+    def _facts(self, kind):
+        return {path: entry["facts"] for path, entry in self.files.items() if entry["facts"]["kind"] == kind}
+
+    def test_symbols(self):
+        """{"tests/x.py::test_name": {symbol keys it can reach}}; symbol keys are "path::qualname"."""
+        locator_files = {
+            qualname: path for path, facts in self._facts("locators").items() for qualname in facts["symbols"]
+        }
+        pom = self._facts("pom")
+        pom_by_name = {}
+        for path, facts in pom.items():
+            for qualname, info in facts["symbols"].items():
+                pom_by_name.setdefault(qualname.split(".", 1)[1], []).append((path, qualname, info))
+
+        locator_refs = {
+            qualname: info["refs"] for facts in self._facts("locators").values() for qualname, info in facts["symbols"].items()
+        }
+
+        def locator_keys(refs):
+            keys, pending = set(), list(refs)
+            while pending:
+                ref = pending.pop()
+                if ref in locator_files and f"{locator_files[ref]}::{ref}" not in keys:
+                    keys.add(f"{locator_files[ref]}::{ref}")
+                    pending.extend(locator_refs[ref])
+            return keys
+
+        pom_closure = {}
+
+        def reach_pom(path, qualname, info, seen=None):
+            key = f"{path}::{qualname}"
+            if key in pom_closure:
+                return pom_closure[key]
+            seen = seen or set()
+            if key in seen:
+                return {key}
+            seen.add(key)
+            symbols = {key} | locator_keys(info.get("locators", []))
+            cls = qualname.split(".", 1)[0]
+            own = pom[path]["symbols"]
+            for name in info.get("self_attrs", []) + info.get("self_calls", []):
+                target = own.get(f"{cls}.{name}")
+                if target is not None:
+                    symbols |= reach_pom(path, f"{cls}.{name}", target, seen)
+            pom_closure[key] = symbols
+            return symbols
+
+        test_files = self._facts("tests")
+        conftest = test_files.get("tests/conftest.py", {"symbols": {}})["symbols"]
+
+        def reach_function(path, name, seen):
+            key = f"{path}::{name}"
+            if key in seen:
+                return set()
+            seen.add(key)
+            info = test_files[path]["symbols"][name]
+            symbols = {key} | locator_keys(info["locators"])
+            for attr in info["attrs"]:
+                for pom_path, qualname, pom_info in pom_by_name.get(attr, []):
+                    symbols |= reach_pom(pom_path, qualname, pom_info)
+            own = test_files[path]["symbols"]
+            for other in info["names"] + info["args"]:
+                if other in own and other != name:
+                    symbols |= reach_function(path, other, seen)
+                elif other in conftest and conftest[other]["type"] != "test":
+                    symbols |= reach_function("tests/conftest.py", other, seen)
+            return symbols
+
+        return {
+            f"{path}::{name}": reach_function(path, name, set())
+            for path, facts in test_files.items()
+            for name, info in facts["symbols"].items() if info["type"] == "test"
+        }
+
+
+# --- git diff -> changed symbols ------------------------------------------------
+
+HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def parse_diff(diff_text):
+    """{path: {"old": [(line, text)], "new": [(line, text)], "old_path": path}} from `git diff -U0`."""
+    changes, current = {}, None
+    old_line = new_line = 0
+    for line in diff_text.splitlines():
+        if line.startswith("diff --git "):
+            current = None
+        elif line.startswith("--- "):
+            old_path = None if line[4:] == "/dev/null" else line[6:]
+        elif line.startswith("+++ "):
+            new_path = None if line[4:] == "/dev/null" else line[6:]
+            path = new_path or old_path
+            current = changes.setdefault(path, {"old": [], "new": [], "old_path": old_path})
+        elif current is not None and line.startswith("@@"):
+            match = HUNK_RE.match(line)
+            old_line, new_line = int(match.group(1)), int(match.group(3))
+        elif current is not None and line.startswith("-"):
+            current["old"].append((old_line, line[1:]))
+            old_line += 1
+        elif current is not None and line.startswith("+"):
+            current["new"].append((new_line, line[1:]))
+            new_line += 1
+    return changes
+
+
+def _symbol_at(facts, line):
+    for qualname, info in facts["symbols"].items():
+        start, end = info["lines"]
+        if start <= line <= end:
+            return qualname
+    return None
+
+
+def changed_symbols(changes, new_facts, old_facts):
+    """Symbol keys touched by `changes`; ALL when a change cannot be attributed.
+
+    `new_facts`/`old_facts` map path -> file facts of the working tree and
+    of the base revision (None where the file does not exist).
+    """
+    symbols, reasons = set(), {}
+    for path, change in changes.items():
+        if any(fnmatch.fnmatch(path, pattern) for pattern in IGNORED_GLOBS):
+            continue
+        indexed = any(fnmatch.fnmatch(path, pattern) for pattern in INDEXED_GLOBS)
+        if not indexed:
+            return {ALL}, {ALL: f"{path} is not covered by the index"}
+        for side, facts in (("new", new_facts.get(path)), ("old", old_facts.get(change["old_path"] or path))):
+            for line, text in change[side]:
+                if not text.strip() or text.strip().startswith("#"):
+                    continue
+                qualname = _symbol_at(facts, line) if facts else None
+                if qualname is None:
+                    if facts is None and side == "old":
+                        continue  # new file: the new side covers it
+                    if facts is None or facts["kind"] != "tests":
+                        return {ALL}, {ALL: f"module-level change in {path}:{line}"}
+                    # module-level change in a test module: every test in it
+                    key = f"{path}::{ALL}"
+                else:
+                    key = f"{path}::{qualname}"
+                symbols.add(key)
+                reasons.setdefault(key, f"{path}:{line}")
+    return symbols, reasons
+
+
+def affected_tests(test_symbols, symbols):
+    if ALL in symbols:
+        return sorted(test_symbols)
+    whole_files = {key.split("::")[0] for key in symbols if key.endswith(f"::{ALL}")}
+    conftest_wide = "tests/conftest.py" in whole_files
+    return sorted(
+        test for test, reached in test_symbols.items()
+        if conftest_wide or test.split("::")[0] in whole_files or reached & symbols
+    )
+
+
+def _git(*args, root=ROOT):
+    return subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, check=True).stdout
+
+
+def select_since(ref, root=ROOT, cache_path=CACHE_PATH):
+    """(affected test ids, all test ids, reasons) for the working tree compared with `ref`."""
+    index = ImpactIndex(root, cache_path).build()
+    changes = parse_diff(_git("diff", "-U0", "--no-color", "--no-ext-diff", ref, root=root))
+    for path in _git("ls-files", "--others", "--exclude-standard", root=root).splitlines():
+        with open(os.path.join(root, path), "r", encoding="utf-8", errors="replace") as file:
+            changes[path] = {"old": [], "new": list(enumerate(file.read().splitlines(), 1)), "old_path": None}
+    new_facts = {path: entry["facts"] for path, entry in index.files.items()}
+    old_facts = {}
+    for path, change in changes.items():
+        old_path = change["old_path"]
+        if old_path and old_path.endswith(".py") and any(fnmatch.fnmatch(old_path, p) for p in INDEXED_GLOBS):
+            try:
+                old_facts[old_path] = file_facts(_git("show", f"{ref}:{old_path}", root=root), old_path)
+            except (subprocess.CalledProcessError, SyntaxError):
+                old_facts[old_path] = None
+    symbols, reasons = changed_symbols(changes, new_facts, old_facts)
+    test_symbols = index.test_symbols()
+    unreached = [key for key in symbols - set().union(*test_symbols.values()) if key.startswith(("POM/", "locators/"))]
+    used_elsewhere = _used_outside_index(unreached, root)
+    if used_elsewhere:
+        symbols, reasons = {ALL}, {ALL: f"{used_elsewhere} is used outside the indexed files"}
+    return affected_tests(test_symbols, symbols), sorted(test_symbols), reasons
+
+
+def _used_outside_index(keys, root=ROOT):
+    """First of `keys` whose name appears in a non-indexed module (e.g. AsyncLoginPage.open in utils/)."""
+    sources = []
+    for path in glob.glob(os.path.join(root, "utils", "*.py")):
+        with open(path, "r", encoding="utf-8") as file:
+            sources.append(file.read())
+    for key in sorted(keys):
+        name = key.rsplit(".", 1)[-1]
+        if any(re.search(rf"\b{re.escape(name)}\b", source) for source in sources):
+            return key
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", required=True, help="Git ref to diff the working tree against")
+    parser.add_argument("--explain", action="store_true", help="Print the changed symbols behind the selection")
+    args = parser.parse_args(argv)
+    affected, all_tests, reasons = select_since(args.since)
+    if args.explain:
+        for symbol, where in sorted(reasons.items()):
+            print(f"changed: {symbol} ({where})")
+        print(f"{len(affected)} of {len(all_tests)} tests affected")
+    for test in affected:
+        print(test)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
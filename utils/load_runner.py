@@ -0,0 +1,324 @@
+"""Replay the testblogging.py journeys as concurrent virtual users.
+
+Browser journeys share one browser: every virtual user gets a lightweight
+context of its own. HTTP journeys call the backend API directly through
+BlogFactory and are used where the page adds nothing (and for every
+journey with --mode http).
+
+    python utils/load_runner.py --users 20 --ramp-up 10 --duration 60
+    python utils/load_runner.py --users 100 --mode http --journeys search,admin_crud --think-time 0.5
+
+Writes load_report.json and load_report.html with throughput and
+p50/p95/p99 latency per step.
+"""
+import argparse
+import asyncio
+import html
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from dotenv import load_dotenv
+from utils.browser_pool import CONTEXT_OPTIONS
+from utils.data_factory import BlogFactory
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_DIR = os.path.join(BASE_DIR, "..", "reports", "load")
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, p):
+    """Nearest-rank percentile; None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+class LoadStats:
+    """Latency samples and errors per journey step."""
+
+    def __init__(self):
+        self.steps = {}
+        self.journeys = {}
+        self.started = None
+        self.finished = None
+
+    def record(self, step, elapsed, error=None):
+        entry = self.steps.setdefault(step, {"latencies": [], "errors": []})
+        if error is None:
+            entry["latencies"].append(elapsed)
+        else:
+            entry["errors"].append(error)
+
+    def record_journey(self, journey, ok):
+        entry = self.journeys.setdefault(journey, {"completed": 0, "failed": 0})
+        entry["completed" if ok else "failed"] += 1
+
+    def report(self, settings=None):
+        wall = (self.finished or time.perf_counter()) - self.started if self.started else 0.0
+        steps = {}
+        for step, entry in self.steps.items():
+            latencies = entry["latencies"]
+            steps[step] = {
+                "count": len(latencies),
+                "errors": len(entry["errors"]),
+                "throughput": len(latencies) / wall if wall else 0.0,
+                "mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else None,
+                **{
+                    f"p{p}_ms": percentile(latencies, p) * 1000 if latencies else None
+                    for p in PERCENTILES
+                },
+                "sample_errors": sorted(set(entry["errors"]))[:5],
+            }
+        completed = sum(j["completed"] for j in self.journeys.values())
+        return {
+            "settings": settings or {},
+            "wall_s": wall,
+            "journeys": self.journeys,
+            "journeys_per_s": completed / wall if wall else 0.0,
+            "steps": steps,
+        }
+
+
+class VirtualUser:
+    """State of one simulated user: its page (browser mode) and API client."""
+
+    def __init__(self, index, login_page=None, api=None, executor=None):
+        self.index = index
+        self.login_page = login_page
+        self.api = api
+        self.executor = executor
+        self.data = {}
+
+    async def call(self, fn, *args):
+        """Run a blocking API call without holding up the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+
+# --- journeys --------------------------------------------------------------
+# Each journey is a list of (step name, async fn(user)), one list per mode.
+
+async def _open(user):
+    await user.login_page.open(user.data["url"])
+
+
+async def _search(user):
+    await user.login_page.search_and_verify_blog("Getting Started with TypeScript")
+
+
+async def _readmore(user):
+    await user.login_page.click_readmore_button()
+    await user.login_page.wait.for_dom_settled("load_readmore")
+
+
+async def _ui_login(user):
+    await user.login_page.login_user()
+    await user.login_page.wait.for_element(user.login_page.logout_button.first, "load_login")
+
+
+async def _ui_logout(user):
+    await user.login_page.logout_user()
+
+
+async def _api_login(user):
+    await user.call(user.api.login)
+
+
+async def _api_list(user):
+    user.data["blogs"] = await user.call(user.api.list_blogs)
+
+
+async def _api_get_first(user):
+    blogs = user.data.get("blogs") or []
+    if blogs:
+        await user.call(user.api.get, blogs[0][user.api.api["id_field"]])
+
+
+async def _api_create(user):
+    blog = await user.call(user.api.create, f"Load test post {user.index}-{random.randrange(10**6)}")
+    user.data["created"] = blog[user.api.api["id_field"]]
+
+
+async def _api_delete(user):
+    blog_id = user.data.pop("created")
+    await user.call(user.api.delete, blog_id)
+    user.api.forget(blog_id)
+
+
+JOURNEYS = {
+    "search": {
+        "browser": [("open", _open), ("search", _search)],
+        "http": [("list_blogs", _api_list)],
+    },
+    "readmore": {
+        "browser": [("open", _open), ("search", _search), ("read_more", _readmore)],
+        "http": [("list_blogs", _api_list), ("get_blog", _api_get_first)],
+    },
+    "admin_login": {
+        "browser": [("open", _open), ("ui_login", _ui_login), ("ui_logout", _ui_logout)],
+        "http": [("api_login", _api_login)],
+    },
+    # Creating and deleting through the UI would measure the admin form, not
+    # the backend, so this journey is HTTP-only in both modes.
+    "admin_crud": {
+        "http": [("api_login", _api_login), ("create_post", _api_create), ("delete_post", _api_delete)],
+    },
+}
+
+
+def journey_steps(journeys, name, mode):
+    variants = journeys[name]
+    if mode == "browser" and "browser" in variants:
+        return "browser", variants["browser"]
+    return "http", variants["http"]
+
+
+async def run_user(user, journey_names, journeys, stats, mode, deadline, think_time):
+    """Loop over the journeys until `deadline`, recording every step."""
+    turn = user.index
+    while time.perf_counter() < deadline:
+        name = journey_names[turn % len(journey_names)]
+        turn += 1
+        _, steps = journey_steps(journeys, name, mode)
+        ok = True
+        for step, fn in steps:
+            start = time.perf_counter()
+            try:
+                await fn(user)
+                stats.record(f"{name}.{step}", time.perf_counter() - start)
+            except Exception as e:
+                stats.record(f"{name}.{step}", time.perf_counter() - start, str(e).splitlines()[0] if str(e) else type(e).__name__)
+                ok = False
+                break
+            if think_time:
+                await asyncio.sleep(random.uniform(0.5, 1.5) * think_time)
+        stats.record_journey(name, ok)
+
+
+async def run_load(users, ramp_up, duration, think_time, journey_names, mode="browser", url=None,
+                   browser_name="chromium", headless=True, journeys=JOURNEYS, api_factory=None):
+    """Start `users` virtual users spread over `ramp_up` seconds; stop starting journeys after `duration`."""
+    stats = LoadStats()
+    needs_browser = any(journey_steps(journeys, name, mode)[0] == "browser" for name in journey_names)
+    api_factory = api_factory or BlogFactory.from_config
+    executor = ThreadPoolExecutor(max_workers=max(users, 1))
+    playwright = browser = None
+    if needs_browser:
+        from playwright.async_api import async_playwright
+        from POM.async_login import AsyncLoginPage
+        playwright = await async_playwright().start()
+        browser = await getattr(playwright, browser_name).launch(headless=headless)
+
+    async def start_user(index):
+        await asyncio.sleep(ramp_up * index / users if users else 0)
+        context = login_page = None
+        if browser:
+            context = await browser.new_context(**CONTEXT_OPTIONS)
+            login_page = AsyncLoginPage(await context.new_page())
+        api = api_factory(pool_size=2)
+        user = VirtualUser(index, login_page, api, executor)
+        user.data["url"] = url
+        try:
+            await run_user(user, journey_names, journeys, stats, mode, deadline, think_time)
+        finally:
+            if context:
+                await context.close()
+            await user.call(api.cleanup)
+            api.close()
+
+    stats.started = time.perf_counter()
+    deadline = stats.started + ramp_up + duration
+    try:
+        await asyncio.gather(*(start_user(i) for i in range(users)))
+    finally:
+        stats.finished = time.perf_counter()
+        if browser:
+            await browser.close()
+            await playwright.stop()
+        executor.shutdown()
+    return stats
+
+
+def write_reports(report, out_dir=REPORT_DIR):
+    os.makedirs(out_dir, exist_ok=True)
+    json_path = os.path.join(out_dir, "load_report.json")
+    with open(json_path, "w") as file:
+        json.dump(report, file, indent=2)
+    html_path = os.path.join(out_dir, "load_report.html")
+    with open(html_path, "w", encoding="utf-8") as file:
+        file.write(render_html(report))
+    return json_path, html_path
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.0f}"
+
+
+def render_html(report):
+    rows = "".join(
+        f"<tr><td>{html.escape(step)}</td><td>{s['count']}</td><td>{s['errors']}</td>"
+        f"<td>{s['throughput']:.2f}</td><td>{_ms(s['mean_ms'])}</td>"
+        + "".join(f"<td>{_ms(s[f'p{p}_ms'])}</td>" for p in PERCENTILES)
+        + f"<td>{html.escape('; '.join(s['sample_errors']))}</td></tr>"
+        for step, s in sorted(report["steps"].items())
+    )
+    journeys = ", ".join(
+        f"{html.escape(name)}: {j['completed']} ok / {j['failed']} failed" for name, j in sorted(report["journeys"].items())
+    )
+    settings = html.escape(json.dumps(report["settings"]))
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Bloggy load report</title>
+<style>body{{font-family:sans-serif}} table{{border-collapse:collapse}} td,th{{border:1px solid #ccc;padding:4px 8px;text-align:right}} td:first-child,td:last-child{{text-align:left}}</style>
+</head><body>
+<h1>Bloggy load report</h1>
+<p>Settings: <code>{settings}</code></p>
+<p>Wall time {report['wall_s']:.1f}s, {report['journeys_per_s']:.2f} journeys/s. {journeys}</p>
+<table>
+<tr><th>step</th><th>ok</th><th>errors</th><th>per s</th><th>mean ms</th>{''.join(f'<th>p{p} ms</th>' for p in PERCENTILES)}<th>errors seen</th></tr>
+{rows}
+</table>
+</body></html>
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users (default: 10)")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds over which users are started (default: 5)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of full load after ramp-up (default: 60)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean pause between steps in seconds (default: 1)")
+    parser.add_argument("--journeys", default=",".join(JOURNEYS), help=f"Comma separated, from {', '.join(JOURNEYS)}")
+    parser.add_argument("--mode", default="browser", choices=["browser", "http"], help="http runs every journey without a browser")
+    parser.add_argument("--browser", default="chromium", choices=["chromium", "firefox", "webkit"])
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--out", default=REPORT_DIR, help="Report folder (default: reports/load)")
+    args = parser.parse_args(argv)
+
+    journey_names = [name.strip() for name in args.journeys.split(",") if name.strip()]
+    unknown = sorted(set(journey_names) - set(JOURNEYS))
+    if unknown:
+        parser.error(f"unknown journeys: {', '.join(unknown)}")
+
+    load_dotenv()
+    stats = asyncio.run(run_load(
+        args.users, args.ramp_up, args.duration, args.think_time, journey_names,
+        mode=args.mode, url=os.getenv("LOCAL_SETUP_URL"), browser_name=args.browser, headless=not args.headed,
+    ))
+    settings = {k: v for k, v in vars(args).items() if k != "out"}
+    report = stats.report(settings)
+    for step, s in sorted(report["steps"].items()):
+        print(f"{step:<28} {s['count']:>6} ok {s['errors']:>4} err  p50 {_ms(s['p50_ms']):>6}  p95 {_ms(s['p95_ms']):>6}  p99 {_ms(s['p99_ms']):>6} ms")
+    json_path, html_path = write_reports(report, args.out)
+    print(f"Reports: {json_path}, {html_path}")
+    failed = sum(j["failed"] for j in report["journeys"].values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""Resolve page-object elements from an ordered list of candidate selectors.
+
+A candidate is a tuple: ("test-id", id), ("role", role[, name]),
+("label", text), ("placeholder", text), ("text", text), ("css", selector)
+or ("xpath", selector). The resolver waits once for *any* candidate to
+appear, then takes the first one that matches. The candidate that
+matched last time, per app build, page and element, is kept in
+`.cache/locator_resolution.json` and tried first. A selector broken by a
+UI change therefore costs one wait, not a timeout per candidate. Every
+fallback is logged and counted for the terminal summary.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from urllib.parse import urlparse
+
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from utils.waits import DEFAULT_TIMEOUT
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, "..", ".cache", "locator_resolution.json")
+# builds kept in the cache file; older ones are dropped when it is written
+KEEP_BUILDS = 5
+# the hashed bundle names of a production build change with every release
+BUILD_JS = """() => Array.from(document.querySelectorAll("script[src], link[rel='stylesheet'][href]"),
+                                node => node.src || node.href).join("\\n")"""
+
+logger = logging.getLogger(__name__)
+
+
+def describe(candidate):
+    strategy, value, *rest = candidate
+    return f"{strategy}={value}" + (f"[name={rest[0]}]" if rest else "")
+
+
+def xpath_literal(text):
+    """`text` as an XPath 1.0 string literal; XPath has no escapes, so text with both quotes becomes a concat()."""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in text.split("'")) + ")"
+
+
+def fill(candidate, params):
+    """The candidate with `{param}` placeholders filled in; an XPath gets them as quoted literals."""
+    if not params:
+        return candidate
+    if candidate[0] == "xpath":
+        params = {name: xpath_literal(str(value)) for name, value in params.items()}
+    return tuple(part.format(**params) if isinstance(part, str) else part for part in candidate)
+
+
+def candidate_locator(page, candidate):
+    strategy, value, *rest = candidate
+    if strategy == "test-id":
+        return page.get_by_test_id(value)
+    if strategy == "role":
+        return page.get_by_role(value, name=rest[0], exact=True) if rest else page.get_by_role(value)
+    if strategy == "label":
+        return page.get_by_label(value, exact=True)
+    if strategy == "placeholder":
+        return page.get_by_placeholder(value, exact=True)
+    if strategy == "text":
+        return page.get_by_text(value, exact=True)
+    if strategy == "css":
+        return page.locator(f"css={value}")
+    if strategy == "xpath":
+        return page.locator(f"xpath={value}")
+    raise ValueError(f"Unknown locator strategy '{strategy}'")
+
+
+def page_key(url):
+    """Path and hash route of a URL without queries, ids replaced, so every blog's page shares one entry."""
+    parsed = urlparse(url)
+    route = parsed.fragment.split("?")[0]
+    return re.sub(r"/\d+(?=/|$)", "/:id", parsed.path + (f"#{route}" if route else ""))
+
+
+def build_key(sources):
+    """APP_BUILD from the environment, or a hash of the app's script and stylesheet URLs."""
+    return os.getenv("APP_BUILD") or hashlib.sha256(sources.encode("utf-8")).hexdigest()[:12]
+
+
+class ResolutionCache:
+    """The candidate that last matched, per build, page and element; shared by all workers through one file."""
+
+    def __init__(self, path=CACHE_PATH, keep_builds=KEEP_BUILDS):
+        self.path = path
+        self.keep_builds = keep_builds
+        self._lock = threading.Lock()
+        self._builds = None
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, build, page, element):
+        with self._lock:
+            if self._builds is None:
+                self._builds = self._read()
+            return self._builds.get(build, {}).get(page, {}).get(element)
+
+    def put(self, build, page, element, candidate):
+        """Remember `candidate` and write the file, merged with what other workers wrote meanwhile."""
+        with self._lock:
+            builds = self._read()
+            builds.setdefault(build, {}).setdefault(page, {})[element] = candidate
+            # dicts keep insertion order: move this build to the end, drop the oldest
+            builds[build] = builds.pop(build)
+            for stale in list(builds)[:-self.keep_builds]:
+                del builds[stale]
+            self._builds = builds
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(builds, file, indent=1)
+            os.replace(tmp_path, self.path)
+
+
+class HealingStats:
+    """Resolutions, fallbacks per element and candidate, and elements nothing matched."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.resolved = 0
+        self.fallbacks = {}
+        self.misses = {}
+
+    def add(self, element, candidate=None, fallback=False):
+        with self._lock:
+            self.resolved += 1
+            if fallback:
+                label = f"{element} -> {candidate}"
+                self.fallbacks[label] = self.fallbacks.get(label, 0) + 1
+
+    def miss(self, element):
+        with self._lock:
+            self.misses[element] = self.misses.get(element, 0) + 1
+
+    def export(self):
+        with self._lock:
+            return {"resolved": self.resolved, "fallbacks": dict(self.fallbacks), "misses": dict(self.misses)}
+
+    def merge(self, exported):
+        with self._lock:
+            self.resolved += exported.get("resolved", 0)
+            for label, count in exported.get("fallbacks", {}).items():
+                self.fallbacks[label] = self.fallbacks.get(label, 0) + count
+            for element, count in exported.get("misses", {}).items():
+                self.misses[element] = self.misses.get(element, 0) + count
+
+    def summary_lines(self):
+        if not self.fallbacks and not self.misses:
+            return []
+        lines = [f"{self.resolved} elements resolved, {sum(self.fallbacks.values())} through a fallback candidate"]
+        for label, count in sorted(self.fallbacks.items(), key=lambda kv: kv[1], reverse=True):
+            lines.append(f"  fallback x{count}: {label}")
+        for element, count in sorted(self.misses.items()):
+            lines.append(f"  no candidate matched x{count}: {element}")
+        return lines
+
+
+healing_stats = HealingStats()
+resolution_cache = ResolutionCache()
+
+
+class LocatorResolver:
+    """Hands out `HealingLocator`s for one page object; `name` is the page object's class."""
+
+    def __init__(self, page, name, cache=None, stats=None, timeout=DEFAULT_TIMEOUT):
+        self.page = page
+        self.name = name
+        self.cache = cache if cache is not None else resolution_cache
+        self.stats = stats if stats is not None else healing_stats
+        self.timeout = timeout
+        self._build = None
+
+    def __call__(self, element, candidates, **params):
+        return HealingLocator(self, element, candidates, params)
+
+    def build(self):
+        if self._build is None:
+            try:
+                self._build = build_key(self.page.evaluate(BUILD_JS))
+            except PlaywrightError:
+                # navigating; try again on the next resolve
+                return build_key("")
+        return self._build
+
+    def _order(self, element, candidates, build, page):
+        cached = self.cache.get(build, page, f"{self.name}.{element}")
+        return sorted(candidates, key=lambda candidate: describe(candidate) != cached)
+
+    def _any_of(self, locators):
+        any_of = locators[0]
+        for locator in locators[1:]:
+            any_of = any_of.or_(locator)
+        return any_of
+
+    def _pick(self, element, candidates, ordered, counts, build, page):
+        """The first candidate that matched; logs and records a fallback from the declared first choice."""
+        chosen = next((candidate for candidate, count in zip(ordered, counts) if count), ordered[0])
+        key = f"{self.name}.{element}"
+        if describe(chosen) != self.cache.get(build, page, key):
+            self.cache.put(build, page, key, describe(chosen))
+        fallback = chosen != candidates[0]
+        if fallback:
+            logger.warning("%s on %s: %s did not match, resolved with %s",
+                           key, page, describe(candidates[0]), describe(chosen))
+        self.stats.add(key, describe(chosen), fallback)
+        return ordered.index(chosen)
+
+    def _missed(self, element, candidates, page):
+        key = f"{self.name}.{element}"
+        self.stats.miss(key)
+        tried = ", ".join(describe(candidate) for candidate in candidates)
+        logger.warning("%s on %s: no candidate matched (%s)", key, page, tried)
+        return f"{key}: no candidate matched on {page} within {self.timeout} ms (tried {tried})"
+
+    def resolve(self, element, candidates, params=None):
+        build, page = self.build(), page_key(self.page.url)
+        ordered = self._order(element, candidates, build, page)
+        locators = [candidate_locator(self.page, fill(candidate, params)) for candidate in ordered]
+        try:
+            self._any_of(locators).first.wait_for(state="attached", timeout=self.timeout)
+        except PlaywrightTimeoutError:
+            raise PlaywrightTimeoutError(self._missed(element, candidates, page)) from None
+        counts = [locator.count() for locator in locators]
+        return locators[self._pick(element, candidates, ordered, counts, build, page)]
+
+
+class HealingLocator:
+    """Stands in for a Playwright Locator; the element is resolved on first use and kept."""
+
+    def __init__(self, resolver, element, candidates, params=None):
+        self._resolver = resolver
+        self._element = element
+        # cached and logged as declared, e.g. with "{title}" rather than one post's title
+        self._candidates = candidates
+        self._params = params
+        self._locator = None
+
+    def resolve(self):
+        if self._locator is None:
+            self._locator = self._resolver.resolve(self._element, self._candidates, self._params)
+        return self._locator
+
+    @property
+    def page(self):
+        return self._resolver.page
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        return f"<HealingLocator {self._resolver.name}.{self._element}>"
+
+
+class AsyncLocatorResolver(LocatorResolver):
+    """`LocatorResolver` for `playwright.async_api` pages."""
+
+    def __call__(self, element, candidates, **params):
+        return AsyncHealingLocator(self, element, candidates, params)
+
+    async def build(self):
+        if self._build is None:
+            try:
+                self._build = build_key(await self.page.evaluate(BUILD_JS))
+            except PlaywrightError:
+                return build_key("")
+        return self._build
+
+    async def resolve(self, element, candidates, params=None):
+        build, page = await self.build(), page_key(self.page.url)
+        ordered = self._order(element, candidates, build, page)
+        locators = [candidate_locator(self.page, fill(candidate, params)) for candidate in ordered]
+        try:
+            await self._any_of(locators).first.wait_for(state="attached", timeout=self.timeout)
+        except PlaywrightTimeoutError:
+            raise PlaywrightTimeoutError(self._missed(element, candidates, page)) from None
+        counts = [await locator.count() for locator in locators]
+        return locators[self._pick(element, candidates, ordered, counts, build, page)]
+
+
+class AsyncHealingLocator(HealingLocator):
+    """Async variant: only the Locator's methods are available, each resolving before it is awaited."""
+
+    async def resolve(self):
+        if self._locator is None:
+            self._locator = await self._resolver.resolve(self._element, self._candidates, self._params)
+        return self._locator
+
+    def __getattr__(self, name):
+        async def call(*args, **kwargs):
+            return await getattr(await self.resolve(), name)(*args, **kwargs)
+        return call
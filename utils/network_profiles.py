@@ -0,0 +1,213 @@
+import base64
+import json
+import os
+import threading
+from urllib.parse import urlparse
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SIZES_PATH = os.path.join(BASE_DIR, "..", ".cache", "resource_sizes.json")
+
+IMAGE_GLOB = "**/*.{png,jpg,jpeg,gif,webp,avif,svg,ico,bmp}"
+FONT_GLOB = "**/*.{woff,woff2,ttf,otf,eot}"
+MEDIA_GLOB = "**/*.{mp4,webm,ogg,mp3,wav,m4a}"
+THIRD_PARTY_GLOBS = (
+    "**://*.google-analytics.com/**",
+    "**://*.googletagmanager.com/**",
+    "**://*.doubleclick.net/**",
+    "**://fonts.googleapis.com/**",
+    "**://fonts.gstatic.com/**",
+)
+
+TRANSPARENT_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+
+class RouteProfile:
+    """Requests a test does not need: aborted (`block`) or answered locally (`stub`).
+
+    `block` and `stub` are URL globs, matched inside the browser. Only
+    `block_types` and `allowed_origins` need every request to pass through
+    Python, so the default profiles avoid them.
+    """
+
+    def __init__(self, name, block=(), stub=None, block_types=(), allowed_origins=()):
+        self.name = name
+        self.block = tuple(block)
+        self.stub = dict(stub or {})
+        self.block_types = tuple(block_types)
+        self.allowed_origins = tuple(allowed_origins)
+
+
+PROFILES = {
+    "public": RouteProfile(
+        "public",
+        block=(FONT_GLOB, MEDIA_GLOB) + THIRD_PARTY_GLOBS,
+        stub={IMAGE_GLOB: ("image/gif", TRANSPARENT_GIF)},
+    ),
+    "admin": RouteProfile(
+        "admin",
+        block=(MEDIA_GLOB,) + THIRD_PARTY_GLOBS,
+        stub={IMAGE_GLOB: ("image/gif", TRANSPARENT_GIF)},
+    ),
+    # Everything outside the app and its API, plus all images, fonts and media.
+    "strict": RouteProfile(
+        "strict",
+        block_types=("image", "font", "media", "websocket", "eventsource", "manifest", "other"),
+        allowed_origins=("LOCAL_SETUP_URL", "LOCAL_API_URL"),
+    ),
+}
+
+# Profile used for tests carrying one of these markers when none is chosen explicitly.
+MARKER_PROFILES = {
+    "public_viewing": "public",
+    "blog_management": "admin",
+}
+
+
+def profile_for(marker_names, explicit=None, option="auto"):
+    """Resolve the profile name for a test: marker argument, then --network-profile, then markers."""
+    if explicit:
+        return None if explicit == "off" else explicit
+    if option != "auto":
+        return None if option == "off" else option
+    for marker, profile in MARKER_PROFILES.items():
+        if marker in marker_names:
+            return profile
+    return None
+
+
+class ResourceSizes:
+    """Response sizes learned from unblocked runs, used to estimate bytes avoided."""
+
+    def __init__(self, path=SIZES_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            with open(path, "r") as file:
+                self.sizes = json.load(file)
+        except (OSError, ValueError):
+            self.sizes = {}
+
+    def get(self, url):
+        return self.sizes.get(url)
+
+    def learn(self, response):
+        if response.request.resource_type in ("document", "fetch", "xhr"):
+            return
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            with self._lock:
+                if self.sizes.get(response.url) != int(length):
+                    self.sizes[response.url] = int(length)
+                    self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._lock, open(tmp_path, "w") as file:
+            json.dump(self.sizes, file)
+        os.replace(tmp_path, self.path)
+
+
+class NetworkSavings:
+    """Requests and bytes each profile kept off the network during the run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_profile = {}
+
+    def add(self, profile, action, size):
+        with self._lock:
+            entry = self.by_profile.setdefault(profile, {"blocked": 0, "stubbed": 0, "bytes": 0, "unknown_size": 0})
+            entry[action] += 1
+            if size is None:
+                entry["unknown_size"] += 1
+            else:
+                entry["bytes"] += size
+
+    def export(self):
+        with self._lock:
+            return json.loads(json.dumps(self.by_profile))
+
+    def merge(self, by_profile):
+        with self._lock:
+            for profile, counts in by_profile.items():
+                entry = self.by_profile.setdefault(profile, {"blocked": 0, "stubbed": 0, "bytes": 0, "unknown_size": 0})
+                for key, value in counts.items():
+                    entry[key] += value
+
+    def summary_lines(self):
+        lines = []
+        for profile, entry in sorted(self.by_profile.items()):
+            requests = entry["blocked"] + entry["stubbed"]
+            unknown = f", {entry['unknown_size']} of unknown size" if entry["unknown_size"] else ""
+            lines.append(
+                f"{profile}: {requests} requests avoided ({entry['blocked']} blocked, {entry['stubbed']} stubbed), "
+                f"~{entry['bytes'] / 1024:.1f} KiB not downloaded{unknown}"
+            )
+        return lines
+
+
+network_savings = NetworkSavings()
+
+
+class ProfileRouter:
+    """Applies a RouteProfile to a browser context and counts what it avoided."""
+
+    def __init__(self, profile, sizes, savings=None):
+        self.profile = profile
+        self.sizes = sizes
+        self.savings = savings if savings is not None else network_savings
+        self.allowed_origins = {
+            self._origin(os.getenv(name, name)) for name in profile.allowed_origins
+        }
+
+    @staticmethod
+    def _origin(url):
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def attach(self, context):
+        for pattern in self.profile.block:
+            context.route(pattern, self._block)
+        for pattern, (content_type, body) in self.profile.stub.items():
+            context.route(pattern, self._stubber(content_type, body))
+        if self.profile.block_types or self.allowed_origins:
+            # registered last, so it sees requests first and falls back to the globs above
+            context.route("**/*", self._filter)
+
+    def _block(self, route):
+        self.savings.add(self.profile.name, "blocked", self.sizes.get(route.request.url))
+        route.abort("blockedbyclient")
+
+    def _stubber(self, content_type, body):
+        def stub(route):
+            size = self.sizes.get(route.request.url)
+            self.savings.add(self.profile.name, "stubbed", None if size is None else max(size - len(body), 0))
+            route.fulfill(status=200, content_type=content_type, body=body)
+        return stub
+
+    def _filter(self, route):
+        request = route.request
+        foreign = self.allowed_origins and self._origin(request.url) not in self.allowed_origins
+        if request.resource_type in self.profile.block_types or (foreign and not request.url.startswith("data:")):
+            self._block(route)
+        else:
+            route.fallback()
+
+
+def apply_profile(context, name, sizes):
+    """Route `context` through profile `name`; without a profile, learn response sizes instead.
+
+    Returns a callable that detaches the profile again, for contexts that
+    go back into the pool.
+    """
+    if name is None:
+        context.on("response", sizes.learn)
+        return lambda: context.remove_listener("response", sizes.learn)
+    if name not in PROFILES:
+        raise ValueError(f"Unknown network profile '{name}', expected one of {sorted(PROFILES)}")
+    ProfileRouter(PROFILES[name], sizes).attach(context)
+    return lambda: context.unroute_all(behavior="ignoreErrors")
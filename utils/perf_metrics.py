@@ -0,0 +1,171 @@
+import html
+import os
+import time
+import weakref
+from contextlib import contextmanager
+
+import yaml
+from playwright.sync_api import Error as PlaywrightError
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(BASE_DIR, "..", "data", "config.yaml")
+
+# Installed before any page script runs. Observers keep running totals in
+# window.__bloggyPerf; COLLECT_JS reads them, so a measurement is one evaluate.
+INIT_JS = """
+(() => {
+    if (window.__bloggyPerf) return;
+    const perf = window.__bloggyPerf = {lcp: null, cls: 0, longTasks: 0, longTaskMs: 0};
+    const supported = PerformanceObserver.supportedEntryTypes || [];
+    const observe = (type, callback) => {
+        if (supported.includes(type)) new PerformanceObserver(list => list.getEntries().forEach(callback)).observe({type, buffered: true});
+    };
+    observe('largest-contentful-paint', entry => { perf.lcp = entry.startTime; });
+    observe('layout-shift', entry => { if (!entry.hadRecentInput) perf.cls += entry.value; });
+    observe('longtask', entry => { perf.longTasks += 1; perf.longTaskMs += entry.duration; });
+})();
+"""
+
+COLLECT_JS = """
+() => {
+    const perf = window.__bloggyPerf || {lcp: null, cls: 0, longTasks: 0, longTaskMs: 0};
+    const [nav] = performance.getEntriesByType('navigation');
+    return {
+        document: performance.timeOrigin,
+        url: location.href,
+        lcp: perf.lcp,
+        cls: perf.cls,
+        longTasks: perf.longTasks,
+        longTaskMs: perf.longTaskMs,
+        heap: performance.memory ? performance.memory.usedJSHeapSize : null,
+        nav: nav ? {ttfb: nav.responseStart, dcl: nav.domContentLoadedEventEnd, load: nav.loadEventEnd} : null,
+    };
+}
+"""
+
+# metric -> label used in reports and budget messages
+METRICS = {
+    "action_ms": "action time (ms)",
+    "ttfb_ms": "TTFB (ms)",
+    "dcl_ms": "DOMContentLoaded (ms)",
+    "load_ms": "load (ms)",
+    "lcp_ms": "LCP (ms)",
+    "cls": "CLS",
+    "long_tasks": "long tasks",
+    "long_task_ms": "long task time (ms)",
+    "heap_mb": "JS heap (MB)",
+}
+
+
+def load_budgets(config_path=CONFIG_PATH):
+    with open(config_path, "r") as file:
+        config = yaml.safe_load(file)
+    return config.get("perf_budgets") or {}
+
+
+def budget_for(budgets, action):
+    """Default budgets with the action's own overrides on top."""
+    return dict(budgets.get("default") or {}, **((budgets.get("actions") or {}).get(action) or {}))
+
+
+class PerfRecorder:
+    """Collects front-end metrics around each LoginPage action on one page.
+
+    A record covers what happened during the action: wall time, new long
+    tasks and layout shift, and the heap afterwards. Navigation timing and
+    LCP are only included when the action loaded a new document.
+    """
+
+    def __init__(self, page, budgets=None):
+        self.page = page
+        self.budgets = budgets if budgets is not None else {}
+        self.records = []
+
+    def attach(self):
+        self.page.add_init_script(INIT_JS)
+        _recorders[self.page] = self
+        return self
+
+    def _snapshot(self):
+        try:
+            return self.page.evaluate(COLLECT_JS)
+        except PlaywrightError:
+            # navigation in progress, or the page is gone
+            return None
+
+    @contextmanager
+    def measure(self, action):
+        before = self._snapshot()
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        after = self._snapshot()
+        if after is not None:
+            self.records.append(self._record(action, elapsed, before, after))
+
+    def _record(self, action, elapsed, before, after):
+        new_document = before is None or before["document"] != after["document"]
+        base = {"cls": 0, "longTasks": 0, "longTaskMs": 0} if new_document else before
+        record = {
+            "action": action,
+            "url": after["url"],
+            "action_ms": elapsed * 1000,
+            "cls": after["cls"] - base["cls"],
+            "long_tasks": after["longTasks"] - base["longTasks"],
+            "long_task_ms": after["longTaskMs"] - base["longTaskMs"],
+            "heap_mb": after["heap"] / 1048576 if after["heap"] is not None else None,
+        }
+        if new_document:
+            nav = after["nav"] or {}
+            record.update({
+                "ttfb_ms": nav.get("ttfb"),
+                "dcl_ms": nav.get("dcl") or None,
+                "load_ms": nav.get("load") or None,
+                "lcp_ms": after["lcp"],
+            })
+        return record
+
+    def violations(self):
+        """(action, metric, value, budget) for every metric over its budget."""
+        found = []
+        for record in self.records:
+            for metric, limit in budget_for(self.budgets, record["action"]).items():
+                value = record.get(metric)
+                if value is not None and value > limit:
+                    found.append((record["action"], metric, value, limit))
+        return found
+
+    def html_table(self):
+        columns = [m for m in METRICS if any(r.get(m) is not None for r in self.records)]
+        over = {(action, metric) for action, metric, _, _ in self.violations()}
+        head = "".join(f"<th>{html.escape(METRICS[m])}</th>" for m in columns)
+        rows = []
+        for record in self.records:
+            cells = []
+            for m in columns:
+                value = record.get(m)
+                text = "" if value is None else (f"{value:.3f}" if m == "cls" else f"{value:.0f}")
+                style = ' style="color:#c00;font-weight:bold"' if (record["action"], m) in over else ""
+                cells.append(f"<td{style}>{text}</td>")
+            rows.append(f"<tr><td>{html.escape(record['action'])}</td>{''.join(cells)}</tr>")
+        return (
+            "<div><p><b>Front-end performance</b></p><table border=\"1\" cellpadding=\"3\">"
+            f"<tr><th>action</th>{head}</tr>{''.join(rows)}</table></div>"
+        )
+
+
+class _NoRecorder:
+    records = []
+
+    @contextmanager
+    def measure(self, action):
+        yield
+
+
+_recorders = weakref.WeakKeyDictionary()
+_no_recorder = _NoRecorder()
+
+
+def recorder_for(page):
+    """The PerfRecorder attached to `page`, or one that records nothing."""
+    return _recorders.get(page, _no_recorder)
@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from playwright.sync_api import Error as PlaywrightError
+
+from utils.browser_pool import CONTEXT_OPTIONS
+from utils.data_factory import CONFIG_PATH, load_config
+
+DEFAULT_TIMEOUT = 60
+DEFAULT_TARGETS = {"frontend": "{LOCAL_SETUP_URL}", "backend": "{LOCAL_API_URL}"}
+
+
+class StartupTimer:
+    """Wall-clock phases of one worker's startup.
+
+    Phases may overlap: the readiness probe runs while the browser launches.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []
+        self._lock = threading.Lock()
+
+    def add(self, name, start, end):
+        with self._lock:
+            self.phases.append((name, start - self.started, end - self.started))
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter())
+
+    def total(self):
+        return max((end for _, _, end in self.phases), default=0.0)
+
+    def line(self, label):
+        parts = ", ".join(
+            f"{name} {end - start:.2f}s" + (f" (from {start:.2f}s)" if start >= 0.01 else "")
+            for name, start, end in sorted(self.phases, key=lambda phase: phase[1])
+        )
+        return f"{label}: ready after {self.total():.2f}s - {parts}"
+
+
+def readiness_targets(config_path=CONFIG_PATH):
+    """{name: url} to poll, from `readiness` in config.yaml with .env values filled in."""
+    templates = load_config(config_path).get("readiness") or DEFAULT_TARGETS
+    targets = {}
+    for name, template in templates.items():
+        try:
+            targets[name] = template.format(**os.environ)
+        except KeyError as missing:
+            raise RuntimeError(f"Readiness target '{name}' needs {missing} in .env")
+    return targets
+
+
+def probe(session, url, timeout):
+    """None when `url` answers below HTTP 500, otherwise why it did not."""
+    try:
+        response = session.get(url, timeout=timeout)
+    except requests.RequestException as error:
+        return type(error).__name__
+    return None if response.status_code < 500 else f"HTTP {response.status_code}"
+
+
+def wait_until_ready(targets, timeout=DEFAULT_TIMEOUT, timer=None, initial_delay=0.1, max_delay=2.0, stop=None):
+    """Poll every target with exponential backoff until all of them answer.
+
+    Each target's time to first answer is added to `timer` as "probe <name>".
+    Raises RuntimeError naming the targets that never answered. Setting the
+    `stop` event (e.g. because the browser failed to launch) ends polling early.
+    """
+    stop = stop or threading.Event()
+    timer = timer or StartupTimer()
+    start = time.perf_counter()
+    deadline = time.monotonic() + timeout
+    pending = dict(targets)
+    errors, attempts = {}, dict.fromkeys(targets, 0)
+    delay = initial_delay
+    with requests.Session() as session:
+        while True:
+            for name, url in list(pending.items()):
+                attempts[name] += 1
+                errors[name] = probe(session, url, min(5, max(deadline - time.monotonic(), 0.5)))
+                if errors[name] is None:
+                    timer.add(f"probe {name}", start, time.perf_counter())
+                    del pending[name]
+            if not pending:
+                return timer
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                details = "\n".join(
+                    f"  {name} {url}: {errors[name]} ({attempts[name]} attempts)" for name, url in pending.items()
+                )
+                raise RuntimeError(
+                    f"Bloggy is not ready after {timeout:g}s:\n{details}\n"
+                    "Start the app (see LOCAL_SETUP_URL / LOCAL_API_URL in .env) or raise --startup-timeout."
+                )
+            if stop.wait(min(delay, remaining)):
+                return timer
+            delay = min(delay * 2, max_delay)
+
+
+def prime(browser, url, timer):
+    """Load the app once in a throwaway context.
+
+    The dev server compiles its modules and the browser starts a renderer
+    before the first test, instead of during it.
+    """
+    with timer.phase("prime"):
+        context = browser.new_context(**CONTEXT_OPTIONS)
+        try:
+            context.new_page().goto(url, wait_until="load")
+        except PlaywrightError as error:
+            # the first test reports the real problem
+            print(f"Priming {url} failed: {error}")
+        finally:
+            context.close()
@@ -0,0 +1,105 @@
+import json
+import os
+import re
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STREAM_PATH = os.path.join(BASE_DIR, "..", "reports", "results.jsonl")
+# user_properties that are kept in the record; the rest (per-step timings) stay out of the stream
+RECORD_PROPERTIES = ("browser", "perf_metrics", "artifacts")
+
+
+def safe_name(nodeid):
+    return re.sub(r"[^\w.-]+", "_", nodeid)[-150:]
+
+
+class ResultsStream:
+    """Appends one JSON line per test phase to a results file as soon as the phase is reported.
+
+    Every record is a single append of one complete line, so a reader (or a
+    killed run) only ever sees whole records. Captured output is written to
+    `logs/` next to the stream and referenced by path; artifacts are only
+    referenced.
+    """
+
+    def __init__(self, path=STREAM_PATH):
+        self.path = os.path.abspath(path)
+        self.root = os.path.dirname(self.path)
+        self.logs_dir = os.path.join(self.root, "logs")
+        self._lock = threading.Lock()
+        self.started = time.time()
+        os.makedirs(self.logs_dir, exist_ok=True)
+        # a new run starts a new stream
+        open(self.path, "w").close()
+
+    def append(self, record):
+        line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0))
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    def relative(self, path):
+        return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, "/")
+
+    def session_start(self, **info):
+        self.started = time.time()
+        self.append(dict(type="session_start", time=self.started, **info))
+
+    def session_finish(self, exitstatus, **counts):
+        now = time.time()
+        self.append(dict(type="session_finish", time=now, duration=round(now - self.started, 3),
+                          exitstatus=int(exitstatus), **counts))
+
+    def _write_logs(self, report):
+        sections = [(name, content) for name, content in report.sections if content.strip()]
+        if not sections:
+            return None
+        path = os.path.join(self.logs_dir, f"{safe_name(report.nodeid)}.{report.when}.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            for name, content in sections:
+                file.write(f"----- {name} -----\n{content}\n")
+        return self.relative(path)
+
+    def phase(self, report, worker="master"):
+        self.append(self.record(report, worker))
+
+    def record(self, report, worker="master"):
+        """The stream record of one test phase; captured output is written to `logs/` here."""
+        properties = dict(report.user_properties)
+        artifacts = properties.get("artifacts")
+        if artifacts:
+            artifacts = {key: self.relative(value) if key in ("folder", "trace", "screenshot") and value else value
+                         for key, value in artifacts.items()}
+        record = {
+            "type": "phase",
+            "nodeid": report.nodeid,
+            "when": report.when,
+            "outcome": report.outcome,
+            "duration": round(report.duration, 4),
+            "start": getattr(report, "start", None),
+            "worker": worker,
+            "longrepr": str(report.longrepr) if report.failed or report.skipped else None,
+            "logs": self._write_logs(report),
+        }
+        record.update({name: properties[name] for name in RECORD_PROPERTIES if properties.get(name)})
+        if artifacts:
+            record["artifacts"] = artifacts
+        return record
+
+
+def read_records(path, offset=0):
+    """Complete records after byte `offset`, and the offset to continue from.
+
+    A line that is still being written (no trailing newline yet) is left for
+    the next call.
+    """
+    with open(path, "rb") as file:
+        file.seek(offset)
+        data = file.read()
+    end = data.rfind(b"\n") + 1
+    records = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+    return records, offset + end
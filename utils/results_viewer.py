@@ -0,0 +1,194 @@
+"""Live viewer for the results stream (reports/results.jsonl).
+
+Serves a small page that polls the stream and adds each test as soon as its
+record is appended, so a running (or killed) run can be inspected without
+waiting for the HTML report. Logs, screenshots and traces are fetched only
+when a test is expanded.
+
+    python utils/results_viewer.py
+    python utils/results_viewer.py --stream path/to/results.jsonl --port 8008
+"""
+import argparse
+import json
+import mimetypes
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.results_stream import STREAM_PATH, read_records
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Test results</title>
+<style>
+body { font-family: sans-serif; margin: 1.5em; }
+#summary span { margin-right: 1.5em; }
+table { border-collapse: collapse; width: 100%; }
+td, th { text-align: left; padding: 3px 8px; border-bottom: 1px solid #ddd; vertical-align: top; }
+tr.test { cursor: pointer; }
+.passed { color: #2a7a2a; } .failed, .error { color: #b00020; } .skipped { color: #8a6d00; }
+pre { white-space: pre-wrap; background: #f6f6f6; padding: 6px; max-height: 30em; overflow: auto; }
+img { max-width: 100%; border: 1px solid #ccc; }
+</style></head>
+<body>
+<h1>Test results</h1>
+<div id="summary"></div>
+<p><label><input type="checkbox" id="problems"> only failures and errors</label></p>
+<table><thead><tr><th>Result</th><th>Test</th><th>Browser</th><th>Worker</th><th>Duration</th></tr></thead>
+<tbody id="rows"></tbody></table>
+<script>
+const tests = new Map();
+const counts = {};
+let offset = 0, finished = false, started = null;
+
+function outcomeOf(test) {
+  const phases = test.phases;
+  if (phases.setup && phases.setup.outcome === "failed") return "error";
+  if (phases.call) return phases.call.outcome;
+  if (phases.setup && phases.setup.outcome === "skipped") return "skipped";
+  if (phases.teardown && phases.teardown.outcome === "failed") return "error";
+  return "running";
+}
+
+function el(tag, text, cls) {
+  const node = document.createElement(tag);
+  if (text !== undefined) node.textContent = text;
+  if (cls) node.className = cls;
+  return node;
+}
+
+function render(test) {
+  const outcome = outcomeOf(test);
+  if (test.outcome) counts[test.outcome]--;
+  test.outcome = outcome;
+  counts[outcome] = (counts[outcome] || 0) + 1;
+  if (!test.row) {
+    test.row = el("tr", undefined, "test");
+    test.row.onclick = () => toggle(test);
+    document.getElementById("rows").appendChild(test.row);
+  }
+  const duration = Object.values(test.phases).reduce((sum, phase) => sum + phase.duration, 0);
+  const record = test.phases.call || test.phases.setup || {};
+  test.row.replaceChildren(el("td", outcome, outcome), el("td", test.nodeid), el("td", record.browser || ""),
+                           el("td", record.worker || ""), el("td", duration.toFixed(2) + "s"));
+  test.row.dataset.outcome = outcome;
+  applyFilter(test.row);
+  if (test.details) { test.details.remove(); test.details = null; toggle(test); }
+}
+
+function toggle(test) {
+  if (test.details) { test.details.remove(); test.details = null; return; }
+  const cell = el("td"); cell.colSpan = 5;
+  for (const phase of Object.values(test.phases)) {
+    if (phase.longrepr) cell.appendChild(el("pre", phase.when + ": " + phase.longrepr));
+    if (phase.logs) {
+      const logs = el("pre", "loading " + phase.logs + " ...");
+      fetch("files/" + phase.logs).then(r => r.text()).then(text => logs.textContent = text);
+      cell.appendChild(logs);
+    }
+    const artifacts = phase.artifacts;
+    if (artifacts) {
+      cell.appendChild(el("p", "Artifacts kept: " + artifacts.reason));
+      if (artifacts.screenshot) { const img = el("img"); img.loading = "lazy"; img.src = "files/" + artifacts.screenshot; cell.appendChild(img); }
+      if (artifacts.trace) { const link = el("a", "trace.zip (playwright show-trace)"); link.href = "files/" + artifacts.trace; cell.appendChild(el("p")).appendChild(link); }
+    }
+  }
+  if (!cell.childNodes.length) cell.appendChild(el("p", "No output captured."));
+  test.details = el("tr"); test.details.appendChild(cell);
+  test.row.after(test.details);
+}
+
+function applyFilter(row) {
+  const only = document.getElementById("problems").checked;
+  row.hidden = only && !["failed", "error"].includes(row.dataset.outcome);
+}
+
+function summary() {
+  const parts = Object.entries(counts).filter(([, n]) => n > 0).map(([name, n]) => `<span class="${name}">${n} ${name}</span>`);
+  const state = finished ? "finished" : "running" + (started ? ` for ${Math.round(Date.now() / 1000 - started)}s` : "");
+  document.getElementById("summary").innerHTML = `<span>${state}</span>` + parts.join("");
+}
+
+async function poll() {
+  try {
+    const response = await fetch("stream?offset=" + offset);
+    const data = await response.json();
+    if (data.offset < offset) { location.reload(); return; }  // a new run truncated the stream
+    offset = data.offset;
+    for (const record of data.records) {
+      if (record.type === "session_start") started = record.time;
+      else if (record.type === "session_finish") finished = true;
+      else if (record.type === "phase") {
+        const test = tests.get(record.nodeid) || { nodeid: record.nodeid, phases: {} };
+        tests.set(record.nodeid, test);
+        test.phases[record.when] = record;
+        render(test);
+      }
+    }
+  } catch (e) { /* stream not written yet */ }
+  summary();
+  setTimeout(poll, finished ? 10000 : 1000);
+}
+
+document.getElementById("problems").onchange = () => document.querySelectorAll("tr.test").forEach(applyFilter);
+poll();
+</script></body></html>
+"""
+
+
+class ViewerHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        stream = self.server.stream
+        if url.path == "/":
+            return self._send(200, PAGE.encode("utf-8"), "text/html; charset=utf-8")
+        if url.path == "/stream":
+            offset = int(parse_qs(url.query).get("offset", ["0"])[0])
+            if not os.path.exists(stream):
+                return self._send(404, b"{}")
+            if offset > os.path.getsize(stream):
+                offset = 0
+            records, offset = read_records(stream, offset)
+            return self._send(200, json.dumps({"records": records, "offset": offset}).encode("utf-8"))
+        if url.path.startswith("/files/"):
+            root = os.path.dirname(stream)
+            path = os.path.abspath(os.path.join(root, unquote(url.path[len("/files/"):])))
+            # only files next to the stream (logs, artifacts)
+            if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+                return self._send(404, b"not found", "text/plain")
+            with open(path, "rb") as file:
+                body = file.read()
+            return self._send(200, body, mimetypes.guess_type(path)[0] or "application/octet-stream")
+        self._send(404, b"not found", "text/plain")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stream", default=STREAM_PATH)
+    parser.add_argument("--port", type=int, default=8008)
+    args = parser.parse_args(argv)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), ViewerHandler)
+    server.stream = os.path.abspath(args.stream)
+    print(f"Viewing {server.stream} at http://127.0.0.1:{args.port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""Benchmark the selectors in LoginPageLocators and AdminPageLocators.
+
+Loads captured DOM snapshots (or live pages), times how long each selector
+takes to resolve and how many nodes it matches, ranks them by cost and
+compares the result with a stored baseline.
+
+    python utils/selector_bench.py --url http://localhost:5173/ --capture data/dom_snapshots/home.html
+    python utils/selector_bench.py --snapshot data/dom_snapshots/home.html --update-baseline
+    python utils/selector_bench.py --snapshot data/dom_snapshots/home.html   # exits 1 on regressions
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from locators.adminPageLocators import AdminPageLocators
+from locators.loginPageLocators import LoginPageLocators
+from utils.locator_healing import fill
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BASE_DIR, "..", "data", "selector_baseline.json")
+LOCATOR_CLASSES = (LoginPageLocators, AdminPageLocators)
+TEMPLATE_VALUES = {"title": "Test Title"}
+# candidate strategies that are plain selectors; role, label, text, ... are built into Playwright
+BENCHED_STRATEGIES = ("css", "xpath")
+
+# Runs a selector `inner` times per sample inside the page, so the timer
+# resolution of performance.now() does not swamp fast selectors.
+MEASURE_JS = """
+([selector, kind, samples, inner]) => {
+    const run = kind === 'xpath'
+        ? () => document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength
+        : () => document.querySelectorAll(selector).length;
+    let count = run();
+    const timings = [];
+    for (let s = 0; s < samples; s++) {
+        const start = performance.now();
+        for (let i = 0; i < inner; i++) count = run();
+        timings.push((performance.now() - start) / inner);
+    }
+    return {count, timings};
+}
+"""
+
+
+def collect_selectors(classes=LOCATOR_CLASSES):
+    """{"LoginPageLocators.NAME": selector} for every string constant, and the css and xpath
+    entries of the `*_CANDIDATES` tuples as "NAME_CANDIDATES[i]" unless they repeat a constant."""
+    selectors, candidates = {}, {}
+    for cls in classes:
+        for name, value in vars(cls).items():
+            if not name.isupper():
+                continue
+            if isinstance(value, str):
+                selectors[f"{cls.__name__}.{name}"] = fill((selector_kind(value), value), TEMPLATE_VALUES)[1]
+            elif name.endswith("_CANDIDATES"):
+                for index, candidate in enumerate(value):
+                    if candidate[0] in BENCHED_STRATEGIES:
+                        candidates[f"{cls.__name__}.{name}[{index}]"] = fill(candidate, TEMPLATE_VALUES)[1]
+    known = set(selectors.values())
+    selectors.update((name, selector) for name, selector in candidates.items() if selector not in known)
+    return selectors
+
+
+def selector_kind(selector):
+    """xpath, css, or playwright for selectors only Playwright's engine understands."""
+    if selector.startswith(("/", "(", "..")):
+        return "xpath"
+    if ":has-text(" in selector or ":text(" in selector or ">>" in selector:
+        return "playwright"
+    return "css"
+
+
+def lint(selector):
+    notes = []
+    if "//*" in selector:
+        notes.append("scans every element")
+    separator = "|" if selector_kind(selector) == "xpath" else ","
+    if separator in selector:
+        notes.append(f"union of {selector.count(separator) + 1}")
+    if re.search(r"/\w+\[\d+\]", selector):
+        notes.append("positional")
+    if re.search(r":r\w+:", selector):
+        notes.append("generated id")
+    return notes
+
+
+def _measure_in_page(page, selector, kind, samples, inner):
+    result = page.evaluate(MEASURE_JS, [selector, kind, samples, inner])
+    return result["count"], statistics.median(result["timings"]) * 1000
+
+
+def _measure_through_playwright(page, selector, samples):
+    """Playwright-only syntax: time locator.count() minus a no-match round trip."""
+    def timed(sel):
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            page.locator(sel).count()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1_000_000
+
+    round_trip = timed("#selector-bench-calibration")
+    return page.locator(selector).count(), max(timed(selector) - round_trip, 0.0)
+
+
+def measure(page, selectors, samples=15, inner=20):
+    """Per selector: kind, median cost in microseconds and matched node count."""
+    results = {}
+    for name, selector in selectors.items():
+        kind = selector_kind(selector)
+        try:
+            if kind == "playwright":
+                count, cost = _measure_through_playwright(page, selector, samples)
+            else:
+                count, cost = _measure_in_page(page, selector, kind, samples, inner)
+        except Exception as e:
+            results[name] = {"selector": selector, "kind": kind, "error": str(e).splitlines()[0]}
+            continue
+        results[name] = {"selector": selector, "kind": kind, "cost_us": cost, "matches": count}
+    return results
+
+
+def merge_pages(per_page):
+    """Sum costs over every snapshot; keep match counts per page."""
+    merged = {}
+    for page_name, results in per_page.items():
+        for name, result in results.items():
+            entry = merged.setdefault(name, {
+                "selector": result["selector"], "kind": result["kind"], "cost_us": 0.0, "matches": {},
+            })
+            if "error" in result:
+                entry["error"] = result["error"]
+                continue
+            entry["cost_us"] += result["cost_us"]
+            entry["matches"][page_name] = result["matches"]
+    return merged
+
+
+def rank(results):
+    return sorted(results.items(), key=lambda item: item[1].get("cost_us", 0.0), reverse=True)
+
+
+def compare_to_baseline(results, baseline, tolerance=0.25, min_delta_us=20.0):
+    """Selectors that got slower than baseline by more than `tolerance` and the noise floor."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name, {}).get("cost_us")
+        if before is None or "cost_us" not in result:
+            continue
+        after = result["cost_us"]
+        if after > before * (1 + tolerance) and after - before > min_delta_us:
+            regressions.append((name, before, after))
+    return sorted(regressions, key=lambda r: r[2] - r[1], reverse=True)
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    baseline = {name: {"cost_us": r["cost_us"], "matches": r["matches"]} for name, r in results.items() if "cost_us" in r}
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+
+
+def print_ranking(results):
+    print(f"{'cost (us)':>10}  {'kind':<10}  {'matches':<24}  selector")
+    for name, result in rank(results):
+        if "error" in result:
+            print(f"{'error':>10}  {result['kind']:<10}  {'':<24}  {name}: {result['error']}")
+            continue
+        matches = ", ".join(f"{page}={count}" for page, count in result["matches"].items())
+        notes = lint(result["selector"])
+        suffix = f"  [{'; '.join(notes)}]" if notes else ""
+        print(f"{result['cost_us']:>10.1f}  {result['kind']:<10}  {matches:<24}  {name}{suffix}")
+
+
+def run(snapshots, urls, capture=None, browser_name="chromium", samples=15, inner=20):
+    from playwright.sync_api import sync_playwright
+
+    per_page = {}
+    selectors = collect_selectors()
+    with sync_playwright() as p:
+        browser = getattr(p, browser_name).launch(headless=True)
+        page = browser.new_page()
+        for url in urls:
+            page.goto(url)
+            page.wait_for_load_state("networkidle")
+            if capture:
+                os.makedirs(os.path.dirname(os.path.abspath(capture)), exist_ok=True)
+                with open(capture, "w", encoding="utf-8") as file:
+                    file.write(page.content())
+            per_page[url] = measure(page, selectors, samples, inner)
+        # snapshots are static markup: keep them offline and script free
+        page.route("**/*", lambda route: route.abort())
+        for snapshot in snapshots:
+            with open(snapshot, "r", encoding="utf-8") as file:
+                html = re.sub(r"<script\b.*?</script>", "", file.read(), flags=re.S | re.I)
+            page.set_content(html)
+            per_page[os.path.basename(snapshot)] = measure(page, selectors, samples, inner)
+        browser.close()
+    return merge_pages(per_page)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshot", action="append", default=[], help="Captured DOM snapshot (HTML file); repeatable")
+    parser.add_argument("--url", action="append", default=[], help="Live page to benchmark; repeatable")
+    parser.add_argument("--capture", help="Save the DOM of the --url page to this file")
+    parser.add_argument("--browser", default="chromium", choices=["chromium", "firefox", "webkit"])
+    parser.add_argument("--samples", type=int, default=15)
+    parser.add_argument("--inner", type=int, default=20, help="Selector runs per in-page sample")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown (default: 0.25)")
+    parser.add_argument("--min-delta-us", type=float, default=20.0, help="Ignore slowdowns below this many microseconds")
+    args = parser.parse_args(argv)
+    if not args.snapshot and not args.url:
+        parser.error("give at least one --snapshot or --url")
+    baseline = load_baseline(args.baseline)
+    if baseline is None and not args.update_baseline:
+        # without a baseline the gate could never fail
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 2
+
+    results = run(args.snapshot, args.url, args.capture, args.browser, args.samples, args.inner)
+    print_ranking(results)
+
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta_us)
+    for name, before, after in regressions:
+        print(f"SLOWER: {name} {before:.1f}us -> {after:.1f}us")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import heapq
+import statistics
+
+# Fallback estimates for tests without history: anything that drives a
+# browser is an order of magnitude slower than the API and unit tests.
+UI_FIXTURES = {"setupcheck", "admin_page", "async_runner", "worker_browser", "context_pool"}
+DEFAULT_UI_SECONDS = 10.0
+DEFAULT_OTHER_SECONDS = 0.5
+
+
+def parse_shard(value):
+    """'2/4' -> (1, 4): zero-based index and shard count."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"--shard expects i/n, e.g. 1/4, got '{value}'")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"--shard {value}: i must be between 1 and n")
+    return index - 1, count
+
+
+def estimate_durations(tests, history):
+    """Expected seconds per test.
+
+    `tests` is a list of (nodeid, fixturenames, engine); `history` maps
+    (nodeid, engine) to recent durations, engine None for tests without a
+    browser. A test whose engine is not known before the run (None) uses the
+    history of all its engines. Tests with history use their median;
+    otherwise the median of their file's tests with history on the same
+    engine (or any engine), otherwise a per-kind default.
+    Returns ({nodeid: seconds}, number of estimated tests).
+    """
+    runs, by_nodeid = {}, {}
+    for (nodeid, engine), values in history.items():
+        if values:
+            runs[nodeid, engine] = values
+            by_nodeid.setdefault(nodeid, []).extend(values)
+    known = {key: statistics.median(values) for key, values in runs.items()}
+    by_file, by_engine_file = {}, {}
+    for (nodeid, engine), seconds in known.items():
+        path = nodeid.split("::")[0]
+        by_file.setdefault(path, []).append(seconds)
+        by_engine_file.setdefault((path, engine), []).append(seconds)
+    durations, estimated = {}, 0
+    for nodeid, fixturenames, engine in tests:
+        if (nodeid, engine) in known:
+            durations[nodeid] = known[nodeid, engine]
+            continue
+        if engine is None and nodeid in by_nodeid:
+            durations[nodeid] = statistics.median(by_nodeid[nodeid])
+            continue
+        estimated += 1
+        path = nodeid.split("::")[0]
+        file_history = by_engine_file.get((path, engine)) or by_file.get(path)
+        if file_history:
+            durations[nodeid] = statistics.median(file_history)
+        elif UI_FIXTURES & set(fixturenames):
+            durations[nodeid] = DEFAULT_UI_SECONDS
+        else:
+            durations[nodeid] = DEFAULT_OTHER_SECONDS
+    return durations, estimated
+
+
+def assign_shards(durations, count):
+    """Longest-processing-time-first: each test goes to the currently lightest shard.
+
+    Deterministic for the same input, so every CI node and every xdist
+    worker computes the same split. Returns a list of (total seconds, [nodeids]).
+    """
+    shards = [(0.0, index, []) for index in range(count)]
+    heapq.heapify(shards)
+    for nodeid, seconds in sorted(durations.items(), key=lambda kv: (-kv[1], kv[0])):
+        total, index, nodeids = heapq.heappop(shards)
+        nodeids.append(nodeid)
+        heapq.heappush(shards, (total + seconds, index, nodeids))
+    return [(total, nodeids) for total, _, nodeids in sorted(shards, key=lambda shard: shard[1])]
+
+
+def plan_lines(shards, current, estimated):
+    lines = []
+    for index, (total, nodeids) in enumerate(shards):
+        marker = "  <- this node" if index == current else ""
+        lines.append(f"shard {index + 1}/{len(shards)}: {len(nodeids)} tests, expected {total:.1f}s{marker}")
+    if estimated:
+        lines.append(f"{estimated} tests without history were estimated")
+    return lines
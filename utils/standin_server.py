@@ -0,0 +1,760 @@
+"""Hermetic stand-in for the Bloggy frontend and backend.
+
+Serves a small single-page app whose markup matches `LoginPageLocators`
+(login, blog list, search, detail, admin dashboard, create/publish/delete)
+and the JSON API under /api that `BlogFactory` uses. Data lives in memory
+and is reset instantly; latency and errors can be injected per route.
+
+    python utils/standin_server.py --port 5180
+    python utils/standin_server.py --latency 150 --jitter 50 --fault "POST /api/blogs* rate=0.5 status=503"
+
+Test endpoints, for utils/data_isolation.py (admin token needed):
+    POST /api/test/snapshot  {"snapshot": "s1"}
+    POST /api/test/restore   {"snapshot": "s1"} -> {"changes": 2}
+
+Control and test endpoints are never delayed or failed:
+    POST /__standin/reset    data and fault rules back to the start
+    POST /__standin/faults   {"rules": ["GET /api/blogs latency=800", ...], "seed": 0}
+    GET  /__standin/stats    requests served, injected errors and delay
+"""
+import argparse
+import copy
+import fnmatch
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.data_factory import load_config
+
+CATEGORIES = ["Technology", "Lifestyle", "Travel", "Food", "Business"]
+TAGS = ["JavaScript", "TypeScript", "React", "Node.js", "Python", "CSS"]
+MAX_SNAPSHOTS = 32
+
+SEED_BLOGS = [
+    {"title": "Getting Started with TypeScript", "category": "Technology", "tags": ["TypeScript", "JavaScript"],
+     "excerpt": "Static types for the JavaScript you already write.",
+     "content": "TypeScript adds optional static types to JavaScript. This post sets up a project, "
+                "explains the compiler options that matter and migrates a small module."},
+    {"title": "React Hooks in Practice", "category": "Technology", "tags": ["React", "JavaScript"],
+     "excerpt": "useState, useEffect and the custom hooks we keep reaching for.",
+     "content": "Hooks replaced most of our class components. Here are the patterns that stuck."},
+    {"title": "Building REST APIs with Node.js", "category": "Technology", "tags": ["Node.js"],
+     "excerpt": "Routing, validation and error handling without a framework.",
+     "content": "A walk through a small Express service, from the first route to structured errors."},
+    {"title": "A Long Weekend in Lisbon", "category": "Travel", "tags": [],
+     "excerpt": "Trams, tiles and far too many pastries.",
+     "content": "Three days in Lisbon on foot, with the viewpoints worth the climb."},
+    {"title": "Upcoming Features", "category": "Business", "tags": ["CSS"], "status": "draft",
+     "excerpt": "What we are working on next.",
+     "content": "Not published yet."},
+]
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _token(username):
+    # deterministic, so a saved admin session stays valid when the server restarts
+    return hashlib.sha256(f"bloggy-standin:{username}".encode("utf-8")).hexdigest()[:32]
+
+
+class BlogStore:
+    """The blog posts, in memory. `reset()` goes back to the seed data.
+
+    Posts are replaced on update, never changed in place, so a snapshot is
+    a shallow copy of the id -> post mapping.
+    """
+
+    def __init__(self, seed=SEED_BLOGS):
+        self.seed = seed
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.blogs = {}
+            self.next_id = 0
+            self.snapshots = {}
+            self.snapshot_count = 0
+            for index, fields in enumerate(copy.deepcopy(self.seed)):
+                created = f"2024-01-{index + 1:02d}T09:00:00+00:00"
+                self._add(dict({"author": "admin", "createdAt": created, "updatedAt": created}, **fields))
+
+    def _add(self, fields):
+        self.next_id += 1
+        blog = {"excerpt": "", "content": "", "category": "", "tags": [], "status": "published",
+                "author": "admin", "views": 0, "createdAt": _now(), "updatedAt": _now()}
+        blog.update(fields, id=self.next_id)
+        self.blogs[blog["id"]] = blog
+        return blog
+
+    def create(self, fields, author):
+        with self._lock:
+            return self._add(dict(fields, author=author))
+
+    def update(self, blog_id, fields):
+        with self._lock:
+            if blog_id not in self.blogs:
+                return None
+            fields = {key: value for key, value in fields.items() if key not in ("id", "author", "createdAt")}
+            self.blogs[blog_id] = dict(self.blogs[blog_id], **fields, updatedAt=_now())
+            return self.blogs[blog_id]
+
+    def delete(self, blog_id):
+        with self._lock:
+            return self.blogs.pop(blog_id, None)
+
+    def get(self, blog_id):
+        with self._lock:
+            return self.blogs.get(blog_id)
+
+    def snapshot(self):
+        """Name of a snapshot of the current posts; the oldest of MAX_SNAPSHOTS is dropped."""
+        with self._lock:
+            self.snapshot_count += 1
+            name = f"s{self.snapshot_count}"
+            self.snapshots[name] = dict(self.blogs)
+            while len(self.snapshots) > MAX_SNAPSHOTS:
+                del self.snapshots[next(iter(self.snapshots))]
+            return name
+
+    def restore(self, name):
+        """Back to snapshot `name`; the number of posts that differed, or None for an unknown snapshot.
+
+        Ids are not reused afterwards, like a database sequence.
+        """
+        with self._lock:
+            if name not in self.snapshots:
+                return None
+            saved = self.snapshots[name]
+            changes = sum(1 for blog_id in saved.keys() | self.blogs.keys() if saved.get(blog_id) is not self.blogs.get(blog_id))
+            self.blogs = dict(saved)
+            return changes
+
+    def list(self, search=None, include_drafts=False):
+        """Newest first; `search` is a case-insensitive match on title, excerpt, content, category and tags."""
+        with self._lock:
+            blogs = list(self.blogs.values())
+        if not include_drafts:
+            blogs = [blog for blog in blogs if blog.get("status") == "published"]
+        if search:
+            term = search.lower()
+            blogs = [blog for blog in blogs if any(
+                term in str(value).lower()
+                for value in [blog.get(field, "") for field in ("title", "excerpt", "content", "category")]
+                + list(blog.get("tags") or [])
+            )]
+        return sorted(blogs, key=lambda blog: blog["id"], reverse=True)
+
+
+@dataclass
+class FaultRule:
+    """Delay and/or fail the requests matching `method` and `path` (fnmatch globs).
+
+    `error_rate` is the share of matching requests answered with `status`;
+    `times` limits how many requests the rule affects before it expires.
+    """
+    method: str = "*"
+    path: str = "*"
+    latency_ms: float = 0
+    jitter_ms: float = 0
+    error_rate: float = 0.0
+    status: int = 500
+    times: int = None
+
+    KEYS = {"latency": ("latency_ms", float), "jitter": ("jitter_ms", float), "rate": ("error_rate", float),
+            "status": ("status", int), "times": ("times", int)}
+
+    @classmethod
+    def parse(cls, spec):
+        """'POST /api/blogs* latency=300 rate=0.5 status=503 times=2'; a lone '*' or path matches any method."""
+        patterns, fields = [], {}
+        for part in spec.split():
+            name, sep, value = part.partition("=")
+            if not sep:
+                patterns.append(part)
+                continue
+            if name not in cls.KEYS:
+                raise ValueError(f"Unknown fault setting '{name}' in '{spec}', expected {sorted(cls.KEYS)}")
+            field, convert = cls.KEYS[name]
+            fields[field] = convert(value)
+        if len(patterns) == 2:
+            fields["method"], fields["path"] = patterns[0].upper(), patterns[1]
+        elif len(patterns) == 1:
+            fields["path"] = patterns[0]
+        elif patterns:
+            raise ValueError(f"Fault rule '{spec}' should start with '[METHOD] PATH'")
+        return cls(**fields)
+
+    def matches(self, method, path):
+        return (self.times is None or self.times > 0) and fnmatch.fnmatch(method, self.method) \
+            and fnmatch.fnmatch(path, self.path)
+
+
+class Faults:
+    """The active fault rules. Decisions come from a seeded generator, so a run can be repeated."""
+
+    def __init__(self, rules=(), seed=0):
+        self._lock = threading.Lock()
+        self.configure(rules, seed)
+
+    def configure(self, rules=(), seed=0):
+        with self._lock:
+            # copies: `times` counts down per configuration, not per process
+            self.rules = [copy.copy(rule) if isinstance(rule, FaultRule) else FaultRule.parse(rule) for rule in rules]
+            self.random = random.Random(seed)
+
+    def decide(self, method, path):
+        """(seconds to wait, status to fail with or None) for one request."""
+        delay, status = 0.0, None
+        with self._lock:
+            for rule in self.rules:
+                if not rule.matches(method, path):
+                    continue
+                if rule.times is not None:
+                    rule.times -= 1
+                delay += (rule.latency_ms + self.random.uniform(0, rule.jitter_ms)) / 1000
+                if status is None and rule.error_rate and self.random.random() < rule.error_rate:
+                    status = rule.status
+        return delay, status
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=None, content_type="application/json"):
+        if isinstance(body, (bytes, str)):
+            data = body.encode("utf-8") if isinstance(body, str) else body
+        else:
+            data = b"" if status == 204 else json.dumps(body if body is not None else {}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return None
+
+    def _user(self):
+        """The logged-in user, None without a token, False for a token the server did not issue."""
+        header = self.headers.get("Authorization", "")
+        if not header:
+            return None
+        token = header.removeprefix("Bearer ").strip()
+        return self.server.tokens.get(token, False)
+
+    def _handle(self, method):
+        url = urlparse(self.path)
+        server = self.server
+        if url.path.startswith("/__standin/"):
+            return self._control(method, url.path)
+        # faults are for the app's traffic, not for test setup and teardown
+        delay, status = server.faults.decide(method, url.path) if not url.path.startswith("/api/test/") else (0.0, None)
+        server.count(self.client_address, delay, status)
+        if delay:
+            time.sleep(delay)
+        if status:
+            # the request body is still read so the connection can be reused
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            return self._send(status, {"error": f"Injected fault (HTTP {status})"})
+        if url.path == "/api" or url.path.startswith("/api/"):
+            return self._api(method, url.path[len("/api"):], parse_qs(url.query))
+        if method != "GET":
+            return self._send(405, {"error": "Method not allowed"})
+        if url.path == "/favicon.ico":
+            return self._send(204)
+        # single-page app: every other path gets the page
+        self._send(200, PAGE, "text/html; charset=utf-8")
+
+    def _api(self, method, path, query):
+        store = self.server.store
+        user = self._user()
+        if user is False:
+            return self._send(401, {"error": "Invalid token"})
+        if method == "POST" and path == "/auth/login":
+            body = self._json() or {}
+            username = body.get("username")
+            if username in self.server.users and self.server.users[username] == body.get("password"):
+                return self._send(200, {"token": _token(username), "user": {"username": username, "role": "admin"}})
+            return self._send(401, {"error": "Invalid credentials"})
+        if method == "POST" and path in ("/test/snapshot", "/test/restore"):
+            if not user:
+                return self._send(401, {"error": "Login required"})
+            if path == "/test/snapshot":
+                return self._send(201, {"snapshot": store.snapshot()})
+            name = (self._json() or {}).get("snapshot")
+            changes = store.restore(name)
+            if changes is None:
+                return self._send(404, {"error": f"Unknown snapshot '{name}'"})
+            return self._send(200, {"snapshot": name, "changes": changes})
+        if path == "/blogs":
+            if method == "GET":
+                blogs = store.list(query.get("search", [""])[0], include_drafts=bool(user))
+                return self._send(200, {"blogs": blogs, "total": len(blogs)})
+            if method == "POST":
+                if not user:
+                    return self._send(401, {"error": "Login required"})
+                body = self._json()
+                if not body or not str(body.get("title", "")).strip():
+                    return self._send(400, {"error": "Title is required"})
+                return self._send(201, store.create(body, user))
+        if path.startswith("/blogs/") and path[len("/blogs/"):].isdigit():
+            blog_id = int(path[len("/blogs/"):])
+            if method == "GET":
+                blog = store.get(blog_id)
+                if blog is None or (blog["status"] != "published" and not user):
+                    return self._send(404, {"error": "Not found"})
+                return self._send(200, blog)
+            if not user:
+                return self._send(401, {"error": "Login required"})
+            if method == "PUT":
+                blog = store.update(blog_id, self._json() or {})
+                return self._send(200, blog) if blog else self._send(404, {"error": "Not found"})
+            if method == "DELETE":
+                return self._send(204 if store.delete(blog_id) else 404)
+        self._send(404, {"error": f"No route for {method} /api{path}"})
+
+    def _control(self, method, path):
+        server = self.server
+        if method == "POST" and path == "/__standin/reset":
+            server.reset()
+            return self._send(200, {"blogs": len(server.store.blogs)})
+        if method == "POST" and path == "/__standin/faults":
+            body = self._json() or {}
+            try:
+                server.faults.configure(body.get("rules", []), body.get("seed", 0))
+            except (TypeError, ValueError) as error:
+                return self._send(400, {"error": str(error)})
+            return self._send(200, {"rules": len(server.faults.rules)})
+        if method == "GET" and path == "/__standin/stats":
+            return self._send(200, server.stats_snapshot())
+        self._send(404, {"error": "Unknown control endpoint"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class StandInServer(ThreadingHTTPServer):
+    """The stand-in app on `host:port` (0 picks a free port); `start()` serves it from a background thread."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0, blogs=SEED_BLOGS, users=None, faults=(), seed=0):
+        super().__init__((host, port), StandInHandler)
+        if users is None:
+            credentials = load_config()["credentials"]
+            users = {credentials["adminusername"]: credentials["password"]}
+        self.users = users
+        self.tokens = {_token(username): username for username in users}
+        self.store = BlogStore(blogs)
+        self.initial_faults = (list(faults), seed)
+        self.faults = Faults(faults, seed)
+        self._stats_lock = threading.Lock()
+        self._thread = None
+        self._reset_stats()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self):
+        return f"{self.url}/api"
+
+    def _reset_stats(self):
+        with self._stats_lock:
+            self.stats = {"requests": 0, "injected_errors": 0, "delay_s": 0.0, "connections": set()}
+
+    def count(self, client_address, delay, status):
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["delay_s"] += delay
+            self.stats["injected_errors"] += 1 if status else 0
+            self.stats["connections"].add(client_address)
+
+    def stats_snapshot(self):
+        with self._stats_lock:
+            return dict(self.stats, connections=len(self.stats["connections"]), delay_s=round(self.stats["delay_s"], 3))
+
+    def reset(self):
+        """Seed data, the fault rules the server started with, and zeroed stats."""
+        self.store.reset()
+        self.faults.configure(*self.initial_faults)
+        self._reset_stats()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Bloggy</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<style>
+body { margin: 0; font-family: Roboto, Helvetica, Arial, sans-serif; background: #ffffff; color: rgba(0, 0, 0, 0.87); }
+body.theme-transition { transition: background-color 0.2s; }
+header > div { display: flex; justify-content: space-between; align-items: center; padding: 12px 24px; background: #1976d2; color: #fff; }
+header a { color: #fff; margin-right: 16px; text-decoration: none; cursor: pointer; }
+header button { background: none; border: 1px solid #fff; color: #fff; border-radius: 4px; cursor: pointer; }
+#view { max-width: 1100px; margin: 24px auto; padding: 0 24px; }
+input, textarea, [contenteditable] { font: inherit; padding: 8px; border: 1px solid #bbb; border-radius: 4px; box-sizing: border-box; width: 100%; }
+.blog-list { display: grid; grid-template-columns: repeat(auto-fill, minmax(280px, 1fr)); gap: 16px; margin-top: 16px; }
+.MuiCard-root { border: 1px solid #ddd; border-radius: 4px; padding: 16px; background: inherit; }
+.MuiChip-root { display: inline-block; background: rgba(0, 0, 0, 0.08); border-radius: 16px; padding: 2px 10px; margin: 0 4px 4px 0; font-size: 13px; }
+button { font: inherit; padding: 6px 14px; cursor: pointer; }
+button:disabled { cursor: default; opacity: 0.5; }
+.toolbar { display: flex; justify-content: space-between; align-items: center; }
+table { border-collapse: collapse; width: 100%; margin-top: 16px; }
+th, td { text-align: left; padding: 8px; border-bottom: 1px solid #ddd; }
+form > div { margin-bottom: 16px; }
+label { display: block; margin-bottom: 4px; }
+.select { border: 1px solid #bbb; border-radius: 4px; padding: 8px; min-height: 22px; cursor: pointer; }
+.editor > div:first-child { padding: 4px 0; }
+[contenteditable] { min-height: 120px; }
+.menu { position: absolute; list-style: none; margin: 0; padding: 4px 0; background: #fff; color: #000; border: 1px solid #bbb; box-shadow: 0 2px 6px rgba(0, 0, 0, 0.2); z-index: 10; }
+.menu li { padding: 6px 16px; cursor: pointer; }
+.menu li[aria-selected="true"] { background: rgba(25, 118, 210, 0.12); }
+.backdrop { position: fixed; inset: 0; background: rgba(0, 0, 0, 0.5); display: flex; align-items: center; justify-content: center; z-index: 20; }
+[role="dialog"] { background: #fff; color: #000; padding: 24px; border-radius: 4px; }
+.error { color: #d32f2f; }
+</style></head>
+<body><div id="root"></div>
+<script>
+const TOKEN = "bloggy-token", THEME = "bloggy-theme";
+const CATEGORIES = __CATEGORIES__, TAGS = __TAGS__;
+const COLUMNS = ["Title", "Author", "Category", "Tags", "Status", "Created", "Views", "Actions"];
+const root = document.getElementById("root");
+let search = "";
+let menu = null;
+
+function h(tag, attrs, ...children) {
+  const node = document.createElement(tag);
+  for (const [name, value] of Object.entries(attrs || {})) {
+    if (name === "text") node.textContent = value;
+    else if (name.startsWith("on")) node.addEventListener(name.slice(2), value);
+    else if (value !== false && value !== undefined) node.setAttribute(name, value);
+  }
+  node.append(...children);
+  return node;
+}
+
+async function call(method, path, body) {
+  const headers = {"Content-Type": "application/json"};
+  if (localStorage.getItem(TOKEN)) headers.Authorization = "Bearer " + localStorage.getItem(TOKEN);
+  try {
+    const response = await fetch("/api" + path, {method, headers, body: body === undefined ? undefined : JSON.stringify(body)});
+    const text = await response.text();
+    return {status: response.status, data: text ? JSON.parse(text) : null};
+  } catch (error) {
+    return {status: 0, data: null};
+  }
+}
+
+function navigate(hash) {
+  if (location.hash === hash) render();
+  else location.hash = hash;
+}
+
+function link(text, hash, onclick) {
+  return h("a", {href: hash, text, onclick: event => { event.preventDefault(); if (onclick) onclick(); navigate(hash); }});
+}
+
+function applyTheme() {
+  const dark = localStorage.getItem(THEME) === "dark";
+  document.body.style.backgroundColor = dark ? "#121212" : "#ffffff";
+  document.body.style.color = dark ? "#ffffff" : "rgba(0, 0, 0, 0.87)";
+  return dark;
+}
+
+function header() {
+  const links = [link("Home", "#/", () => { search = ""; })];
+  if (localStorage.getItem(TOKEN)) {
+    links.push(link("Dashboard", "#/admin"), link("Logout", "#/", () => localStorage.removeItem(TOKEN)));
+  } else {
+    links.push(link("Admin", "#/login"));
+  }
+  const toggle = h("button", {type: "button", onclick: () => {
+    localStorage.setItem(THEME, applyTheme() ? "light" : "dark");
+    label();
+  }});
+  const label = () => {
+    const dark = applyTheme();
+    toggle.setAttribute("aria-label", dark ? "Switch to light mode" : "Switch to dark mode");
+    toggle.textContent = dark ? "\\u2600" : "\\u263E";
+  };
+  label();
+  links.push(toggle);
+  return h("header", {}, h("div", {}, h("strong", {text: "Bloggy"}), h("div", {}, ...links)));
+}
+
+function chip(text) {
+  return h("div", {class: "MuiChip-root"}, h("span", {class: "MuiChip-label", text}));
+}
+
+function closeMenu() {
+  if (menu) menu.list.remove();
+  menu = null;
+}
+
+document.addEventListener("click", event => {
+  if (menu && !menu.list.contains(event.target) && !menu.anchor.contains(event.target)) closeMenu();
+});
+
+function select(options, selected, multiple, placeholder) {
+  const box = h("div", {class: "select", tabindex: "0", role: "combobox"});
+  const show = () => box.replaceChildren(...(selected.length ? (multiple ? selected.map(chip) : [selected[0]]) : [placeholder]));
+  const open = () => {
+    closeMenu();
+    const rect = box.getBoundingClientRect();
+    const list = h("ul", {class: "menu", role: "listbox", style: `left:${rect.left + scrollX}px;top:${rect.bottom + scrollY}px;min-width:${rect.width}px`});
+    for (const option of options) {
+      const item = h("li", {role: "option", "aria-selected": String(selected.includes(option)), text: option, onclick: () => {
+        if (!multiple) selected.splice(0, selected.length, option);
+        else if (selected.includes(option)) selected.splice(selected.indexOf(option), 1);
+        else selected.push(option);
+        item.setAttribute("aria-selected", String(selected.includes(option)));
+        show();
+        // a multiple select stays open until the user clicks elsewhere
+        if (!multiple) closeMenu();
+      }});
+      list.append(item);
+    }
+    document.body.append(list);
+    menu = {list, anchor: box};
+  };
+  box.addEventListener("click", open);
+  show();
+  return box;
+}
+
+async function showHome(view) {
+  const input = h("input", {id: ":r3:", type: "search", placeholder: "Search blogs...", "aria-label": "Search blogs"});
+  input.value = search;
+  const list = h("div", {class: "blog-list"});
+  input.addEventListener("keydown", event => {
+    if (event.key === "Enter") { search = input.value; loadList(list); }
+  });
+  view.append(h("div", {}, input), list);
+  await loadList(list);
+}
+
+async function loadList(list) {
+  const response = await call("GET", "/blogs" + (search ? "?search=" + encodeURIComponent(search) : ""));
+  if (response.status !== 200) return list.replaceChildren(h("p", {class: "error", text: `Could not load blogs (HTTP ${response.status})`}));
+  const blogs = response.data.blogs;
+  list.replaceChildren(...(blogs.length ? blogs.map(blog => h("article", {class: "MuiCard-root"},
+    h("h2", {text: blog.title}),
+    h("div", {}, ...[blog.category, ...blog.tags].filter(Boolean).map(chip)),
+    h("p", {text: blog.excerpt}),
+    h("button", {type: "button", text: "Read More", onclick: () => navigate("#/blog/" + blog.id)}),
+  )) : [h("p", {text: "No blogs found"})]));
+}
+
+async function showBlog(view, id) {
+  const response = await call("GET", "/blogs/" + id);
+  if (response.status !== 200) return view.append(h("p", {class: "error", text: "Blog not found"}));
+  const blog = response.data;
+  view.append(h("article", {},
+    h("h1", {text: blog.title}),
+    h("div", {}, ...[blog.category, ...blog.tags].filter(Boolean).map(chip)),
+    h("p", {text: `By ${blog.author}`}),
+    h("div", {text: blog.content}),
+    h("button", {type: "button", text: "Back to blogs", onclick: () => navigate("#/")}),
+  ));
+}
+
+function showLogin(view) {
+  const username = h("input", {id: ":r7:", name: "username", autocomplete: "username"});
+  const password = h("input", {id: ":r9:", name: "password", type: "password", autocomplete: "current-password"});
+  const error = h("p", {class: "error", role: "alert"});
+  const form = h("form", {},
+    h("div", {}, h("label", {for: ":r7:", text: "Username"}), username),
+    h("div", {}, h("label", {for: ":r9:", text: "Password"}), password),
+    h("button", {type: "submit", text: "Sign In"}));
+  form.addEventListener("submit", async event => {
+    event.preventDefault();
+    const response = await call("POST", "/auth/login", {username: username.value, password: password.value});
+    if (response.status === 200) {
+      localStorage.setItem(TOKEN, response.data.token);
+      navigate("#/admin");
+    } else {
+      error.textContent = response.status === 401 ? "Invalid credentials" : `Login failed (HTTP ${response.status})`;
+    }
+  });
+  view.append(h("div", {},
+    h("div", {role: "tablist"}, h("button", {type: "button", role: "tab", "aria-selected": "true", text: "Login"})),
+    h("div", {id: "auth-tabpanel-0", role: "tabpanel"}, h("div", {}, form, error))));
+}
+
+async function showDashboard(view) {
+  const tbody = h("tbody");
+  view.append(
+    h("div", {class: "toolbar"}, h("h4", {text: "Blog Posts"}), h("button", {type: "button", text: "New Blog Post", onclick: () => navigate("#/new")})),
+    h("div", {}, h("table", {}, h("thead", {}, h("tr", {}, ...COLUMNS.map(text => h("th", {text})))), tbody)));
+  const response = await call("GET", "/blogs");
+  if (response.status === 401) { localStorage.removeItem(TOKEN); return navigate("#/login"); }
+  if (response.status !== 200) return view.append(h("p", {class: "error", text: `Could not load blogs (HTTP ${response.status})`}));
+  tbody.replaceChildren(...response.data.blogs.map(blog => h("tr", {},
+    h("td", {text: blog.title}),
+    h("td", {text: blog.author}),
+    h("td", {text: blog.category}),
+    h("td", {}, ...blog.tags.map(chip)),
+    h("td", {text: blog.status === "published" ? "Published" : "Draft"}),
+    h("td", {text: blog.createdAt.slice(0, 10)}),
+    h("td", {text: String(blog.views)}),
+    h("td", {},
+      h("button", {type: "button", "aria-label": "View", text: "\\u{1F441}", onclick: () => navigate("#/blog/" + blog.id)}),
+      h("button", {type: "button", "aria-label": "Edit", text: "\\u270E", onclick: () => navigate("#/edit/" + blog.id)}),
+      h("button", {type: "button", "aria-label": "Delete", text: "\\u{1F5D1}", onclick: () => confirmDelete(blog)})),
+  )));
+}
+
+function confirmDelete(blog) {
+  const backdrop = h("div", {class: "backdrop"});
+  const close = () => backdrop.remove();
+  backdrop.append(h("div", {role: "dialog", "aria-modal": "true"},
+    h("p", {text: `Are you sure you want to delete "${blog.title}"?`}),
+    h("button", {type: "button", text: "Cancel", onclick: close}),
+    h("button", {type: "button", "data-testid": "confirm-delete-button", text: "Delete", onclick: async () => {
+      await call("DELETE", "/blogs/" + blog.id);
+      close();
+      render();
+    }})));
+  document.body.append(backdrop);
+}
+
+async function showEditor(view, id) {
+  let blog = {title: "", excerpt: "", content: "", category: "", tags: []};
+  if (id) {
+    const response = await call("GET", "/blogs/" + id);
+    if (response.status !== 200) return view.append(h("p", {class: "error", text: "Blog not found"}));
+    blog = response.data;
+  }
+  const category = blog.category ? [blog.category] : [], tags = [...blog.tags];
+  const title = h("input", {name: "title"});
+  const excerpt = h("textarea", {name: "excerpt", rows: "3"});
+  const content = h("div", {contenteditable: "true", role: "textbox", "aria-multiline": "true"});
+  title.value = blog.title; excerpt.value = blog.excerpt; content.textContent = blog.content;
+  const error = h("p", {class: "error", role: "alert"});
+  const publish = h("button", {type: "button", text: "Publish Now"});
+  const update = () => { publish.disabled = !title.value.trim(); };
+  title.addEventListener("input", update);
+  update();
+  const save = async status => {
+    const fields = {title: title.value, excerpt: excerpt.value, content: content.innerText, category: category[0] || "", tags, status};
+    const response = id ? await call("PUT", "/blogs/" + id, fields) : await call("POST", "/blogs", fields);
+    if (response.status === 200 || response.status === 201) navigate("#/admin");
+    else error.textContent = `Could not save the blog (HTTP ${response.status})`;
+  };
+  publish.addEventListener("click", () => save("published"));
+  view.append(h("div", {},
+    h("h4", {text: id ? "Edit Post" : "Create New Post"}),
+    h("form", {onsubmit: event => event.preventDefault()},
+      h("div", {}, h("label", {text: "Title"}), title),
+      h("div", {}, h("label", {text: "Excerpt"}), excerpt),
+      h("div", {}, h("label", {text: "Category"}), select(CATEGORIES, category, false, "Select a category")),
+      h("div", {}, h("label", {text: "Content"}), h("div", {class: "editor"},
+        h("div", {}, h("button", {type: "button", "aria-label": "Bold", text: "B"}), h("button", {type: "button", "aria-label": "Italic", text: "I"})),
+        h("div", {}, content))),
+      h("div", {}, h("label", {text: "Tags"}), select(TAGS, tags, true, "Select tags")),
+      h("div", {},
+        h("button", {type: "button", text: "Cancel", onclick: () => navigate("#/admin")}),
+        h("button", {type: "button", text: "Save as Draft", onclick: () => save("draft")}),
+        publish),
+      error)));
+}
+
+async function render() {
+  closeMenu();
+  const hash = location.hash || "#/";
+  const loggedIn = Boolean(localStorage.getItem(TOKEN));
+  const view = h("div", {id: "view"});
+  root.replaceChildren(header(), view);
+  if (hash.startsWith("#/blog/")) return showBlog(view, hash.slice("#/blog/".length));
+  if (hash === "#/login") return showLogin(view);
+  if (!loggedIn && (hash === "#/admin" || hash === "#/new" || hash.startsWith("#/edit/"))) return navigate("#/login");
+  if (hash === "#/admin") return showDashboard(view);
+  if (hash === "#/new") return showEditor(view);
+  if (hash.startsWith("#/edit/")) return showEditor(view, hash.slice("#/edit/".length));
+  return showHome(view);
+}
+
+window.addEventListener("hashchange", render);
+render();
+</script></body></html>
+""".replace("__CATEGORIES__", json.dumps(CATEGORIES)).replace("__TAGS__", json.dumps(TAGS))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5180)
+    parser.add_argument("--latency", type=float, default=0, help="Milliseconds added to every API request")
+    parser.add_argument("--jitter", type=float, default=0, help="Up to this many extra milliseconds, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of API requests answered with HTTP 500")
+    parser.add_argument("--fault", action="append", default=[], metavar="RULE",
+                        help="'[METHOD] PATH latency=MS jitter=MS rate=R status=CODE times=N', repeatable")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for jitter and error decisions")
+    parser.add_argument("--empty", action="store_true", help="Start without the seed blog posts")
+    args = parser.parse_args(argv)
+    rules = list(args.fault)
+    if args.latency or args.jitter or args.error_rate:
+        rules.insert(0, FaultRule(path="/api/*", latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate))
+    try:
+        server = StandInServer(args.host, args.port, blogs=[] if args.empty else SEED_BLOGS, faults=rules, seed=args.seed)
+    except ValueError as error:
+        parser.error(str(error))
+    print(f"Bloggy stand-in at {server.url}/ (LOCAL_SETUP_URL={server.url}/ LOCAL_API_URL={server.api_url}), Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
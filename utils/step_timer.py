@@ -0,0 +1,63 @@
+import functools
+import inspect
+import threading
+import time
+
+_lock = threading.Lock()
+_steps = []
+# Called as listener(page_object, step, ok) after every sync step
+listeners = []
+
+
+def _record(cls_name, name, start, ok):
+    with _lock:
+        _steps.append({"step": f"{cls_name}.{name}", "duration": time.perf_counter() - start, "ok": ok})
+
+
+def _timed(cls_name, name, fn):
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            ok = False
+            try:
+                result = await fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                _record(cls_name, name, start, ok)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            _record(cls_name, name, start, ok)
+            for listener in listeners:
+                listener(args[0], f"{cls_name}.{name}", ok)
+    return wrapper
+
+
+def timed_steps(cls):
+    """Class decorator: time every public method of a page object.
+
+    Nested calls (search_and_verify_blog -> search_screen) are recorded as
+    separate steps.
+    """
+    for name, fn in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.isfunction(fn):
+            setattr(cls, name, _timed(cls.__name__, name, fn))
+    return cls
+
+
+def drain():
+    """Steps recorded since the last call, as {"step", "duration", "ok"} rows."""
+    global _steps
+    with _lock:
+        steps, _steps = _steps, []
+    return steps
@@ -0,0 +1,291 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR = os.path.join(BASE_DIR, "..", "data", "visual")
+ACTUAL_DIR = os.path.join(BASE_DIR, "..", "reports", "visual")
+MODES = ("off", "check", "update")
+# Rec. 709 weights, for the theme check and the perceptual hash
+LUMA = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+# same settings for baselines and checks, so identical pages give identical bytes
+SCREENSHOT_OPTIONS = {"animations": "disabled", "caret": "hide", "scale": "css"}
+
+
+def decode_png(data):
+    """RGB pixels (height x width x 3, uint8) of a PNG screenshot."""
+    from PIL import Image  # only needed once a screenshot is actually decoded
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def downsample(pixels, factor):
+    """Means of `factor` x `factor` blocks as float32; edge pixels that do not fill a block are dropped."""
+    pixels = np.asarray(pixels, dtype=np.float32)
+    if factor <= 1:
+        return pixels
+    height, width = pixels.shape[0] // factor * factor, pixels.shape[1] // factor * factor
+    blocks = pixels[:height, :width].reshape(height // factor, factor, width // factor, factor, -1)
+    return blocks.mean(axis=(1, 3))
+
+
+def compared_area(shape, regions=(), factor=1):
+    """True for the pixels that are compared; `regions` are masked (x, y, width, height) boxes in page pixels."""
+    keep = np.ones(shape[:2], dtype=bool)
+    for x, y, width, height in regions:
+        # every block the box touches is masked
+        keep[y // factor:-(-(y + height) // factor), x // factor:-(-(x + width) // factor)] = False
+    return keep
+
+
+def luminance(pixels):
+    return np.asarray(pixels, dtype=np.float32) @ LUMA / 255
+
+
+def theme_of(pixels):
+    """The theme a screenshot shows, from its mean luminance: "dark" or "light"."""
+    return "dark" if luminance(downsample(pixels, 8)).mean() < 0.5 else "light"
+
+
+def perceptual_hash(pixels, size=8, margin=0.01):
+    """64-bit average hash: is each cell of a size x size luminance grid brighter than the mean.
+
+    A cell has to be brighter by `margin`, so flat areas hash the same whatever the rendering noise.
+    """
+    gray = luminance(pixels)
+    rows = np.linspace(0, gray.shape[0], size + 1).astype(int)[:-1]
+    cols = np.linspace(0, gray.shape[1], size + 1).astype(int)[:-1]
+    grid = np.add.reduceat(np.add.reduceat(gray, rows, axis=0), cols, axis=1)
+    # screenshots smaller than the grid repeat cells rather than divide by zero
+    grid /= np.maximum(np.outer(np.diff(rows, append=gray.shape[0]), np.diff(cols, append=gray.shape[1])), 1)
+    bits = (grid - grid.mean() > margin).ravel()
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def hash_distance(first, second):
+    return bin(first ^ second).count("1")
+
+
+def diff_ratio(expected, actual, tolerance=0, keep=None):
+    """Share of the compared pixels where any channel differs by more than its tolerance (a number or one per channel)."""
+    over = (np.abs(expected - actual) > np.asarray(tolerance, dtype=np.float32)).any(axis=-1)
+    if keep is None:
+        return float(over.mean())
+    return float((over & keep).sum() / max(int(keep.sum()), 1))
+
+
+class Frame:
+    """A PNG screenshot prepared for comparison; it is only decoded once its pixels are needed."""
+
+    def __init__(self, data, factor=4, regions=()):
+        self.data = data
+        self.factor = factor
+        self.regions = regions
+        self.digest = hashlib.sha1(data).hexdigest()
+
+    @cached_property
+    def pixels(self):
+        return downsample(decode_png(self.data), self.factor)
+
+    @cached_property
+    def keep(self):
+        return compared_area(self.pixels.shape, self.regions, self.factor)
+
+    @cached_property
+    def phash(self):
+        return perceptual_hash(self.pixels * self.keep[..., None])
+
+
+@dataclass
+class VisualResult:
+    name: str
+    status: str = None
+    diff: float = 0.0
+    distance: int = 0
+    seconds: float = 0.0
+    actual_path: str = None
+
+    @property
+    def ok(self):
+        return self.status not in ("mismatch", "different", "size")
+
+    def message(self):
+        if self.status == "size":
+            message = f"Screenshot '{self.name}' has a different size than its baseline"
+        elif self.status == "different":
+            message = f"Screenshot '{self.name}' looks different from its baseline (hash distance {self.distance})"
+        else:
+            message = f"Screenshot '{self.name}' differs from its baseline in {self.diff:.2%} of the pixels"
+        return f"{message}, see {os.path.relpath(self.actual_path)}" if self.actual_path else message
+
+
+class VisualStats:
+    """Counts of how each check was settled, for the terminal summary."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {"checks": 0, "identical": 0, "match": 0, "different": 0, "mismatch": 0, "size": 0,
+                       "new": 0, "updated": 0}
+        self.seconds = 0.0
+        self.failures = []
+
+    def add(self, result):
+        with self._lock:
+            self.counts["checks"] += 1
+            self.counts[result.status] += 1
+            self.seconds += result.seconds
+            if not result.ok:
+                self.failures.append(result.message())
+
+    def export(self):
+        with self._lock:
+            return {"counts": dict(self.counts), "seconds": self.seconds, "failures": list(self.failures)}
+
+    def merge(self, exported):
+        with self._lock:
+            for name, count in exported.get("counts", {}).items():
+                self.counts[name] += count
+            self.seconds += exported.get("seconds", 0.0)
+            self.failures.extend(exported.get("failures", []))
+
+    def summary_lines(self):
+        counts = self.counts
+        if not counts["checks"]:
+            return []
+        failed = counts["different"] + counts["mismatch"] + counts["size"]
+        lines = [
+            f"{counts['checks']} checks, {self.seconds / counts['checks'] * 1000:.1f} ms each: "
+            f"{counts['identical']} identical, {counts['match']} within tolerance, {failed} failed, "
+            f"{counts['new'] + counts['updated']} baselines written"
+        ]
+        lines.extend(f"  {message}" for message in self.failures)
+        return lines
+
+
+visual_stats = VisualStats()
+
+
+def _browser_name(target):
+    page = getattr(target, "page", target)
+    browser = page.context.browser
+    return browser.browser_type.name if browser else "chromium"
+
+
+class VisualBaselines:
+    """Compares screenshots against the baselines in data/visual/<browser>/<name>.png.
+
+    Screenshots are compared downsampled by `factor`. A screenshot that is
+    byte for byte the baseline passes without being decoded; one whose
+    perceptual hash is more than `max_distance` bits away fails without a
+    pixel diff. Otherwise it passes when at most `max_diff` of the pixels
+    differ by more than `tolerance` in any channel. Baselines are prepared
+    once per process and kept in memory.
+
+    A missing baseline is written from the first screenshot (mode `check`);
+    mode `update` rewrites them all and `off` skips the checks.
+    """
+
+    def __init__(self, root=BASELINE_DIR, mode="check", factor=4, tolerance=8, max_diff=0.001, max_distance=12,
+                 stats=None, actual_dir=ACTUAL_DIR):
+        self.root = root
+        self.mode = mode
+        self.factor = factor
+        self.tolerance = tolerance
+        self.max_diff = max_diff
+        self.max_distance = max_distance
+        self.stats = stats if stats is not None else visual_stats
+        self.actual_dir = actual_dir
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def path(self, name, browser):
+        return os.path.join(self.root, browser, f"{name}.png")
+
+    def baseline(self, path, factor, regions=()):
+        """The baseline at `path` (decoded on first use), or None when there is none."""
+        key = (path, factor, tuple(regions))
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        try:
+            with open(path, "rb") as file:
+                frame = Frame(file.read(), factor, regions)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._cache[key] = frame
+        return frame
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # concurrent pages may write the same new baseline; readers only ever see a whole file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            for key in [key for key in self._cache if key[0] == path]:
+                del self._cache[key]
+
+    def compare(self, name, data, browser="chromium", regions=(), tolerance=None, max_diff=None, factor=None):
+        """Check PNG `data` against baseline `name`; the result is also counted in the stats."""
+        start = time.perf_counter()
+        factor = factor or self.factor
+        path = self.path(name, browser)
+        expected = None if self.mode == "update" else self.baseline(path, factor, regions)
+        result = VisualResult(name)
+        if expected is None:
+            result.status = "updated" if os.path.exists(path) else "new"
+            self._write(path, data)
+        elif hashlib.sha1(data).hexdigest() == expected.digest:
+            # the same bytes: nothing is decoded or diffed
+            result.status = "identical"
+        else:
+            actual = Frame(data, factor, regions)
+            result.distance = hash_distance(actual.phash, expected.phash)
+            if actual.pixels.shape != expected.pixels.shape:
+                result.status = "size"
+            elif result.distance > self.max_distance:
+                result.status = "different"
+            else:
+                result.diff = diff_ratio(expected.pixels, actual.pixels,
+                                         self.tolerance if tolerance is None else tolerance, expected.keep)
+                result.status = "match" if result.diff <= (self.max_diff if max_diff is None else max_diff) else "mismatch"
+            if not result.ok:
+                result.actual_path = os.path.join(self.actual_dir, browser, f"{name}.actual.png")
+                os.makedirs(os.path.dirname(result.actual_path), exist_ok=True)
+                with open(result.actual_path, "wb") as file:
+                    file.write(data)
+        result.seconds = time.perf_counter() - start
+        self.stats.add(result)
+        return result
+
+    def check(self, target, name, mask=(), regions=(), **options):
+        """Screenshot a page or locator and compare it; None when checks are off."""
+        if self.mode == "off":
+            return None
+        data = target.screenshot(mask=list(mask), **SCREENSHOT_OPTIONS)
+        return self.compare(name, data, _browser_name(target), regions, **options)
+
+    async def async_check(self, target, name, mask=(), regions=(), **options):
+        if self.mode == "off":
+            return None
+        data = await target.screenshot(mask=list(mask), **SCREENSHOT_OPTIONS)
+        return self.compare(name, data, _browser_name(target), regions, **options)
+
+    def assert_matches(self, target, name, **options):
+        result = self.check(target, name, **options)
+        assert result is None or result.ok, result.message()
+
+    async def async_assert_matches(self, target, name, **options):
+        result = await self.async_check(target, name, **options)
+        assert result is None or result.ok, result.message()
+
+
+visual_baselines = VisualBaselines()
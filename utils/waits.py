@@ -0,0 +1,281 @@
+import threading
+import time
+from contextlib import AsyncExitStack, ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from urllib.parse import urlparse
+
+from playwright.sync_api import Error as PlaywrightError
+from utils.action_responses import action_responses
+
+DEFAULT_TIMEOUT = 10000
+DEFAULT_QUIET_MS = 250
+
+# Resolves true once the DOM has gone `quietMs` without a mutation, or
+# false after `timeoutMs` at the latest. Used instead of networkidle + fixed sleeps.
+DOM_SETTLED_JS = """
+([quietMs, timeoutMs]) => new Promise(resolve => {
+    let quietTimer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(done, quietMs, true);
+    });
+    const deadline = setTimeout(done, timeoutMs, false);
+    function done(settled) {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(deadline);
+        resolve(settled);
+    }
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    quietTimer = setTimeout(done, quietMs, true);
+})
+"""
+
+
+@dataclass
+class WaitRecord:
+    """A single condition wait and the fixed sleep it replaced.
+
+    `responses` lists the API calls a response wait finished on, as
+    {"call", "status", "ms"} rows with the server-side timing.
+    """
+    action: str
+    condition: str
+    elapsed: float
+    legacy_budget: float
+    ok: bool = True
+    responses: list = field(default_factory=list)
+
+    @property
+    def saved(self):
+        return self.legacy_budget - self.elapsed
+
+
+class WaitLedger:
+    """Collects every wait of the run so the saved wall time can be reported."""
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def clear(self):
+        with self._lock:
+            self.records = []
+
+    def export(self):
+        """Plain rows, so xdist workers can hand their records to the controller."""
+        with self._lock:
+            return [asdict(record) for record in self.records]
+
+    def merge(self, rows):
+        with self._lock:
+            self.records.extend(WaitRecord(**row) for row in rows)
+
+    def summary(self):
+        with self._lock:
+            records = list(self.records)
+        by_action = {}
+        for record in records:
+            entry = by_action.setdefault(record.action, {"waits": 0, "elapsed": 0.0, "legacy_budget": 0.0})
+            entry["waits"] += 1
+            entry["elapsed"] += record.elapsed
+            entry["legacy_budget"] += record.legacy_budget
+        elapsed = sum(r.elapsed for r in records)
+        legacy = sum(r.legacy_budget for r in records)
+        responses = [row for r in records for row in r.responses]
+        return {
+            "waits": len(records),
+            "timeouts": sum(1 for r in records if not r.ok),
+            "responses": len(responses),
+            "error_responses": sum(1 for row in responses if row["status"] >= 400),
+            "elapsed": elapsed,
+            "legacy_budget": legacy,
+            "saved": legacy - elapsed,
+            "by_action": by_action,
+        }
+
+    def summary_lines(self, top=10):
+        summary = self.summary()
+        if not summary["waits"]:
+            return []
+        lines = [
+            f"condition waits: {summary['waits']} ({summary['timeouts']} timed out)",
+            f"time spent waiting: {summary['elapsed']:.2f}s, fixed sleeps replaced: {summary['legacy_budget']:.2f}s",
+            f"wall time saved: {summary['saved']:.2f}s",
+        ]
+        if summary["responses"]:
+            lines.append(
+                f"response-driven waits finished on {summary['responses']} API calls "
+                f"({summary['error_responses']} with an error status)"
+            )
+        actions = sorted(summary["by_action"].items(), key=lambda kv: kv[1]["elapsed"], reverse=True)
+        for action, entry in actions[:top]:
+            lines.append(
+                f"  {action}: {entry['waits']} waits, {entry['elapsed']:.2f}s "
+                f"(was {entry['legacy_budget']:.2f}s of sleeps)"
+            )
+        return lines
+
+
+wait_ledger = WaitLedger()
+
+
+class PageWaiter:
+    """Waits on explicit page conditions instead of fixed sleeps.
+
+    `legacy` is the fixed sleep (in seconds) a wait replaces, counting the
+    500 ms quiet window of a replaced `networkidle` wait as well; it is
+    only used for reporting.
+    """
+
+    def __init__(self, page, ledger=None, timeout=DEFAULT_TIMEOUT, registry=None):
+        self.page = page
+        self.ledger = ledger if ledger is not None else wait_ledger
+        self.timeout = timeout
+        self.registry = registry if registry is not None else action_responses
+
+    @contextmanager
+    def _timed(self, action, condition, legacy, responses=None):
+        """Record the wait; it failed when it raised or the caller set `status["ok"]` to False."""
+        start = time.perf_counter()
+        ok = False
+        status = {"ok": True}
+        try:
+            yield status
+            ok = status["ok"]
+        finally:
+            self.ledger.add(WaitRecord(action, condition, time.perf_counter() - start, legacy, ok, responses or []))
+
+    def for_element(self, locator, action, state="visible", legacy=0.0, timeout=None):
+        """Wait until `locator` reaches `state` (visible, hidden, attached, detached)."""
+        with self._timed(action, f"element:{state}", legacy):
+            locator.wait_for(state=state, timeout=timeout or self.timeout)
+
+    def for_dom_settled(self, action, legacy=0.0, quiet_ms=DEFAULT_QUIET_MS, timeout=None):
+        """Wait until the DOM stops mutating for `quiet_ms`.
+
+        A page still mutating at the timeout is not an error, but the wait is
+        recorded as timed out.
+        """
+        timeout = timeout or self.timeout
+        with self._timed(action, "dom_settled", legacy) as status:
+            for attempt in range(2):
+                try:
+                    self.page.wait_for_load_state("domcontentloaded", timeout=timeout)
+                    status["ok"] = bool(self.page.evaluate(DOM_SETTLED_JS, [quiet_ms, timeout]))
+                    return
+                except PlaywrightError as e:
+                    # A navigation started while we were observing; wait for the new document once.
+                    if attempt or "context was destroyed" not in str(e):
+                        raise
+
+    def for_snapshot(self, take, predicate, action, legacy=0.0, timeout=None, interval=100):
+        """Re-take a DOM snapshot (e.g. `lambda: blog_cards(page)`) until `predicate` holds for it.
+
+        Returns the last snapshot even on timeout, so the caller's assertion
+        can report what the page actually showed; the wait is still recorded
+        as timed out.
+        """
+        deadline = time.monotonic() + (timeout or self.timeout) / 1000
+        with self._timed(action, "snapshot", legacy) as status:
+            snapshot = take()
+            while not predicate(snapshot):
+                if time.monotonic() >= deadline:
+                    status["ok"] = False
+                    break
+                self.page.wait_for_timeout(interval)
+                snapshot = take()
+            return snapshot
+
+    def for_action(self, trigger, action, legacy=0.0, timeout=None):
+        """Run `trigger`, then wait for the API calls registered for `action`.
+
+        Actions without a registered call fall back to waiting for the DOM
+        to settle. Returns the matched responses.
+        """
+        specs = self.registry.specs_for(action)
+        if not specs:
+            trigger()
+            self.for_dom_settled(action, legacy=legacy, timeout=timeout)
+            return []
+        rows = []
+        with self._timed(action, "responses", legacy, rows):
+            with ExitStack() as stack:
+                expected = [
+                    stack.enter_context(self.page.expect_response(spec.matches, timeout=timeout or self.timeout))
+                    for spec in specs
+                ]
+                trigger()
+            responses = [info.value for info in expected]
+            for response in responses:
+                # responseEnd is only filled in once the body has arrived
+                response.finished()
+            rows.extend(_response_row(response) for response in responses)
+        return responses
+
+
+class AsyncPageWaiter(PageWaiter):
+    """PageWaiter for `playwright.async_api` pages; records into the same ledger."""
+
+    async def for_element(self, locator, action, state="visible", legacy=0.0, timeout=None):
+        with self._timed(action, f"element:{state}", legacy):
+            await locator.wait_for(state=state, timeout=timeout or self.timeout)
+
+    async def for_dom_settled(self, action, legacy=0.0, quiet_ms=DEFAULT_QUIET_MS, timeout=None):
+        timeout = timeout or self.timeout
+        with self._timed(action, "dom_settled", legacy) as status:
+            for attempt in range(2):
+                try:
+                    await self.page.wait_for_load_state("domcontentloaded", timeout=timeout)
+                    status["ok"] = bool(await self.page.evaluate(DOM_SETTLED_JS, [quiet_ms, timeout]))
+                    return
+                except PlaywrightError as e:
+                    if attempt or "context was destroyed" not in str(e):
+                        raise
+
+    async def for_snapshot(self, take, predicate, action, legacy=0.0, timeout=None, interval=100):
+        """`take` is a coroutine function, e.g. `lambda: async_blog_cards(page)`."""
+        deadline = time.monotonic() + (timeout or self.timeout) / 1000
+        with self._timed(action, "snapshot", legacy) as status:
+            snapshot = await take()
+            while not predicate(snapshot):
+                if time.monotonic() >= deadline:
+                    status["ok"] = False
+                    break
+                await self.page.wait_for_timeout(interval)
+                snapshot = await take()
+            return snapshot
+
+    async def for_action(self, trigger, action, legacy=0.0, timeout=None):
+        """`trigger` is a coroutine function, e.g. `locator.click`."""
+        specs = self.registry.specs_for(action)
+        if not specs:
+            await trigger()
+            await self.for_dom_settled(action, legacy=legacy, timeout=timeout)
+            return []
+        rows = []
+        with self._timed(action, "responses", legacy, rows):
+            async with AsyncExitStack() as stack:
+                expected = [
+                    await stack.enter_async_context(self.page.expect_response(spec.matches, timeout=timeout or self.timeout))
+                    for spec in specs
+                ]
+                await trigger()
+            responses = [await info.value for info in expected]
+            for response in responses:
+                await response.finished()
+            rows.extend(_response_row(response) for response in responses)
+        return responses
+
+
+def _response_row(response):
+    """Report row of a finished response; `ms` is the request's responseEnd timing."""
+    return {
+        "call": f"{response.request.method} {urlparse(response.url).path}",
+        "status": response.status,
+        "ms": round(response.request.timing.get("responseEnd", -1), 1),
+    }